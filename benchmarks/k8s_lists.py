@@ -0,0 +1,253 @@
+"""
+Compares the cost of turning Kubernetes list responses into table rows,
+through the client's model deserialization (the way the models used to),
+and through the raw JSON fast path the models use now.
+
+Run from the repository root:
+
+    python -m benchmarks.k8s_lists [sizes...]
+"""
+
+import json
+import sys
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from kubernetes import client
+
+from ttork.models import K8sDeployments, K8sPods
+from ttork.utilities import format_age
+
+DEFAULT_SIZES = [100, 1000, 10000]
+
+
+def make_pod(index: int) -> dict:
+    """Build the JSON of a pod, with the fields a real pod usually has."""
+    name = f"api-{index:05}"
+    return {
+        "metadata": {
+            "name": name,
+            "namespace": "default",
+            "uid": f"00000000-0000-0000-0000-{index:012}",
+            "resourceVersion": str(1000 + index),
+            "creationTimestamp": "2024-06-15T12:00:00Z",
+            "labels": {"app": "api", "pod-template-hash": "5d8f7c9b6"},
+            "ownerReferences": [
+                {
+                    "apiVersion": "apps/v1",
+                    "kind": "ReplicaSet",
+                    "name": "api-5d8f7c9b6",
+                    "uid": "11111111-1111-1111-1111-111111111111",
+                    "controller": True,
+                }
+            ],
+        },
+        "spec": {
+            "containers": [
+                {
+                    "name": "api",
+                    "image": "registry.local/api:latest",
+                    "ports": [{"containerPort": 8080, "protocol": "TCP"}],
+                    "env": [
+                        {"name": f"SETTING_{n}", "value": str(n)}
+                        for n in range(10)
+                    ],
+                    "resources": {
+                        "limits": {"cpu": "500m", "memory": "256Mi"},
+                        "requests": {"cpu": "100m", "memory": "128Mi"},
+                    },
+                    "volumeMounts": [
+                        {
+                            "name": "config",
+                            "mountPath": "/etc/api",
+                            "readOnly": True,
+                        }
+                    ],
+                }
+            ],
+            "volumes": [{"name": "config", "configMap": {"name": "api"}}],
+            "nodeName": "kind-control-plane",
+            "restartPolicy": "Always",
+        },
+        "status": {
+            "phase": "Running",
+            "podIP": f"10.244.{index // 250}.{index % 250}",
+            "hostIP": "172.18.0.2",
+            "startTime": "2024-06-15T12:00:00Z",
+            "conditions": [
+                {
+                    "type": condition,
+                    "status": "True",
+                    "lastTransitionTime": "2024-06-15T12:00:05Z",
+                }
+                for condition in (
+                    "Initialized",
+                    "Ready",
+                    "ContainersReady",
+                    "PodScheduled",
+                )
+            ],
+            "containerStatuses": [
+                {
+                    "name": "api",
+                    "image": "registry.local/api:latest",
+                    "imageID": "registry.local/api@sha256:" + "0" * 64,
+                    "containerID": "containerd://" + "1" * 64,
+                    "ready": True,
+                    "started": True,
+                    "restartCount": 0,
+                    "state": {
+                        "running": {"startedAt": "2024-06-15T12:00:04Z"}
+                    },
+                }
+            ],
+        },
+    }
+
+
+def make_deployment(index: int) -> dict:
+    """Build the JSON of a Deployment."""
+    name = f"api-{index:05}"
+    return {
+        "metadata": {
+            "name": name,
+            "namespace": "default",
+            "uid": f"00000000-0000-0000-0000-{index:012}",
+            "resourceVersion": str(1000 + index),
+            "creationTimestamp": "2024-06-15T12:00:00Z",
+            "labels": {"app": name},
+        },
+        "spec": {
+            "replicas": 2,
+            "selector": {"matchLabels": {"app": name}},
+            "template": {
+                "metadata": {"labels": {"app": name}},
+                "spec": {
+                    "containers": [
+                        {"name": "api", "image": "registry.local/api:latest"}
+                    ]
+                },
+            },
+        },
+        "status": {
+            "replicas": 2,
+            "readyReplicas": 2,
+            "availableReplicas": 2,
+            "updatedReplicas": 2,
+            "observedGeneration": 1,
+        },
+    }
+
+
+def make_list(kind: str, items: list[dict]) -> bytes:
+    """Encode a list response body."""
+    return json.dumps(
+        {
+            "kind": kind,
+            "apiVersion": "v1",
+            "metadata": {"resourceVersion": "999999"},
+            "items": items,
+        }
+    ).encode()
+
+
+def typed_pod_rows(api_client: client.ApiClient, body: bytes) -> list:
+    """Build pod rows from deserialized V1Pod models."""
+    pods = api_client.deserialize(SimpleNamespace(data=body), "V1PodList")
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "values": [
+                pod.metadata.name,
+                pod.status.phase,
+                pod.status.pod_ip or "-",
+                pod.metadata.namespace,
+                format_age((now - pod.metadata.creation_timestamp).seconds),
+            ],
+            "style": "info",
+        }
+        for pod in pods.items
+    ]
+
+
+def typed_deployment_rows(api_client: client.ApiClient, body: bytes) -> list:
+    """Build Deployment rows from deserialized V1Deployment models."""
+    deployments = api_client.deserialize(
+        SimpleNamespace(data=body), "V1DeploymentList"
+    )
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "values": [
+                deployment.metadata.name,
+                "{0}/{1}".format(
+                    deployment.status.ready_replicas or 0,
+                    deployment.status.replicas,
+                ),
+                str(deployment.status.replicas),
+                str(deployment.status.available_replicas),
+                deployment.metadata.namespace,
+                format_age(
+                    (now - deployment.metadata.creation_timestamp).seconds
+                ),
+            ],
+            "style": "info",
+        }
+        for deployment in deployments.items
+    ]
+
+
+def raw_rows(model, body: bytes) -> list:
+    """Build rows straight from the raw JSON, the way the models do."""
+    now = datetime.now(timezone.utc)
+    return [model.get_row(item, now) for item in json.loads(body)["items"]]
+
+
+def best_time(func, *args, repeat: int) -> float:
+    """Get the fastest of several runs of func, in milliseconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main(sizes: list[int]) -> None:
+    api_client = client.ApiClient()
+    pods = K8sPods(namespace="default")
+    deployments = K8sDeployments(namespace="default")
+
+    print(f"{'kind':<12}{'objects':>8}{'typed ms':>12}{'raw ms':>10}{'x':>7}")
+    for size in sizes:
+        repeat = 5 if size <= 1000 else 2
+        cases = [
+            (
+                "Pods",
+                make_list("PodList", [make_pod(i) for i in range(size)]),
+                typed_pod_rows,
+                pods,
+            ),
+            (
+                "Deployments",
+                make_list(
+                    "DeploymentList",
+                    [make_deployment(i) for i in range(size)],
+                ),
+                typed_deployment_rows,
+                deployments,
+            ),
+        ]
+        for kind, body, typed_rows, model in cases:
+            assert typed_rows(api_client, body) == raw_rows(model, body)
+            typed = best_time(typed_rows, api_client, body, repeat=repeat)
+            raw = best_time(raw_rows, model, body, repeat=repeat)
+            print(
+                f"{kind:<12}{size:>8}{typed:>12.1f}{raw:>10.1f}"
+                f"{typed / raw:>7.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or DEFAULT_SIZES)
@@ -10,6 +10,8 @@ from ttork.widgets import (
     K8sResourceTable,
     ResourceTextArea,
     ContainerLogs,
+    TiltProcessLogs,
+    TiltLogs,
 )
 
 
@@ -39,6 +41,8 @@ class TTorkApp(App):
                 theme="dracula",
             )
             yield ContainerLogs("Logs", id="logs-display")
+            yield TiltProcessLogs(id="tilt-output-display")
+            yield TiltLogs(id="tilt-logs-display")
         yield Footer()
 
     def on_resize(self, event):
@@ -63,6 +63,24 @@ def main(argv: list[str] = sys.argv[1:]):
             dest="autostart",
             help="Automatically start Tilt processes.",
         )
+        parser.add_option(
+            "-f",
+            "--fresh",
+            action="store_true",
+            default=False,
+            dest="fresh",
+            help="Stop Tilt processes left running by an earlier ttork, "
+            "instead of reattaching to them.",
+        )
+        parser.add_option(
+            "-k",
+            "--keep-running",
+            action="store_true",
+            default=False,
+            dest="keep_running",
+            help="Leave Tilt processes running on exit, so the next ttork "
+            "can reattach to them.",
+        )
         (options, args) = parser.parse_args(argv)
         action = args[0]
 
@@ -88,6 +106,10 @@ def start(options: Values, args: list[str]) -> None:
 
     if options.autostart:
         ttork_conf["autostart"] = True
+    if options.fresh:
+        ttork_conf["fresh"] = True
+    if options.keep_running:
+        ttork_conf["keepRunning"] = True
 
     # Start the application
     app = TTorkApp()
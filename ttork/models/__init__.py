@@ -4,10 +4,14 @@ from ._k8s_resource_data import K8sResourceData
 from ._k8s_deployments import K8sDeployments
 from ._k8s_pods import K8sPods
 from ._k8s_containers import K8sContainers
+from ._k8s_table_resource import K8sTableResource
+from ._tilt_resource import TiltResource
 
 __all__ = [
     "K8sResourceData",
     "K8sDeployments",
     "K8sPods",
     "K8sContainers",
+    "K8sTableResource",
+    "TiltResource",
 ]
@@ -5,20 +5,35 @@ from kubernetes.client.rest import ApiException
 from textual.binding import Binding, _Bindings
 from textual.app import App
 
-from ttork.utilities import format_age
+from ttork.utilities import format_age, parse_timestamp, read_json_response
 from ttork.models import K8sResourceData
 
 
 class K8sContainers:
     """K8sContainers is a model for Kubernetes Containers."""
 
-    def __init__(self, namespace: str) -> None:
+    def __init__(
+        self,
+        namespace: str,
+        informer=None,
+        api_client: client.ApiClient = None,
+        request_timeout: tuple[float, float] = None,
+    ) -> None:
         self.name: str = "Containers"
         self.namespace: str = namespace
         self.label_selector: str = None
         self.resource_data: K8sResourceData = None
         self.pod_name: str = None
 
+        # Watched copy of the namespace's Pods, the pod is read from the
+        # cluster on every refresh if not set.
+        self.informer = informer
+
+        # Client shared with the other models, and the (connect, read)
+        # timeouts of each request made with it.
+        self.api = client.CoreV1Api(api_client)
+        self.request_timeout = request_timeout
+
     def refresh_resource_data(self) -> None:
         """Get the Containers resources from the cluster."""
         # We only need the containers if the pod label_selector is not None
@@ -29,92 +44,36 @@ class K8sContainers:
             self.pod_name = pod_name
 
         now = datetime.now(timezone.utc)
-        api_instance = client.CoreV1Api()
 
         # Grab the pod information, which includes the container information
-        try:
-            pod = api_instance.read_namespaced_pod(
-                name=pod_name, namespace=self.namespace
-            )
-        except ApiException:
-            return None
-
-        container_data = []
-
-        # Check for regular containers
-        if pod.status.container_statuses is None:
-            container_status = []
-        else:
-            container_status = pod.status.container_statuses
-
-        for container in container_status:
-            age_display = format_age(
-                (now - container.state.running.started_at).seconds
-            )
-            container_data.append(
-                {
-                    "values": [
-                        container.name,
-                        container.image,
-                        "TRUE" if container.ready else "FALSE",
-                        self.get_container_state(container),
-                        "standard",
-                        str(container.restart_count),
-                        age_display,
-                    ],
-                    "style": "info",
-                }
-            )
-
-        # Check for init containers
-        if pod.status.init_container_statuses is None:
-            init_container_status = []
+        if self.informer is not None:
+            pod = self.informer.get(pod_name)
+            if pod is None:
+                return None
         else:
-            init_container_status = pod.status.init_container_statuses
-
-        for container in init_container_status:
-            age_display = format_age(
-                (now - container.state.running.started_at).seconds
-            )
-            container_data.append(
-                {
-                    "values": [
-                        container.name,
-                        container.image,
-                        "TRUE" if container.ready else "FALSE",
-                        self.get_container_state(container),
-                        "init",
-                        str(container.restart_count),
-                        age_display,
-                    ],
-                    "style": "info",
-                }
-            )
-
-        # Check for ephemeral containers
-        if pod.status.ephemeral_container_statuses is None:
-            eph_container_status = []
-        else:
-            eph_container_status = pod.status.ephemeral_container_statuses
-
-        for container in eph_container_status:
-            age_display = format_age(
-                (now - container.state.running.started_at).seconds
-            )
-            container_data.append(
-                {
-                    "values": [
-                        container.name,
-                        container.image,
-                        "TRUE" if container.ready else "FALSE",
-                        self.get_container_state(container),
-                        "ephemeral",
-                        str(container.restart_count),
-                        age_display,
-                    ],
-                    "style": "info",
-                }
+            try:
+                pod = read_json_response(
+                    self.api.read_namespaced_pod(
+                        name=pod_name,
+                        namespace=self.namespace,
+                        _request_timeout=self.request_timeout,
+                        _preload_content=False,
+                    )
+                )
+            except ApiException:
+                return None
+
+        # Regular containers, then init and ephemeral containers
+        status = pod.get("status") or {}
+        container_data = [
+            self.get_row(container, container_type, now)
+            for key, container_type in (
+                ("containerStatuses", "standard"),
+                ("initContainerStatuses", "init"),
+                ("ephemeralContainerStatuses", "ephemeral"),
             )
+            for container in status.get(key) or []
+        ]
 
         self.resource_data = K8sResourceData(
             name=self.name,
@@ -152,30 +111,51 @@ class K8sContainers:
             self.refresh_resource_data()
         return self.resource_data
 
-    def get_container_state(self, container_status):
+    def get_row(
+        self, container_status: dict, container_type: str, now: datetime
+    ) -> dict:
+        """Project the raw JSON of a container's status into a table row."""
+        running = (container_status.get("state") or {}).get("running")
+        if running and running.get("startedAt"):
+            age_display = format_age(
+                (now - parse_timestamp(running["startedAt"])).seconds
+            )
+        else:
+            age_display = "-"
+        return {
+            "values": [
+                container_status["name"],
+                container_status.get("image"),
+                "TRUE" if container_status.get("ready") else "FALSE",
+                self.get_container_state(container_status),
+                container_type,
+                str(container_status.get("restartCount", 0)),
+                age_display,
+            ],
+            "style": "info",
+        }
+
+    def get_container_state(self, container_status: dict) -> str:
         """Get the state of the container."""
-        if container_status.state.waiting is not None:
-            if container_status.state.waiting.reason is not None:
-                return container_status.state.waiting.reason
-            return "Waiting"
-        elif container_status.state.terminated is not None:
-            if container_status.state.terminated.reason is not None:
-                return container_status.state.terminated.reason
-            return "Terminating"
-        elif container_status.state.running is not None:
+        state = container_status.get("state") or {}
+        if state.get("waiting") is not None:
+            return state["waiting"].get("reason") or "Waiting"
+        elif state.get("terminated") is not None:
+            return state["terminated"].get("reason") or "Terminating"
+        elif state.get("running") is not None:
             return "Running"
         else:
             return "Unknown"
 
     def get_container_logs(self, container_name: str, pod_name: str):
         """Get the logs for the specified container."""
-        api_instance = client.CoreV1Api()
         try:
-            logs = api_instance.read_namespaced_pod_log(
+            logs = self.api.read_namespaced_pod_log(
                 name=pod_name,
                 namespace=self.namespace,
                 container=container_name,
                 tail_lines=100,
+                _request_timeout=self.request_timeout,
             )
             return logs
         except ApiException:
@@ -0,0 +1,102 @@
+import unittest
+
+from kubernetes import client
+
+from ttork.network._k8s_informer import K8sInformer
+from ttork.network._k8s_informer_test import FakeK8sServer
+from ._k8s_containers import K8sContainers
+
+
+class TestK8sContainers(unittest.TestCase):
+
+    def setUp(self):
+        self.server = FakeK8sServer()
+        self.addCleanup(self.server.stop)
+        self.server.put(
+            "pods",
+            "api-1",
+            status={
+                "containerStatuses": [
+                    {
+                        "name": "api",
+                        "image": "api:latest",
+                        "ready": True,
+                        "restartCount": 2,
+                        "state": {
+                            "running": {"startedAt": "2024-01-01T00:00:00Z"}
+                        },
+                    },
+                    {
+                        "name": "sidecar",
+                        "image": "sidecar:1.0",
+                        "ready": False,
+                        "restartCount": 0,
+                        "state": {"waiting": {"reason": "CrashLoopBackOff"}},
+                    },
+                ],
+                "initContainerStatuses": [
+                    {
+                        "name": "migrate",
+                        "image": "api:latest",
+                        "ready": False,
+                        "restartCount": 0,
+                        "state": {"terminated": {"reason": "Completed"}},
+                    }
+                ],
+            },
+        )
+        api_client = self.server.make_api_client()
+        self.addCleanup(api_client.close)
+        self.containers = K8sContainers(
+            namespace="default", api_client=api_client, request_timeout=(1, 1)
+        )
+
+    def test_rows_from_pod(self):
+        self.containers.label_selector = "pod=api-1"
+
+        self.containers.refresh_resource_data()
+
+        rows = [row["values"] for row in self.containers.get_resource_data()]
+        self.assertEqual(
+            [row[:6] for row in rows],
+            [
+                ["api", "api:latest", "TRUE", "Running", "standard", "2"],
+                [
+                    "sidecar",
+                    "sidecar:1.0",
+                    "FALSE",
+                    "CrashLoopBackOff",
+                    "standard",
+                    "0",
+                ],
+                ["migrate", "api:latest", "FALSE", "Completed", "init", "0"],
+            ],
+        )
+        self.assertNotEqual(rows[0][6], "-")
+        self.assertEqual(rows[1][6], "-")
+
+    def test_missing_pod(self):
+        self.containers.label_selector = "pod=gone"
+
+        self.containers.refresh_resource_data()
+
+        self.assertIsNone(self.containers.resource_data)
+
+    def test_rows_from_informer(self):
+        api = client.CoreV1Api(self.server.make_api_client())
+        informer = K8sInformer(api.list_namespaced_pod, "default")
+        informer.start()
+        self.addCleanup(informer.stop)
+        self.assertTrue(informer.synced.wait(2))
+        self.containers.informer = informer
+        self.containers.label_selector = "pod=api-1"
+        reads = self.server.reads
+
+        self.containers.refresh_resource_data()
+
+        self.assertEqual(len(self.containers.get_resource_data()), 3)
+        self.assertEqual(self.server.reads, reads)
+
+
+if __name__ == "__main__":
+    unittest.main()
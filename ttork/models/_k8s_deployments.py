@@ -5,53 +5,61 @@ from kubernetes.client.rest import ApiException
 from textual.binding import Binding, _Bindings
 
 
-from ttork.utilities import format_age
+from ttork.utilities import format_age, parse_timestamp, read_json_items
 from ttork.models import K8sResourceData
 
 
 class K8sDeployments:
     """K8sDeployments is a model for Kubernetes Deployments."""
 
-    def __init__(self, namespace: str) -> None:
+    def __init__(
+        self,
+        namespace: str,
+        informer=None,
+        api_client: client.ApiClient = None,
+        request_timeout: tuple[float, float] = None,
+        page_size: int = None,
+    ) -> None:
         self.name: str = "Deployments"
         self.namespace: str = namespace
         self.label_selector: str = None
         self.resource_data: K8sResourceData = None
 
+        # Watched copy of the namespace's Deployments, listed from the
+        # cluster on every refresh if not set.
+        self.informer = informer
+
+        # Client shared with the other models, and the (connect, read)
+        # timeouts of each request made with it.
+        self.api = client.AppsV1Api(api_client)
+        self.request_timeout = request_timeout
+
+        # Number of resources listed per request, all at once if not set
+        self.page_size = page_size
+
     def refresh_resource_data(self) -> None:
         """Refresh resource data from the cluster."""
-        api_instance = client.AppsV1Api()
+        if self.informer is not None:
+            deployments = self.informer.list(self.label_selector)
+        else:
+            # Listed a page at a time, each page projected into rows
+            # before the next one is read.
+            deployments = read_json_items(
+                self.api.list_namespaced_deployment,
+                self.page_size,
+                namespace=self.namespace,
+                label_selector=self.label_selector,
+                _request_timeout=self.request_timeout,
+            )
 
+        now = datetime.now(timezone.utc)
         try:
-            deployments = api_instance.list_namespaced_deployment(
-                namespace=self.namespace, label_selector=self.label_selector
-            )
+            deployment_data = [
+                self.get_row(deployment, now) for deployment in deployments
+            ]
         except ApiException:
             return None
 
-        deployment_data = []
-        now = datetime.now(timezone.utc)
-        for deployment in deployments.items:
-            age_display = format_age(
-                (now - deployment.metadata.creation_timestamp).seconds
-            )
-            deployment_data.append(
-                {
-                    "values": [
-                        deployment.metadata.name,
-                        "{0}/{1}".format(
-                            deployment.status.ready_replicas or 0,
-                            deployment.status.replicas,
-                        ),
-                        str(deployment.status.replicas),
-                        str(deployment.status.available_replicas),
-                        deployment.metadata.namespace,
-                        age_display,
-                    ],
-                    "style": "info",
-                }
-            )
-
         self.resource_data = K8sResourceData(
             name=self.name,
             namespace=self.namespace,
@@ -76,12 +84,35 @@ class K8sDeployments:
             selector={"label": "app=", "index": 0},
         )
 
+    def get_row(self, deployment: dict, now: datetime) -> dict:
+        """Project the raw JSON of a Deployment into a table row."""
+        metadata = deployment["metadata"]
+        status = deployment.get("status") or {}
+        age_display = format_age(
+            (now - parse_timestamp(metadata["creationTimestamp"])).seconds
+        )
+        return {
+            "values": [
+                metadata["name"],
+                "{0}/{1}".format(
+                    status.get("readyReplicas") or 0,
+                    status.get("replicas"),
+                ),
+                str(status.get("replicas")),
+                str(status.get("availableReplicas")),
+                metadata.get("namespace"),
+                age_display,
+            ],
+            "style": "info",
+        }
+
     def get_description(self, name: str) -> str:
         """Get the description of the specified Deployment."""
-        api_instance = client.AppsV1Api()
         try:
-            deployment = api_instance.read_namespaced_deployment(
-                name=name, namespace=self.namespace
+            deployment = self.api.read_namespaced_deployment(
+                name=name,
+                namespace=self.namespace,
+                _request_timeout=self.request_timeout,
             )
             return yaml.dump(deployment.to_dict(), default_flow_style=False)
         except ApiException:
@@ -90,13 +121,13 @@ class K8sDeployments:
 
     def delete_resource(self, name: str) -> None:
         """Delete the specified Deployment."""
-        api_instance = client.AppsV1Api()
-        api_instance.delete_namespaced_deployment(
+        self.api.delete_namespaced_deployment(
             name=name,
             namespace=self.namespace,
             body=client.V1DeleteOptions(
                 propagation_policy="Foreground", grace_period_seconds=5
             ),
+            _request_timeout=self.request_timeout,
         )
 
     def get_resource_data(self) -> K8sResourceData:
@@ -2,7 +2,7 @@ import yaml
 from datetime import datetime, timezone
 from kubernetes import client
 from kubernetes.client.rest import ApiException
-from ttork.utilities import format_age
+from ttork.utilities import format_age, parse_timestamp, read_json_items
 from ttork.models import K8sResourceData
 from textual.binding import Binding, _Bindings
 
@@ -10,42 +10,52 @@ from textual.binding import Binding, _Bindings
 class K8sPods:
     """K8sPods is a model for Kubernetes Pods."""
 
-    def __init__(self, namespace: str) -> None:
+    def __init__(
+        self,
+        namespace: str,
+        informer=None,
+        api_client: client.ApiClient = None,
+        request_timeout: tuple[float, float] = None,
+        page_size: int = None,
+    ) -> None:
         self.name: str = "Pods"
         self.namespace: str = namespace
         self.label_selector: str = None
         self.resource_data: K8sResourceData = None
 
+        # Watched copy of the namespace's Pods, listed from the cluster on
+        # every refresh if not set.
+        self.informer = informer
+
+        # Client shared with the other models, and the (connect, read)
+        # timeouts of each request made with it.
+        self.api = client.CoreV1Api(api_client)
+        self.request_timeout = request_timeout
+
+        # Number of resources listed per request, all at once if not set
+        self.page_size = page_size
+
     def refresh_resource_data(self) -> None:
         """Refresh resource data from the cluster."""
-        api_instance = client.CoreV1Api()
+        if self.informer is not None:
+            pods = self.informer.list(self.label_selector)
+        else:
+            # Listed a page at a time, each page projected into rows
+            # before the next one is read.
+            pods = read_json_items(
+                self.api.list_namespaced_pod,
+                self.page_size,
+                namespace=self.namespace,
+                label_selector=self.label_selector,
+                _request_timeout=self.request_timeout,
+            )
 
+        now = datetime.now(timezone.utc)
         try:
-            pods = api_instance.list_namespaced_pod(
-                namespace=self.namespace, label_selector=self.label_selector
-            )
+            pod_data = [self.get_row(pod, now) for pod in pods]
         except ApiException:
             return None
 
-        pod_data = []
-        now = datetime.now(timezone.utc)
-        for pod in pods.items:
-            age_display = format_age(
-                (now - pod.metadata.creation_timestamp).seconds
-            )
-            pod_data.append(
-                {
-                    "values": [
-                        pod.metadata.name,
-                        pod.status.phase,
-                        pod.status.pod_ip or "-",
-                        pod.metadata.namespace,
-                        age_display,
-                    ],
-                    "style": "info",
-                }
-            )
-
         self.resource_data = K8sResourceData(
             name=self.name,
             namespace=self.namespace,
@@ -72,12 +82,31 @@ class K8sPods:
             selector={"label": "pod=", "index": 0},
         )
 
+    def get_row(self, pod: dict, now: datetime) -> dict:
+        """Project the raw JSON of a pod into a table row."""
+        metadata = pod["metadata"]
+        status = pod.get("status") or {}
+        age_display = format_age(
+            (now - parse_timestamp(metadata["creationTimestamp"])).seconds
+        )
+        return {
+            "values": [
+                metadata["name"],
+                status.get("phase"),
+                status.get("podIP") or "-",
+                metadata.get("namespace"),
+                age_display,
+            ],
+            "style": "info",
+        }
+
     def get_description(self, name: str) -> str:
         """Get the description of the specified pod."""
-        api_instance = client.CoreV1Api()
         try:
-            pod = api_instance.read_namespaced_pod(
-                name=name, namespace=self.namespace
+            pod = self.api.read_namespaced_pod(
+                name=name,
+                namespace=self.namespace,
+                _request_timeout=self.request_timeout,
             )
             return yaml.dump(pod.to_dict(), default_flow_style=False)
         except ApiException:
@@ -86,14 +115,14 @@ class K8sPods:
 
     def delete_resource(self, name: str) -> None:
         """Delete the specified pod."""
-        api_instance = client.CoreV1Api()
         try:
-            api_instance.delete_namespaced_pod(
+            self.api.delete_namespaced_pod(
                 name=name,
                 namespace=self.namespace,
                 body=client.V1DeleteOptions(
                     propagation_policy="Foreground", grace_period_seconds=5
                 ),
+                _request_timeout=self.request_timeout,
             )
         except ApiException:
             pass
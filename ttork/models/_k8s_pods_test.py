@@ -0,0 +1,79 @@
+import unittest
+
+from kubernetes import client
+
+from ttork.network._k8s_informer import K8sInformer
+from ttork.network._k8s_informer_test import FakeK8sServer
+from ._k8s_pods import K8sPods
+
+
+class TestK8sPods(unittest.TestCase):
+
+    def setUp(self):
+        self.server = FakeK8sServer()
+        self.server.put(
+            "pods",
+            "api-1",
+            labels={"app": "api"},
+            status={"phase": "Running", "podIP": "10.0.0.1"},
+        )
+        self.server.put("pods", "db-1", labels={"app": "db"})
+        api = client.CoreV1Api(self.server.make_api_client())
+        self.informer = K8sInformer(api.list_namespaced_pod, "default")
+        self.informer.start()
+        self.assertTrue(self.informer.synced.wait(2))
+
+    def tearDown(self):
+        self.informer.stop()
+        self.server.stop()
+
+    def test_rows_from_informer(self):
+        pods = K8sPods(namespace="default", informer=self.informer)
+        pods.label_selector = "app=api"
+        lists = self.server.lists
+
+        pods.refresh_resource_data()
+
+        rows = [row["values"][:4] for row in pods.get_resource_data()]
+        self.assertEqual(rows, [["api-1", "Running", "10.0.0.1", "default"]])
+        self.assertEqual(self.server.lists, lists)
+
+    def test_connection_reused(self):
+        api_client = self.server.make_api_client()
+        self.addCleanup(api_client.close)
+        pods = K8sPods(
+            namespace="default",
+            api_client=api_client,
+            request_timeout=(1, 1),
+        )
+        connections = self.server.connections
+
+        for _ in range(3):
+            pods.refresh_resource_data()
+
+        self.assertEqual(len(pods.get_resource_data()), 2)
+        self.assertEqual(self.server.connections, connections + 1)
+
+    def test_paged_list(self):
+        self.server.put("pods", "web-1", labels={"app": "web"})
+        api_client = self.server.make_api_client()
+        self.addCleanup(api_client.close)
+        pods = K8sPods(
+            namespace="default",
+            api_client=api_client,
+            request_timeout=(1, 1),
+            page_size=2,
+        )
+        lists = self.server.lists
+
+        pods.refresh_resource_data()
+
+        self.assertEqual(
+            [row["values"][0] for row in pods.get_resource_data()],
+            ["api-1", "db-1", "web-1"],
+        )
+        self.assertEqual(self.server.lists, lists + 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
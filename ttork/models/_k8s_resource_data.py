@@ -37,8 +37,14 @@ class K8sResourceData:
             # Column Alignments (default to left if not specified)
             self.col_alignments.append(meta.get("align", "left"))
 
-        # Data for the table
+        # Data for the table, and a cheap token that changes whenever the
+        # rows do, so they can be compared without copying them.
         self.data = data
+        self.change_token = hash(
+            tuple(
+                (tuple(row["values"]), row.get("style")) for row in self.data
+            )
+        )
 
     def __iter__(self):
         for row in self.data:
@@ -0,0 +1,184 @@
+import yaml
+from kubernetes import client
+from kubernetes.client.rest import ApiException
+from ttork.utilities import read_json_pages, read_json_response
+from ttork.models import K8sResourceData
+from textual.binding import Binding, _Bindings
+
+# Asks the API server to render lists as a Table, with the columns kubectl
+# shows, falling back to a plain list for APIs that can't.
+TABLE_ACCEPT = (
+    "application/json;as=Table;v=v1;g=meta.k8s.io,"
+    "application/json;as=Table;v=v1beta1;g=meta.k8s.io,"
+    "application/json"
+)
+
+
+class K8sTableResource:
+    """K8sTableResource is a model for any kind of Kubernetes resource,
+    shown with the columns and cells the API server renders for it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        namespace: str,
+        api_version: str,
+        resource: str,
+        namespaced: bool = True,
+        api_client: client.ApiClient = None,
+        request_timeout: tuple[float, float] = None,
+        page_size: int = None,
+    ) -> None:
+        self.name: str = name
+        self.namespace: str = namespace
+        self.label_selector: str = None
+        self.resource_data: K8sResourceData = None
+
+        # Where the resources are served, such as 'apps/v1' and
+        # 'statefulsets', or 'v1' and 'services' for the core API group.
+        self.api_version = api_version
+        self.resource = resource
+        self.namespaced = namespaced
+
+        # Client shared with the other models, and the (connect, read)
+        # timeouts of each request made with it.
+        self.api_client = api_client or client.ApiClient()
+        self.request_timeout = request_timeout
+
+        # Number of resources listed per request, all at once if not set
+        self.page_size = page_size
+
+    def get_path(self, named: bool = False) -> str:
+        """Get the API path of the resources, or of a named one."""
+        group = "api" if "/" not in self.api_version else "apis"
+        path = f"/{group}/{self.api_version}"
+        if self.namespaced:
+            path += "/namespaces/{namespace}"
+        path += f"/{self.resource}"
+        if named:
+            path += "/{name}"
+        return path
+
+    def call_api(self, method: str, name: str = None, **kwargs):
+        """Make a request for the resources, or for a named one, and return
+        the raw response.
+        """
+        return self.api_client.call_api(
+            self.get_path(named=name is not None),
+            method,
+            path_params={"namespace": self.namespace, "name": name},
+            auth_settings=["BearerToken"],
+            _return_http_data_only=True,
+            _preload_content=False,
+            _request_timeout=self.request_timeout,
+            **kwargs,
+        )
+
+    def list_table(self, limit: int = None, _continue: str = None, **kwargs):
+        """List a page of the resources, rendered as a Table."""
+        query_params = []
+        if self.label_selector:
+            query_params.append(("labelSelector", self.label_selector))
+        if limit:
+            query_params.append(("limit", limit))
+        if _continue:
+            query_params.append(("continue", _continue))
+        return self.call_api(
+            "GET",
+            query_params=query_params,
+            header_params={"Accept": TABLE_ACCEPT},
+        )
+
+    def refresh_resource_data(self) -> None:
+        """Refresh resource data from the cluster, a page at a time."""
+        columns = None
+        rows = []
+        try:
+            for table in read_json_pages(self.list_table, self.page_size):
+                if table.get("kind") != "Table":
+                    columns = [(0, "Name")]
+                    rows.extend(
+                        [item["metadata"]["name"]]
+                        for item in table.get("items") or []
+                    )
+                    continue
+                if columns is None:
+                    # Only the columns kubectl shows without '-o wide'
+                    columns = [
+                        (index, column["name"])
+                        for index, column in enumerate(
+                            table["columnDefinitions"]
+                        )
+                        if column.get("priority", 0) == 0
+                    ]
+                rows.extend(
+                    [format_cell(row["cells"][index]) for index, _ in columns]
+                    for row in table.get("rows") or []
+                )
+        except ApiException:
+            return None
+
+        # The first column (the name) takes up the spare width, the others
+        # are as wide as their widest cell.
+        col_meta = []
+        for position, (_, column_name) in enumerate(columns):
+            width = None
+            if position > 0:
+                width = max(len(row[position]) for row in rows) if rows else 0
+            col_meta.append(
+                {"name": column_name.upper(), "width": width, "align": "left"}
+            )
+
+        self.resource_data = K8sResourceData(
+            name=self.name,
+            namespace=self.namespace,
+            col_meta=col_meta,
+            bindings=_Bindings(
+                [
+                    Binding("d", "show_description", "Description", show=True),
+                    Binding("ctrl+d", "delete_resource", "Delete", show=True),
+                ]
+            ),
+            data=[{"values": values, "style": "info"} for values in rows],
+        )
+
+    def get_description(self, name: str) -> str:
+        """Get the description of the specified resource."""
+        try:
+            resource = read_json_response(self.call_api("GET", name=name))
+            return yaml.dump(resource, default_flow_style=False)
+        except ApiException:
+            pass
+        return ""
+
+    def delete_resource(self, name: str) -> None:
+        """Delete the specified resource."""
+        try:
+            self.call_api(
+                "DELETE",
+                name=name,
+                body={
+                    "propagationPolicy": "Foreground",
+                    "gracePeriodSeconds": 5,
+                },
+            ).release_conn()
+        except ApiException:
+            pass
+
+    def get_resource_data(self) -> K8sResourceData:
+        """Return the current resource data."""
+        if self.resource_data is None:
+            self.refresh_resource_data()
+        return self.resource_data
+
+
+def format_cell(cell) -> str:
+    """Format a table cell the way kubectl prints it."""
+    if cell is None:
+        return "<none>"
+    if isinstance(cell, bool):
+        return str(cell).lower()
+    if isinstance(cell, list):
+        return ",".join(format_cell(item) for item in cell) or "<none>"
+    return str(cell)
@@ -0,0 +1,108 @@
+import unittest
+
+import yaml
+
+from ttork.network._k8s_informer_test import FakeK8sServer
+from ._k8s_table_resource import K8sTableResource, format_cell
+
+
+class TestK8sTableResource(unittest.TestCase):
+
+    def setUp(self):
+        self.server = FakeK8sServer()
+        self.addCleanup(self.server.stop)
+        self.server.put(
+            "statefulsets",
+            "web",
+            labels={"app": "web"},
+            status={"phase": "Ready", "replicas": 3},
+        )
+        self.server.put("statefulsets", "db", labels={"app": "db"})
+        api_client = self.server.make_api_client()
+        self.addCleanup(api_client.close)
+        self.statefulsets = K8sTableResource(
+            name="StatefulSets",
+            namespace="default",
+            api_version="apps/v1",
+            resource="statefulsets",
+            api_client=api_client,
+            request_timeout=(1, 1),
+        )
+
+    def test_rows_from_table(self):
+        self.statefulsets.refresh_resource_data()
+
+        resource_data = self.statefulsets.get_resource_data()
+        self.assertEqual(
+            resource_data.col_names, ["NAME", "PHASE", "REPLICAS"]
+        )
+        self.assertEqual(
+            [row["values"] for row in resource_data],
+            [["web", "Ready", "3"], ["db", "<none>", "0"]],
+        )
+        self.assertEqual(resource_data.dynamic_columns, [0])
+        self.assertEqual(resource_data.col_min_widths[1:], [6, 8])
+
+    def test_paged_table(self):
+        self.server.put("statefulsets", "cache", labels={"app": "cache"})
+        self.statefulsets.page_size = 2
+
+        self.statefulsets.refresh_resource_data()
+
+        self.assertEqual(
+            [row["values"][0] for row in self.statefulsets.resource_data],
+            ["web", "db", "cache"],
+        )
+        self.assertEqual(self.server.lists, 2)
+
+    def test_label_selector(self):
+        self.statefulsets.label_selector = "app=db"
+
+        self.statefulsets.refresh_resource_data()
+
+        self.assertEqual(
+            [row["values"][0] for row in self.statefulsets.resource_data],
+            ["db"],
+        )
+
+    def test_description_and_delete(self):
+        description = yaml.safe_load(self.statefulsets.get_description("web"))
+        self.assertEqual(description["status"]["replicas"], 3)
+
+        self.statefulsets.delete_resource("web")
+
+        self.assertEqual(list(self.server.objects["statefulsets"]), ["db"])
+        self.assertEqual(self.statefulsets.get_description("web"), "")
+
+    def test_paths(self):
+        services = K8sTableResource(
+            name="Services",
+            namespace="default",
+            api_version="v1",
+            resource="services",
+        )
+        nodes = K8sTableResource(
+            name="Nodes",
+            namespace="default",
+            api_version="v1",
+            resource="nodes",
+            namespaced=False,
+        )
+        self.assertEqual(
+            self.statefulsets.get_path(named=True),
+            "/apis/apps/v1/namespaces/{namespace}/statefulsets/{name}",
+        )
+        self.assertEqual(
+            services.get_path(), "/api/v1/namespaces/{namespace}/services"
+        )
+        self.assertEqual(nodes.get_path(), "/api/v1/nodes")
+
+    def test_format_cell(self):
+        self.assertEqual(format_cell(None), "<none>")
+        self.assertEqual(format_cell(True), "true")
+        self.assertEqual(format_cell(["80/TCP", "443/TCP"]), "80/TCP,443/TCP")
+        self.assertEqual(format_cell(1.5), "1.5")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,24 @@
+from typing import NamedTuple
+
+
+class TiltResource(NamedTuple):
+    """TiltResource is a compact projection of a Tilt uiResource, holding
+    only the fields used to display and track its status.
+
+    The full uiResource can be fetched on demand with
+    TiltService.get_resource_details.
+    """
+
+    name: str
+    update_status: str
+    runtime_status: str
+
+    @classmethod
+    def from_ui_resource(cls, ui_resource: dict) -> "TiltResource":
+        """Project a uiResource from the Tilt view API."""
+        status = ui_resource.get("status") or {}
+        return cls(
+            name=ui_resource["metadata"]["name"],
+            update_status=status.get("updateStatus", "offline"),
+            runtime_status=status.get("runtimeStatus", "unknown"),
+        )
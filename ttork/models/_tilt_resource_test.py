@@ -0,0 +1,31 @@
+import unittest
+
+from ._tilt_resource import TiltResource
+
+
+class TestTiltResource(unittest.TestCase):
+
+    def test_from_ui_resource(self):
+        ui_resource = {
+            "metadata": {"name": "api", "uid": "1234"},
+            "spec": {"links": []},
+            "status": {
+                "updateStatus": "in_progress",
+                "runtimeStatus": "ok",
+                "buildHistory": [{"startTime": "2024-06-15T12:00:00Z"}],
+            },
+        }
+        self.assertEqual(
+            TiltResource.from_ui_resource(ui_resource),
+            TiltResource("api", "in_progress", "ok"),
+        )
+
+    def test_from_ui_resource_missing_status(self):
+        self.assertEqual(
+            TiltResource.from_ui_resource({"metadata": {"name": "api"}}),
+            TiltResource("api", "offline", "unknown"),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
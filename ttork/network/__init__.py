@@ -2,8 +2,10 @@ from __future__ import annotations
 
 from ._tilt_service import TiltService
 from ._k8s_service import K8sService
+from ._tilt_log_tail import TiltLogTail
 
 __all__ = [
     "TiltService",
     "K8sService",
+    "TiltLogTail",
 ]
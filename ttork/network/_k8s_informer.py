@@ -0,0 +1,311 @@
+import logging
+import re
+import threading
+import urllib3
+from typing import Callable
+from kubernetes import watch
+from kubernetes.client.rest import ApiException
+from ttork.utilities import read_json_pages
+
+# Label selector requirements: "key", "!key", "key=value", "key==value",
+# "key!=value", "key in (a,b)" and "key notin (a,b)".
+LABEL_REQUIREMENT = re.compile(
+    r"\s*(?P<not>!)?\s*(?P<key>[\w./-]+)\s*"
+    r"(?:(?P<op>==|=|!=)\s*(?P<value>[\w.-]*)"
+    r"|\s(?P<set_op>in|notin)\s*\((?P<values>[^)]*)\))?\s*(?:,|$)"
+)
+
+# HTTP status of a watch whose resourceVersion is too old to resume from
+HTTP_STATUS_GONE = 410
+
+
+class K8sInformer:
+    """Keeps a local copy of a kind of Kubernetes resource in a namespace.
+
+    The resources are listed once, then kept up to date by watching for
+    changes from the resourceVersion of the list, so the API server only
+    sends what has changed. The watch runs in its own thread, resumes
+    from the last resourceVersion seen when it ends, and starts over with
+    a new list when that resourceVersion has expired (410 Gone). Lists
+    are read in pages of page_size resources, and also start over if the
+    continue token of a page expires.
+
+    Resources are kept as their raw JSON, without the client's model
+    deserialization, which costs far more than reading the few fields
+    the views show. They're indexed by name, and by each of their labels,
+    so the views drilled down into can be served from the store as
+    quickly as the views above them.
+    """
+
+    def __init__(
+        self,
+        list_func: Callable,
+        namespace: str,
+        on_change: Callable[[], None] = None,
+        request_timeout: tuple[float, float] = (2.0, 10.0),
+        watch_timeout: int = 300,
+        retry_interval: float = 1.0,
+        max_retry_interval: float = 30.0,
+        page_size: int = None,
+        logger: logging.Logger = None,
+    ) -> None:
+        self.list_func = list_func
+        self.namespace = namespace
+        self.on_change = on_change
+        self.request_timeout = request_timeout
+        self.watch_timeout = watch_timeout
+        self.retry_interval = retry_interval
+        self.max_retry_interval = max_retry_interval
+        self.page_size = page_size
+        self.log = logger or logging.getLogger(__name__)
+
+        # Resources by name, and the resourceVersion they're current as of.
+        # The version is incremented on every change to the store.
+        self.store = {}
+        self.label_index = {}
+        self.lock = threading.Lock()
+        self.resource_version = None
+        self.version = 0
+        self.lists = 0
+
+        self.synced = threading.Event()
+        self.stopped = threading.Event()
+        self.watcher = None
+        self.thread = threading.Thread(
+            target=self.run,
+            name=f"k8s-informer-{namespace}",
+            daemon=True,
+        )
+
+    def start(self) -> None:
+        """Start listing and watching in a background thread."""
+        self.thread.start()
+
+    def stop(self) -> None:
+        """Stop watching, once the current watch request returns."""
+        self.stopped.set()
+        watcher = self.watcher
+        if watcher is not None:
+            watcher.stop()
+
+    def run(self) -> None:
+        """List, then watch, until stopped, backing off on errors.
+        Unexpected errors are logged, and followed by a new list.
+        """
+        failures = 0
+        while not self.stopped.is_set():
+            try:
+                if self.resource_version is None:
+                    self.relist()
+                self.watch()
+                failures = 0
+                continue
+            except ApiException as error:
+                if error.status == HTTP_STATUS_GONE:
+                    # Too far behind to resume the watch, so start over
+                    self.resource_version = None
+                    continue
+            except (urllib3.exceptions.HTTPError, OSError, ValueError):
+                pass
+            except Exception:
+                # Anything else would end the thread, and leave the store
+                # silently out of date. It may also be partly updated, so
+                # start over with a new list.
+                self.log.exception(
+                    f"Watch of {self.thread.name} failed, relisting"
+                )
+                self.resource_version = None
+
+            self.stopped.wait(
+                min(
+                    self.retry_interval * 2**failures,
+                    self.max_retry_interval,
+                )
+            )
+            failures += 1
+
+    def relist(self) -> None:
+        """Replace the store with a fresh list of the resources, read a page
+        at a time. All pages are from the same resourceVersion, and the
+        store is only replaced once the last one is in.
+        """
+        store = {}
+        for page in read_json_pages(
+            self.list_func,
+            self.page_size,
+            namespace=self.namespace,
+            _request_timeout=self.request_timeout,
+        ):
+            for resource in page.get("items") or []:
+                store[resource["metadata"]["name"]] = resource
+            resource_version = page["metadata"].get("resourceVersion")
+        label_index = {}
+        for name, resource in store.items():
+            index_labels(label_index, name, resource)
+        with self.lock:
+            self.store = store
+            self.label_index = label_index
+            self.resource_version = resource_version
+            self.version += 1
+            self.lists += 1
+        self.synced.set()
+        self.notify_change()
+
+    def watch(self) -> None:
+        """Apply the changes since the last resourceVersion, until the
+        watch times out on the server or the informer is stopped.
+        """
+        self.watcher = RawWatch()
+        for event in self.watcher.stream(
+            self.list_func,
+            namespace=self.namespace,
+            resource_version=self.resource_version,
+            timeout_seconds=self.watch_timeout,
+            allow_watch_bookmarks=True,
+            # The server ends the watch after watch_timeout, so only give
+            # up on the connection if it's silent for longer than that.
+            _request_timeout=(
+                self.request_timeout[0],
+                self.watch_timeout + self.request_timeout[1],
+            ),
+        ):
+            self.apply_event(event)
+            if self.stopped.is_set():
+                break
+
+    def apply_event(self, event: dict) -> None:
+        """Apply a single watch event to the store."""
+        metadata = event["raw_object"].get("metadata") or {}
+        with self.lock:
+            self.resource_version = metadata.get(
+                "resourceVersion", self.resource_version
+            )
+            if event["type"] == "BOOKMARK":
+                return
+
+            # Replace (or remove) the resource, and its labels in the index
+            name = metadata.get("name")
+            previous = self.store.pop(name, None)
+            if previous is not None:
+                unindex_labels(self.label_index, name, previous)
+            if event["type"] != "DELETED":
+                self.store[name] = event["raw_object"]
+                index_labels(self.label_index, name, event["raw_object"])
+            self.version += 1
+        self.notify_change()
+
+    def notify_change(self) -> None:
+        """Let the owner know the store has changed."""
+        if self.on_change is not None:
+            self.on_change()
+
+    def get(self, name: str) -> dict:
+        """Get the raw JSON of the named resource, or None if it's not
+        stored.
+        """
+        with self.lock:
+            return self.store.get(name)
+
+    def list(self, label_selector: str = None) -> list[dict]:
+        """Get the raw JSON of the stored resources, sorted by name,
+        optionally only those matching a label selector.
+
+        The label index narrows the resources down to those with the
+        label values the selector's equality and set requirements ask
+        for, before checking them against all of its requirements.
+        """
+        requirements = parse_label_selector(label_selector)
+        with self.lock:
+            names = None
+            for key, operator, values in requirements:
+                if operator not in ("=", "in"):
+                    continue
+                matching = set().union(
+                    *(
+                        self.label_index.get((key, value), ())
+                        for value in values
+                    )
+                )
+                names = matching if names is None else names & matching
+            if names is None:
+                names = self.store
+            resources = [self.store[name] for name in sorted(names)]
+        return [
+            resource
+            for resource in resources
+            if matches_labels(
+                resource["metadata"].get("labels") or {}, requirements
+            )
+        ]
+
+
+def index_labels(label_index: dict, name: str, resource: dict) -> None:
+    """Add a resource's labels to a label index, of the names of the
+    resources with each (key, value) label.
+    """
+    labels = resource.get("metadata", {}).get("labels") or {}
+    for label in labels.items():
+        label_index.setdefault(label, set()).add(name)
+
+
+def unindex_labels(label_index: dict, name: str, resource: dict) -> None:
+    """Remove a resource's labels from a label index."""
+    labels = resource.get("metadata", {}).get("labels") or {}
+    for label in labels.items():
+        names = label_index.get(label)
+        if names is not None:
+            names.discard(name)
+            if not names:
+                del label_index[label]
+
+
+class RawWatch(watch.Watch):
+    """Watch that leaves the objects of its events as raw JSON."""
+
+    def get_return_type(self, func: Callable) -> str:
+        return None
+
+
+def parse_label_selector(label_selector: str) -> list[tuple]:
+    """Parse a label selector into (key, operator, values) requirements.
+
+    Raises:
+        ValueError: if the label selector isn't valid
+    """
+    requirements = []
+    position = 0
+    label_selector = (label_selector or "").strip()
+    while position < len(label_selector):
+        match = LABEL_REQUIREMENT.match(label_selector, position)
+        if match is None or match.end() == position:
+            raise ValueError(f"Invalid label selector: {label_selector}")
+        position = match.end()
+
+        key = match["key"]
+        if match["not"]:
+            requirements.append((key, "!", ()))
+        elif match["op"]:
+            operator = "!=" if match["op"] == "!=" else "="
+            requirements.append((key, operator, (match["value"],)))
+        elif match["set_op"]:
+            values = tuple(v.strip() for v in match["values"].split(","))
+            requirements.append((key, match["set_op"], values))
+        else:
+            requirements.append((key, "exists", ()))
+    return requirements
+
+
+def matches_labels(labels: dict, requirements: list[tuple]) -> bool:
+    """Check if a resource's labels meet all of the requirements."""
+    for key, operator, values in requirements:
+        if operator == "exists":
+            matched = key in labels
+        elif operator == "!":
+            matched = key not in labels
+        elif operator in ("=", "in"):
+            matched = labels.get(key) in values
+        else:
+            matched = labels.get(key) not in values
+        if not matched:
+            return False
+    return True
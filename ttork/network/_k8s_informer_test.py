@@ -0,0 +1,438 @@
+"""
+This module is used to test the K8sInformer module.
+"""
+
+import json
+import queue
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from kubernetes import client
+
+from ._k8s_informer import (
+    K8sInformer,
+    matches_labels,
+    parse_label_selector,
+)
+from ._tilt_service_test import wait_for
+
+
+class FakeK8sHandler(BaseHTTPRequestHandler):
+    """Serves the objects of the server's namespace, as lists or tables,
+    and streams watch events pushed to the server. Watches from a
+    resourceVersion older than the server's oldest are answered with a
+    410 Gone error event.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        *_, kind, name = url.path.rstrip("/").split("/")
+        if kind in self.server.objects:
+            self.server.reads += 1
+            obj = self.server.objects[kind].get(name)
+            if obj is None:
+                self.send_error(404)
+            else:
+                self.send_json(obj)
+            return
+        elif name not in self.server.objects:
+            self.send_error(404)
+            return
+        kind = name
+
+        if query.get("watch", [""])[0].lower() == "true":
+            return self.stream_events(kind, query)
+
+        self.server.lists += 1
+        requirements = parse_label_selector(
+            query.get("labelSelector", [""])[0]
+        )
+        items = [
+            obj
+            for obj in self.server.objects[kind].values()
+            if matches_labels(obj["metadata"]["labels"], requirements)
+        ]
+        # Pages of 'limit' items, continued from the offset in the token
+        metadata = {"resourceVersion": str(self.server.resource_version)}
+        limit = int(query.get("limit", ["0"])[0])
+        if limit:
+            offset = int(query.get("continue", ["0"])[0])
+            if offset + limit < len(items):
+                metadata["continue"] = str(offset + limit)
+            items = items[offset : offset + limit]
+
+        if "as=Table" in self.headers.get("Accept", ""):
+            return self.send_table(items, metadata)
+        self.send_json(
+            {
+                "kind": "List",
+                "apiVersion": "v1",
+                "metadata": metadata,
+                "items": items,
+            }
+        )
+
+    def do_DELETE(self):
+        *_, kind, name = urlparse(self.path).path.rstrip("/").split("/")
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if name not in self.server.objects.get(kind, {}):
+            self.send_error(404)
+            return
+        self.server.delete(kind, name)
+        self.send_json({"kind": "Status", "status": "Success"})
+
+    def send_table(self, items: list[dict], metadata: dict):
+        """Render items the way the API server does for 'as=Table'."""
+        self.send_json(
+            {
+                "kind": "Table",
+                "apiVersion": "meta.k8s.io/v1",
+                "metadata": metadata,
+                "columnDefinitions": [
+                    {"name": "Name", "type": "string", "priority": 0},
+                    {"name": "Phase", "type": "string", "priority": 0},
+                    {"name": "Replicas", "type": "integer", "priority": 0},
+                    {"name": "Labels", "type": "string", "priority": 1},
+                ],
+                "rows": [
+                    {
+                        "cells": [
+                            obj["metadata"]["name"],
+                            obj["status"].get("phase"),
+                            obj["status"].get("replicas", 0),
+                            ",".join(
+                                f"{key}={value}"
+                                for key, value in obj["metadata"][
+                                    "labels"
+                                ].items()
+                            ),
+                        ],
+                        "object": {"metadata": obj["metadata"]},
+                    }
+                    for obj in items
+                ],
+            }
+        )
+
+    def send_json(self, body: dict):
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def stream_events(self, kind: str, query: dict):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        resource_version = int(query.get("resourceVersion", ["0"])[0])
+        if resource_version < self.server.oldest_resource_version:
+            self.send_chunk(
+                {
+                    "type": "ERROR",
+                    "object": {
+                        "kind": "Status",
+                        "code": 410,
+                        "reason": "Expired",
+                        "message": "too old resource version",
+                    },
+                }
+            )
+        else:
+            events = queue.Queue()
+            self.server.watches.append((kind, events))
+            while (event := events.get()) is not None:
+                self.send_chunk(event)
+        self.wfile.write(b"0\r\n\r\n")
+        self.close_connection = True
+
+    def send_chunk(self, event: dict):
+        line = json.dumps(event).encode() + b"\n"
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(line), line))
+        self.wfile.flush()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeK8sServer(ThreadingHTTPServer):
+    """Minimal stand-in for the Kubernetes API server."""
+
+    daemon_threads = True
+
+    def __init__(self, namespace: str = "default") -> None:
+        super().__init__(("localhost", 0), FakeK8sHandler)
+        self.namespace = namespace
+        self.objects = {"pods": {}, "deployments": {}, "statefulsets": {}}
+        self.resource_version = 1
+        self.oldest_resource_version = 0
+        self.lists = 0
+        self.reads = 0
+        self.connections = 0
+        self.watches = []
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def make_api_client(self) -> client.ApiClient:
+        """Build an API client that talks to this server."""
+        configuration = client.Configuration()
+        configuration.host = f"http://localhost:{self.port}"
+        return client.ApiClient(configuration)
+
+    def put(self, kind: str, name: str, **fields) -> dict:
+        """Add or replace an object, and send its event to the watches."""
+        self.resource_version += 1
+        event_type = "MODIFIED" if name in self.objects[kind] else "ADDED"
+        obj = self.objects[kind][name] = make_object(
+            name, self.namespace, self.resource_version, **fields
+        )
+        self.push(kind, {"type": event_type, "object": obj})
+        return obj
+
+    def delete(self, kind: str, name: str) -> None:
+        """Delete an object, and send its event to the watches."""
+        self.resource_version += 1
+        obj = self.objects[kind].pop(name)
+        obj["metadata"]["resourceVersion"] = str(self.resource_version)
+        self.push(kind, {"type": "DELETED", "object": obj})
+
+    def push(self, kind: str, event: dict) -> None:
+        for watch_kind, events in self.watches:
+            if watch_kind == kind:
+                events.put(event)
+
+    def expire(self) -> None:
+        """Close the watches, and expire all resourceVersions so far."""
+        self.resource_version += 1
+        self.oldest_resource_version = self.resource_version
+        self.drop_watches()
+
+    def drop_watches(self) -> None:
+        for _, events in self.watches:
+            events.put(None)
+        self.watches = []
+
+    def stop(self) -> None:
+        self.drop_watches()
+        self.shutdown()
+        self.server_close()
+
+
+def make_object(
+    name: str,
+    namespace: str,
+    resource_version: int,
+    labels: dict = None,
+    status: dict = None,
+) -> dict:
+    """Build the JSON of a namespaced object."""
+    return {
+        "metadata": {
+            "name": name,
+            "namespace": namespace,
+            "resourceVersion": str(resource_version),
+            "creationTimestamp": "2024-01-01T00:00:00Z",
+            "labels": labels or {},
+        },
+        "status": status or {},
+    }
+
+
+class TestK8sInformer(unittest.TestCase):
+
+    def setUp(self):
+        self.server = FakeK8sServer()
+        self.server.put("pods", "api-1", labels={"app": "api"})
+        self.server.put("pods", "db-1", labels={"app": "db"})
+        api = client.CoreV1Api(self.server.make_api_client())
+        self.changes = 0
+        self.informer = K8sInformer(
+            api.list_namespaced_pod,
+            "default",
+            on_change=self.count_change,
+            retry_interval=0.05,
+        )
+
+    def tearDown(self):
+        self.informer.stop()
+        self.server.stop()
+
+    def count_change(self):
+        self.changes += 1
+
+    def start(self):
+        self.informer.start()
+        self.assertTrue(self.informer.synced.wait(2))
+        self.assertTrue(wait_for(lambda: len(self.server.watches) == 1))
+
+    def get_names(self, label_selector: str = None) -> list[str]:
+        return [
+            pod["metadata"]["name"]
+            for pod in self.informer.list(label_selector)
+        ]
+
+    def test_initial_list(self):
+        self.start()
+
+        self.assertEqual(self.get_names(), ["api-1", "db-1"])
+        self.assertEqual(self.informer.resource_version, "3")
+        self.assertEqual(self.changes, 1)
+
+    def test_watched_changes(self):
+        self.start()
+
+        self.server.put("pods", "api-2", labels={"app": "api"})
+        self.server.put(
+            "pods", "db-1", labels={"app": "db"}, status={"phase": "Running"}
+        )
+        self.server.delete("pods", "api-1")
+
+        self.assertTrue(
+            wait_for(lambda: self.get_names() == ["api-2", "db-1"])
+        )
+        self.assertTrue(
+            wait_for(lambda: self.informer.list("app=db")[0]["status"])
+        )
+        self.assertEqual(self.informer.resource_version, "6")
+        self.assertEqual(self.server.lists, 1)
+
+    def test_resume_watch(self):
+        self.start()
+
+        self.server.drop_watches()
+        self.assertTrue(wait_for(lambda: len(self.server.watches) == 1))
+        self.server.put("pods", "api-2")
+
+        self.assertTrue(wait_for(lambda: "api-2" in self.get_names()))
+        self.assertEqual(self.server.lists, 1)
+
+    def test_relist_when_gone(self):
+        self.start()
+
+        self.server.objects["pods"].pop("api-1")
+        self.server.expire()
+
+        self.assertTrue(wait_for(lambda: self.server.lists == 2))
+        self.assertTrue(wait_for(lambda: self.get_names() == ["db-1"]))
+
+    def test_retry_when_unavailable(self):
+        self.server.objects.pop("pods")
+        self.informer.start()
+        self.assertFalse(self.informer.synced.wait(0.2))
+
+        self.server.objects["pods"] = {}
+        self.server.put("pods", "api-1")
+
+        self.assertTrue(self.informer.synced.wait(2))
+        self.assertEqual(self.get_names(), ["api-1"])
+
+    def test_relist_after_unexpected_error(self):
+        self.start()
+        list_func = self.informer.list_func
+        failures = []
+
+        def fail_once(*args, **kwargs):
+            if not failures:
+                failures.append(True)
+                raise RuntimeError("unexpected")
+            return list_func(*args, **kwargs)
+
+        self.informer.list_func = fail_once
+        self.server.objects["pods"].pop("api-1")
+
+        with self.assertLogs("ttork.network._k8s_informer", "ERROR"):
+            self.server.drop_watches()
+            self.assertTrue(wait_for(lambda: self.server.lists == 2))
+
+        self.assertTrue(wait_for(lambda: self.get_names() == ["db-1"]))
+        self.assertTrue(self.informer.thread.is_alive())
+
+    def test_label_index(self):
+        self.start()
+
+        self.server.put("pods", "api-1", labels={"app": "web"})
+        self.server.put("pods", "db-1", labels={"app": "db", "tier": "data"})
+
+        self.assertTrue(wait_for(lambda: self.get_names("app=web")))
+        self.assertEqual(self.get_names("app=api"), [])
+        self.assertEqual(self.get_names("app in (db,web)"), ["api-1", "db-1"])
+        self.assertEqual(self.get_names("app=db,tier!=data"), [])
+        self.assertEqual(self.get_names("app=db,tier"), ["db-1"])
+
+        self.server.delete("pods", "db-1")
+
+        self.assertTrue(wait_for(lambda: not self.get_names("app=db")))
+        self.assertEqual(set(self.informer.label_index), {("app", "web")})
+        self.assertIsNone(self.informer.get("db-1"))
+        self.assertEqual(
+            self.informer.get("api-1")["metadata"]["labels"], {"app": "web"}
+        )
+
+    def test_paged_list(self):
+        self.server.put("pods", "web-1", labels={"app": "web"})
+        self.informer.page_size = 2
+
+        self.start()
+
+        self.assertEqual(self.get_names(), ["api-1", "db-1", "web-1"])
+        self.assertEqual(self.informer.resource_version, "4")
+        self.assertEqual(self.server.lists, 2)
+        self.assertEqual(self.changes, 1)
+
+    def test_label_selector(self):
+        self.start()
+
+        self.assertEqual(self.get_names("app=api"), ["api-1"])
+        self.assertEqual(self.get_names("app!=api"), ["db-1"])
+        self.assertEqual(self.get_names("app in (db, web)"), ["db-1"])
+        self.assertEqual(self.get_names("tier"), [])
+
+
+class TestLabelSelectors(unittest.TestCase):
+
+    def matches(self, labels: dict, label_selector: str) -> bool:
+        return matches_labels(labels, parse_label_selector(label_selector))
+
+    def test_equality(self):
+        labels = {"app": "api", "tier": "backend"}
+        self.assertTrue(self.matches(labels, "app=api"))
+        self.assertTrue(self.matches(labels, "app==api,tier=backend"))
+        self.assertFalse(self.matches(labels, "app=api,tier=frontend"))
+        self.assertTrue(self.matches(labels, "tier!=frontend"))
+        self.assertTrue(self.matches({}, "tier!=frontend"))
+
+    def test_sets(self):
+        labels = {"app": "api"}
+        self.assertTrue(self.matches(labels, "app in (api,db)"))
+        self.assertFalse(self.matches(labels, "app notin (api, db)"))
+        self.assertTrue(self.matches({}, "app notin (api)"))
+
+    def test_existence(self):
+        labels = {"app.kubernetes.io/name": "api"}
+        self.assertTrue(self.matches(labels, "app.kubernetes.io/name"))
+        self.assertFalse(self.matches(labels, "!app.kubernetes.io/name"))
+        self.assertTrue(self.matches(labels, ""))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            parse_label_selector("app=api,,")
+
+
+if __name__ == "__main__":
+    unittest.main()
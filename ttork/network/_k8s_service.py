@@ -1,8 +1,24 @@
-import copy
+import atexit
 import logging
-from kubernetes import config
+import threading
+from kubernetes import client, config
 
-from ttork.models import K8sDeployments, K8sPods, K8sContainers
+from ttork.models import (
+    K8sDeployments,
+    K8sPods,
+    K8sContainers,
+    K8sResourceData,
+    K8sTableResource,
+)
+from ._k8s_informer import K8sInformer
+
+DEFAULT_STATUS_MODE = "watch"
+DEFAULT_WATCH_TIMEOUT = 300
+DEFAULT_MAX_WATCH_BACKOFF = 30
+DEFAULT_CONNECT_TIMEOUT = 2
+DEFAULT_READ_TIMEOUT = 10
+DEFAULT_MAX_CONNECTIONS = 4
+DEFAULT_LIST_PAGE_SIZE = 500
 
 
 class K8sService:
@@ -15,30 +31,219 @@ class K8sService:
         self.namespace = app_config["k8s"].get("namespace", "default")
         self.kube_config = config.load_kube_config(context=self.context)
 
+        # One API client for all the models, so connections to the API
+        # server (and their TLS sessions) are kept alive and reused. Each
+        # informer's watch holds a connection for as long as it runs.
+        k8s_config = app_config["k8s"]
+        self.request_timeout = (
+            float(k8s_config.get("connectTimeout", DEFAULT_CONNECT_TIMEOUT)),
+            float(k8s_config.get("readTimeout", DEFAULT_READ_TIMEOUT)),
+        )
+        configuration = client.Configuration.get_default_copy()
+        configuration.connection_pool_maxsize = int(
+            k8s_config.get("maxConnections", DEFAULT_MAX_CONNECTIONS)
+        )
+        self.api_client = client.ApiClient(configuration)
+        apps_api = client.AppsV1Api(self.api_client)
+        core_api = client.CoreV1Api(self.api_client)
+
+        # Lists are read in pages, so large namespaces never come back as
+        # one huge response.
+        self.page_size = int(
+            k8s_config.get("listPageSize", DEFAULT_LIST_PAGE_SIZE)
+        )
+
+        # Called from an informer thread when watched resources change, at
+        # most once between status updates.
+        self.on_status_change = None
+        self.change_notified = False
+
+        # In 'watch' mode, Deployments and Pods (and the containers of a
+        # pod) are read from informers, instead of being requested from the
+        # cluster on every update.
+        self.status_mode = app_config["k8s"].get(
+            "statusMode", DEFAULT_STATUS_MODE
+        )
+        self.informers = {}
+        if self.status_mode == "watch":
+            self.informers = {
+                "Deployments": self.make_informer(
+                    apps_api.list_namespaced_deployment
+                ),
+                "Pods": self.make_informer(core_api.list_namespaced_pod),
+            }
+            for informer in self.informers.values():
+                informer.start()
+        atexit.register(self.cleanup)
+
         self.resources = {
-            "Deployments": K8sDeployments(namespace=self.namespace),
-            "Pods": K8sPods(namespace=self.namespace),
-            "Containers": K8sContainers(namespace=self.namespace),
+            "Deployments": K8sDeployments(
+                namespace=self.namespace,
+                informer=self.informers.get("Deployments"),
+                api_client=self.api_client,
+                request_timeout=self.request_timeout,
+                page_size=self.page_size,
+            ),
+            "Pods": K8sPods(
+                namespace=self.namespace,
+                informer=self.informers.get("Pods"),
+                api_client=self.api_client,
+                request_timeout=self.request_timeout,
+                page_size=self.page_size,
+            ),
+            "Containers": K8sContainers(
+                namespace=self.namespace,
+                informer=self.informers.get("Pods"),
+                api_client=self.api_client,
+                request_timeout=self.request_timeout,
+            ),
         }
 
+        # Views of any other kind of resource, configured in 'k8s.views',
+        # are rendered by the API server.
+        for view in k8s_config.get("views", []):
+            self.resources[view["name"]] = K8sTableResource(
+                name=view["name"],
+                namespace=self.namespace,
+                api_version=view["apiVersion"],
+                resource=view["resource"],
+                namespaced=view.get("namespaced", True),
+                api_client=self.api_client,
+                request_timeout=self.request_timeout,
+                page_size=self.page_size,
+            )
+
+        # The views that can be shown without drilling down from another
+        self.views = ["Deployments"] + [
+            view["name"] for view in k8s_config.get("views", [])
+        ]
+
+        # Only the resources a view is showing are refreshed on each update.
+        # The others are marked stale, and refreshed when next shown.
+        self.subscriptions = set()
+        self.stale = set(self.resources)
+
+        # Refreshes run on worker threads, one at a time
+        self.refresh_lock = threading.Lock()
+
+        # Incremented whenever a resource's rows change, each resource
+        # records the version of its own latest change, and the change token
+        # of its rows.
+        self.status_version = 0
+        self.resource_versions = {name: 0 for name in self.resources}
+        self.change_tokens = {}
+
+    def make_informer(self, list_func) -> K8sInformer:
+        """Create an informer for the resources listed by list_func."""
+        k8s_config = self.app_config["k8s"]
+        return K8sInformer(
+            list_func,
+            self.namespace,
+            on_change=self.notify_status_change,
+            request_timeout=self.request_timeout,
+            watch_timeout=int(
+                k8s_config.get("watchTimeout", DEFAULT_WATCH_TIMEOUT)
+            ),
+            max_retry_interval=float(
+                k8s_config.get("maxWatchBackoff", DEFAULT_MAX_WATCH_BACKOFF)
+            ),
+            page_size=self.page_size,
+            logger=self.log,
+        )
+
+    def notify_status_change(self) -> None:
+        """Let the UI know watched resources have changed, unless it
+        already knows and hasn't updated yet.
+        """
+        if self.on_status_change is not None and not self.change_notified:
+            self.change_notified = True
+            self.on_status_change()
+
+    def subscribe(self, resource_name: str) -> None:
+        """Refresh the specified resource on every update."""
+        self.subscriptions.add(resource_name)
+
+    def unsubscribe(self, resource_name: str) -> None:
+        """Stop refreshing the specified resource on every update."""
+        self.subscriptions.discard(resource_name)
+
     def update_cluster_status(self) -> None:
-        """Update the status of the cluster resources."""
-        for resource in self.resources.values():
-            resource.refresh_resource_data()
+        """Update the status of the subscribed cluster resources, and mark
+        the others as stale.
+        """
+        self.change_notified = False
+        with self.refresh_lock:
+            for resource_name, resource in self.resources.items():
+                if resource_name in self.subscriptions:
+                    resource.refresh_resource_data()
+                    self.stale.discard(resource_name)
+                    self.record_refresh(resource_name)
+                else:
+                    self.stale.add(resource_name)
+
+    def get_resource_data(
+        self, resource_name: str, refresh: bool = True
+    ) -> K8sResourceData:
+        """Get the data of the specified resource, refreshing it first if
+        it's stale, or as last refreshed (possibly None) if refresh is
+        False.
+        """
+        resource = self.resources[resource_name]
+        if not refresh:
+            return resource.resource_data
+        with self.refresh_lock:
+            if resource_name in self.stale:
+                resource.refresh_resource_data()
+                self.stale.discard(resource_name)
+                self.record_refresh(resource_name)
+            return resource.get_resource_data()
+
+    def record_refresh(self, resource_name: str) -> None:
+        """Bump the status version if the resource's rows have changed since
+        its last refresh.
+        """
+        resource_data = self.resources[resource_name].resource_data
+        token = None if resource_data is None else resource_data.change_token
+        if token != self.change_tokens.get(resource_name):
+            self.change_tokens[resource_name] = token
+            self.status_version += 1
+            self.resource_versions[resource_name] = self.status_version
+
+    def changed_since(self, version: int) -> tuple[int, list[str]]:
+        """Find the resources whose rows have changed since the specified
+        status version.
+
+        Returns:
+            tuple: the current status version, and the changed resource names
+        """
+        with self.refresh_lock:
+            return self.status_version, [
+                resource_name
+                for resource_name, resource_version in (
+                    self.resource_versions.items()
+                )
+                if resource_version > version
+            ]
 
-    def get_k8s_data(self):
-        """Return the current k8s resource status data."""
-        return copy.deepcopy(self.resources)
+    def cleanup(self) -> None:
+        """Stop watching the cluster, and close the API client's
+        connections.
+        """
+        for informer in self.informers.values():
+            informer.stop()
+        self.api_client.close()
 
     def set_label_selector(
         self, resource_name: str, label_selector: str
     ) -> None:
         """Set the label selector for the specified resource."""
         self.resources[resource_name].label_selector = label_selector
+        self.stale.add(resource_name)
 
     def clear_label_selector(self, resource_name: str) -> None:
         """Clear the label selector for the specified resource."""
         self.resources[resource_name].label_selector = None
+        self.stale.add(resource_name)
 
     def get_label_selector(self, resource_name: str) -> str:
         """Get the label selector for the specified resource."""
@@ -0,0 +1,208 @@
+"""
+This module is used to test the K8sService module.
+"""
+
+import logging
+import unittest
+from unittest.mock import patch
+
+from ttork.models import K8sResourceData, K8sTableResource
+from ._k8s_service import K8sService
+
+
+class FakeResource:
+    """Counts the refreshes of a resource model, whose rows are set by
+    the test.
+    """
+
+    def __init__(self) -> None:
+        self.label_selector = None
+        self.refreshes = 0
+        self.names = []
+        self.resource_data = None
+
+    def refresh_resource_data(self) -> None:
+        self.refreshes += 1
+        self.resource_data = K8sResourceData(
+            name="Fake",
+            namespace="default",
+            col_meta=[{"name": "NAME"}],
+            data=[{"values": [name], "style": "info"} for name in self.names],
+        )
+
+    def get_resource_data(self) -> int:
+        return self.refreshes
+
+
+def make_k8s_service(**k8s_config) -> K8sService:
+    """Build a K8sService with fake resource models, and no cluster."""
+    k8s_config.setdefault("statusMode", "poll")
+    with patch("ttork.network._k8s_service.config.load_kube_config"):
+        service = K8sService({"k8s": k8s_config}, logging.getLogger())
+    service.resources = {
+        name: FakeResource() for name in ("Deployments", "Pods", "Containers")
+    }
+    service.stale = set(service.resources)
+    return service
+
+
+class TestK8sServiceSubscriptions(unittest.TestCase):
+
+    def setUp(self):
+        self.service = make_k8s_service()
+        self.service.subscribe("Deployments")
+
+    def get_refreshes(self) -> dict:
+        return {
+            name: resource.refreshes
+            for name, resource in self.service.resources.items()
+        }
+
+    def test_only_subscribed_refreshed(self):
+        self.service.update_cluster_status()
+        self.service.update_cluster_status()
+
+        self.assertEqual(
+            self.get_refreshes(),
+            {"Deployments": 2, "Pods": 0, "Containers": 0},
+        )
+        self.assertEqual(self.service.stale, {"Pods", "Containers"})
+
+    def test_stale_refreshed_when_shown(self):
+        self.service.update_cluster_status()
+
+        self.assertEqual(self.service.get_resource_data("Pods"), 1)
+        self.assertEqual(self.service.get_resource_data("Pods"), 1)
+        self.assertEqual(self.service.get_resource_data("Deployments"), 1)
+
+    def test_switch_subscription(self):
+        self.service.update_cluster_status()
+        self.service.unsubscribe("Deployments")
+        self.service.subscribe("Pods")
+
+        self.service.update_cluster_status()
+
+        self.assertEqual(
+            self.get_refreshes(),
+            {"Deployments": 1, "Pods": 1, "Containers": 0},
+        )
+        self.assertIn("Deployments", self.service.stale)
+
+    def test_label_selector_marks_stale(self):
+        self.service.update_cluster_status()
+
+        self.service.set_label_selector("Deployments", "app=api")
+
+        self.assertIn("Deployments", self.service.stale)
+        self.assertEqual(self.service.get_resource_data("Deployments"), 2)
+
+
+class TestK8sServiceApiClient(unittest.TestCase):
+
+    def test_shared_by_models(self):
+        with patch("ttork.network._k8s_service.config.load_kube_config"):
+            service = K8sService(
+                {
+                    "k8s": {
+                        "statusMode": "poll",
+                        "connectTimeout": 1,
+                        "readTimeout": 3,
+                        "maxConnections": 2,
+                    }
+                },
+                logging.getLogger(),
+            )
+        self.addCleanup(service.cleanup)
+
+        self.assertEqual(service.request_timeout, (1.0, 3.0))
+        self.assertEqual(
+            service.api_client.configuration.connection_pool_maxsize, 2
+        )
+        for resource in service.resources.values():
+            self.assertIs(resource.api.api_client, service.api_client)
+            self.assertEqual(resource.request_timeout, (1.0, 3.0))
+
+
+class TestK8sServiceViews(unittest.TestCase):
+
+    def test_configured_views(self):
+        with patch("ttork.network._k8s_service.config.load_kube_config"):
+            service = K8sService(
+                {
+                    "k8s": {
+                        "statusMode": "poll",
+                        "views": [
+                            {
+                                "name": "StatefulSets",
+                                "apiVersion": "apps/v1",
+                                "resource": "statefulsets",
+                            },
+                            {
+                                "name": "Nodes",
+                                "apiVersion": "v1",
+                                "resource": "nodes",
+                                "namespaced": False,
+                            },
+                        ],
+                    }
+                },
+                logging.getLogger(),
+            )
+        self.addCleanup(service.cleanup)
+
+        self.assertEqual(
+            service.views, ["Deployments", "StatefulSets", "Nodes"]
+        )
+        nodes = service.resources["Nodes"]
+        self.assertIsInstance(nodes, K8sTableResource)
+        self.assertFalse(nodes.namespaced)
+        self.assertIs(nodes.api_client, service.api_client)
+        self.assertIn("Nodes", service.stale)
+
+
+class TestK8sServiceVersions(unittest.TestCase):
+
+    def setUp(self):
+        self.service = make_k8s_service()
+        self.service.subscribe("Pods")
+        self.pods = self.service.resources["Pods"]
+        self.pods.names = ["api-1"]
+
+    def test_changed_since(self):
+        self.assertEqual(self.service.changed_since(0), (0, []))
+
+        self.service.update_cluster_status()
+
+        version, changed = self.service.changed_since(0)
+        self.assertGreater(version, 0)
+        self.assertEqual(changed, ["Pods"])
+
+    def test_unchanged_rows_keep_version(self):
+        self.service.update_cluster_status()
+        version, _ = self.service.changed_since(0)
+
+        self.service.update_cluster_status()
+
+        self.assertEqual(self.service.changed_since(version), (version, []))
+
+    def test_changed_rows(self):
+        self.service.update_cluster_status()
+        version, _ = self.service.changed_since(0)
+        self.pods.names = ["api-1", "api-2"]
+
+        self.service.update_cluster_status()
+
+        self.assertEqual(
+            self.service.changed_since(version), (version + 1, ["Pods"])
+        )
+
+    def test_stale_refresh_recorded(self):
+        self.service.resources["Deployments"].names = ["api"]
+
+        self.service.get_resource_data("Deployments")
+
+        self.assertEqual(self.service.changed_since(0), (1, ["Deployments"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import json
+import os
+import socket
+
+
+class PortAllocator:
+    """Allocates a port to each Tilt project.
+
+    Ports allocated by ttork are reserved in memory, so they're never handed
+    out twice, and other candidates are probed by binding to them. Each
+    project's port is remembered in a state file, so it gets the same port
+    back after a restart, if it's still free.
+    """
+
+    def __init__(
+        self,
+        state_file: str = None,
+        start_port: int = 10350,
+        end_port: int = 65535,
+    ) -> None:
+        self.state_file = state_file
+        self.start_port = start_port
+        self.end_port = end_port
+
+        # Allocated ports by key, and the set of all allocated ports
+        self.allocations = {}
+        self.reserved = set()
+
+        # Ports remembered from previous runs, by key
+        self.previous = self.load()
+
+    def allocate(self, key: str, save: bool = True) -> int:
+        """Allocate a port for the key, preferring its previous port.
+
+        Returns:
+            int: The allocated port, or -1 if there are no free ports.
+        """
+        if key in self.allocations:
+            return self.allocations[key]
+
+        port = self.previous.get(key, 0)
+        if not self.is_available(port):
+            # Avoid the ports other keys had, so they can have them back
+            remembered = set(self.previous.values())
+            port = self.start_port
+            while port < self.end_port and (
+                port in remembered or not self.is_available(port)
+            ):
+                port += 1
+            if port >= self.end_port:
+                return -1
+
+        self.allocations[key] = port
+        self.reserved.add(port)
+        if save:
+            self.save()
+        return port
+
+    def assign(self, key: str, port: int) -> None:
+        """Reserve a port already in use by the key, such as the port of a
+        Tilt instance ttork reattached to.
+        """
+        self.allocations[key] = port
+        self.reserved.add(port)
+        self.save()
+
+    def allocate_all(self, keys: list[str]) -> dict[str, int]:
+        """Allocate ports for several keys in one pass.
+
+        Returns:
+            dict: The allocated ports (or -1) by key.
+        """
+        ports = {key: self.allocate(key, save=False) for key in keys}
+        self.save()
+        return ports
+
+    def is_available(self, port: int) -> bool:
+        """Check if a port is in range, not reserved, and can be bound."""
+        if (
+            port < self.start_port
+            or port >= self.end_port
+            or port in self.reserved
+        ):
+            return False
+        return is_port_free(port)
+
+    def load(self) -> dict[str, int]:
+        """Load the ports remembered in the state file."""
+        if self.state_file is None:
+            return {}
+        try:
+            with open(self.state_file, "r") as file:
+                ports = json.load(file)
+            return {
+                key: port
+                for key, port in ports.items()
+                if isinstance(port, int)
+            }
+        except (OSError, ValueError, AttributeError):
+            return {}
+
+    def save(self) -> None:
+        """Remember all allocations in the state file."""
+        if self.state_file is None:
+            return
+        ports = dict(self.previous, **self.allocations)
+        try:
+            os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
+            with open(self.state_file, "w") as file:
+                json.dump(ports, file, indent=2)
+        except OSError:
+            pass
+
+
+def is_port_free(port: int) -> bool:
+    """Check if a port is free, by binding to it.
+
+    Args:
+        port (int): The port to check.
+
+    Returns:
+        bool: True if the port is free, False otherwise.
+    """
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        try:
+            s.bind(("localhost", port))
+        except OSError:
+            return False
+        return True
@@ -0,0 +1,79 @@
+"""
+This module is used to test the PortAllocator module.
+"""
+
+import json
+import os
+import socket
+import tempfile
+import unittest
+
+from ._port_allocator import PortAllocator, is_port_free
+
+
+class TestPortAllocator(unittest.TestCase):
+
+    def setUp(self):
+        self.state_dir = tempfile.TemporaryDirectory()
+        self.state_file = os.path.join(self.state_dir.name, "ports.json")
+
+        # Find a run of free ports to allocate from
+        self.start_port = 20350
+        while not all(
+            is_port_free(port)
+            for port in range(self.start_port, self.start_port + 10)
+        ):
+            self.start_port += 10
+
+    def tearDown(self):
+        self.state_dir.cleanup()
+
+    def make_allocator(self, state_file=None):
+        return PortAllocator(state_file, self.start_port, self.start_port + 10)
+
+    def test_allocate_distinct_ports(self):
+        allocator = self.make_allocator()
+
+        ports = allocator.allocate_all(["a", "b", "c"])
+
+        self.assertEqual(len(set(ports.values())), 3)
+        self.assertEqual(allocator.allocate("a"), ports["a"])
+
+    def test_skips_bound_port(self):
+        allocator = self.make_allocator()
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            s.bind(("localhost", self.start_port))
+            s.listen()
+
+            self.assertEqual(allocator.allocate("a"), self.start_port + 1)
+
+    def test_no_free_ports(self):
+        allocator = self.make_allocator()
+        allocator.allocate_all([str(index) for index in range(10)])
+
+        self.assertEqual(allocator.allocate("extra"), -1)
+
+    def test_remembers_ports_across_restarts(self):
+        allocator = self.make_allocator(self.state_file)
+        ports = allocator.allocate_all(["a", "b"])
+
+        with open(self.state_file) as file:
+            self.assertEqual(json.load(file), ports)
+
+        # After a restart, allocated in a different order
+        allocator = self.make_allocator(self.state_file)
+        self.assertEqual(allocator.allocate("c"), self.start_port + 2)
+        self.assertEqual(allocator.allocate("b"), ports["b"])
+        self.assertEqual(allocator.allocate("a"), ports["a"])
+
+    def test_unreadable_state_file(self):
+        with open(self.state_file, "w") as file:
+            file.write("not json")
+
+        allocator = self.make_allocator(self.state_file)
+
+        self.assertEqual(allocator.allocate("a"), self.start_port)
+
+
+if __name__ == "__main__":
+    unittest.main()
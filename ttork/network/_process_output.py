@@ -0,0 +1,163 @@
+import os
+import threading
+from collections import deque
+from typing import IO
+
+
+class ProcessOutput:
+    """Captures the output of a project's Tilt processes into a ring
+    buffer.
+
+    The processes write their output to a file, rather than a pipe, so they
+    keep running if ttork goes away, and their output is still there when
+    ttork reattaches to them. A background thread follows the file line by
+    line, and only the latest max_lines lines are kept in memory. Overly
+    long lines are split, and the file is truncated once it grows past
+    max_bytes and has been read, so memory and disk use stay bounded
+    however much the processes write.
+    """
+
+    # Maximum number of characters in a single buffered line
+    MAX_LINE_LENGTH = 4096
+
+    # Seconds between checks for new output, once the file has been read
+    POLL_INTERVAL = 0.25
+
+    def __init__(
+        self, max_lines: int, path: str, max_bytes: int = 10 * 1024 * 1024
+    ) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.lines = deque(maxlen=max_lines)
+        self.lock = threading.Lock()
+
+        # Number of lines captured so far, including those dropped from the
+        # buffer, so readers can tell which lines are new.
+        self.line_count = 0
+        self.thread = None
+        self.stopped = threading.Event()
+
+    def open(self, header: str) -> IO[bytes]:
+        """Start a new output file, for a new process, starting with a
+        header line.
+
+        Returns:
+            IO: The file to pass to the process as its stdout and stderr.
+        """
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        # A new file, rather than truncating the old one, so the follower
+        # can tell it apart. Appending, so it can be truncated under the
+        # process.
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        output_file = open(self.path, "ab")
+        output_file.write(f"{header}\n".encode())
+        output_file.flush()
+        self.follow()
+        return output_file
+
+    def follow(self) -> None:
+        """Follow the output file in a background thread, unless it's
+        already being followed.
+        """
+        if self.thread is None:
+            self.stopped.clear()
+            self.thread = threading.Thread(
+                target=self.run, name="tilt-output", daemon=True
+            )
+            self.thread.start()
+
+    def stop(self) -> None:
+        """Stop following the output file, and wait for the thread to
+        finish. The buffered lines are kept.
+        """
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def run(self) -> None:
+        """Follow the output file, and each new one, until stopped."""
+        while not self.stopped.is_set():
+            try:
+                with open(self.path, "rb") as output_file:
+                    self.read(output_file)
+            except OSError:
+                self.stopped.wait(self.POLL_INTERVAL)
+
+    def read(self, output_file: IO[bytes]) -> None:
+        """Read lines as they're written, until a new output file replaces
+        this one, or following is stopped.
+        """
+        partial = b""
+        while not self.stopped.is_set():
+            line = output_file.readline(self.MAX_LINE_LENGTH - len(partial))
+            if line.endswith(b"\n") or (
+                len(partial) + len(line) >= self.MAX_LINE_LENGTH
+            ):
+                self.append((partial + line).decode(errors="replace"))
+                partial = b""
+            elif line:
+                # Wait for the rest of the line
+                partial += line
+            elif is_replaced(output_file, self.path):
+                return
+            elif output_file.tell() >= self.max_bytes:
+                # Read whatever was written since the end was reached, right
+                # before truncating, so it isn't lost with the file.
+                rest = output_file.read()
+                os.truncate(self.path, 0)
+                output_file.seek(0)
+                partial = self.append_lines(partial + rest)
+            else:
+                self.stopped.wait(self.POLL_INTERVAL)
+
+    def append_lines(self, data: bytes) -> bytes:
+        """Add the complete lines of the data to the buffer, splitting
+        overly long ones.
+
+        Returns:
+            bytes: The incomplete last line, if any.
+        """
+        *lines, partial = data.split(b"\n")
+        for line in lines:
+            for start in range(0, len(line) or 1, self.MAX_LINE_LENGTH):
+                self.append(
+                    line[start : start + self.MAX_LINE_LENGTH].decode(
+                        errors="replace"
+                    )
+                )
+        while len(partial) >= self.MAX_LINE_LENGTH:
+            self.append(
+                partial[: self.MAX_LINE_LENGTH].decode(errors="replace")
+            )
+            partial = partial[self.MAX_LINE_LENGTH :]
+        return partial
+
+    def append(self, line: str) -> None:
+        """Add a line to the buffer, dropping the oldest if it's full."""
+        with self.lock:
+            self.lines.append(line.rstrip("\r\n"))
+            self.line_count += 1
+
+    def get_lines(self, since: int = 0) -> tuple[int, list[str]]:
+        """Get the buffered lines captured after the first 'since' lines.
+
+        Returns:
+            tuple: The number of lines captured so far, and the requested
+                lines that are still buffered.
+        """
+        with self.lock:
+            new_lines = min(self.line_count - since, len(self.lines))
+            if new_lines <= 0:
+                return self.line_count, []
+            return self.line_count, list(self.lines)[-new_lines:]
+
+
+def is_replaced(output_file: IO[bytes], path: str) -> bool:
+    """Check if the file at the path is no longer the open file."""
+    try:
+        return os.stat(path).st_ino != os.fstat(output_file.fileno()).st_ino
+    except OSError:
+        return True
@@ -0,0 +1,150 @@
+"""
+This module is used to test the ProcessOutput module.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from ._process_output import ProcessOutput
+from ._tilt_service_test import wait_for
+
+
+class EndNotifyingFile:
+    """Wraps a file, calling on_end whenever a read reaches its end."""
+
+    def __init__(self, file, on_end) -> None:
+        self.file = file
+        self.on_end = on_end
+
+    def readline(self, size: int = -1) -> bytes:
+        line = self.file.readline(size)
+        if not line:
+            self.on_end()
+        return line
+
+    def __getattr__(self, name: str):
+        return getattr(self.file, name)
+
+
+class TestProcessOutput(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory(prefix="ttork-")
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "output", "project.log")
+
+    def write(self, text: str) -> None:
+        with open(self.path, "a") as file:
+            file.write(text)
+
+    def wait_for_lines(self, output: ProcessOutput, count: int) -> list:
+        self.assertTrue(wait_for(lambda: output.get_lines()[0] >= count))
+        return output.get_lines()[1]
+
+    def test_ring_buffer(self):
+        output = ProcessOutput(max_lines=3, path=self.path)
+        output.open("$ tilt up").close()
+        self.write("".join(f"line {i}\n" for i in range(4)))
+
+        self.assertEqual(
+            self.wait_for_lines(output, 5), ["line 1", "line 2", "line 3"]
+        )
+        self.assertEqual(output.get_lines(3), (5, ["line 2", "line 3"]))
+        self.assertEqual(output.get_lines(5), (5, []))
+
+    def test_long_and_partial_lines(self):
+        output = ProcessOutput(max_lines=10, path=self.path)
+        output.open("$ tilt up").close()
+        self.write("x" * (ProcessOutput.MAX_LINE_LENGTH + 1))
+        self.wait_for_lines(output, 2)
+
+        self.write("y\n")
+        lines = self.wait_for_lines(output, 3)
+        self.assertEqual(len(lines[1]), ProcessOutput.MAX_LINE_LENGTH)
+        self.assertEqual(lines[2], "xy")
+
+    def test_new_output_file(self):
+        output = ProcessOutput(max_lines=10, path=self.path)
+        output.open("$ first").close()
+        self.write("first output\n")
+        self.wait_for_lines(output, 2)
+
+        output.open("$ second").close()
+
+        self.assertEqual(
+            self.wait_for_lines(output, 3),
+            ["$ first", "first output", "$ second"],
+        )
+
+    def test_truncated_when_read(self):
+        output = ProcessOutput(max_lines=10, path=self.path, max_bytes=10)
+        output.open("$ tilt up").close()
+        self.write("0123456789\n")
+        self.wait_for_lines(output, 2)
+        self.assertTrue(wait_for(lambda: os.path.getsize(self.path) == 0))
+
+        self.write("more\n")
+        self.assertEqual(self.wait_for_lines(output, 3)[-1], "more")
+
+    def test_lines_written_before_truncation(self):
+        output = ProcessOutput(max_lines=10, path=self.path, max_bytes=10)
+        os.makedirs(os.path.dirname(self.path))
+        self.write("0123456789\n")
+
+        # Output written as the end of the file is reached, and after the
+        # file is truncated
+        writes = ["more\npart", "ial\n"]
+
+        def on_end():
+            if writes:
+                self.write(writes.pop(0))
+            else:
+                output.stopped.set()
+
+        with open(self.path, "rb") as output_file:
+            output.read(EndNotifyingFile(output_file, on_end))
+
+        self.assertEqual(
+            output.get_lines()[1],
+            ["0123456789", "more", "partial"],
+        )
+
+    def test_stop(self):
+        output = ProcessOutput(max_lines=10, path=self.path)
+        output.open("$ tilt up").close()
+        self.wait_for_lines(output, 1)
+        thread = output.thread
+
+        output.stop()
+
+        self.assertFalse(thread.is_alive())
+        self.write("stopped\n")
+        output.follow()
+        self.assertEqual(self.wait_for_lines(output, 3)[-1], "stopped")
+        output.stop()
+
+    def test_process_output(self):
+        output = ProcessOutput(max_lines=100, path=self.path)
+        with output.open("$ python") as output_file:
+            process = subprocess.Popen(
+                [
+                    sys.executable,
+                    "-c",
+                    "import sys; print('out', flush=True);"
+                    "print('err', file=sys.stderr)",
+                ],
+                stdout=output_file,
+                stderr=subprocess.STDOUT,
+            )
+        process.wait()
+
+        self.assertEqual(
+            self.wait_for_lines(output, 3), ["$ python", "out", "err"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
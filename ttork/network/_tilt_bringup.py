@@ -0,0 +1,124 @@
+from typing import Callable
+
+
+class TiltBringup:
+    """Schedules the bringup of Tilt projects, respecting the dependencies
+    between them.
+
+    Projects without outstanding dependencies are started in parallel, up
+    to max_parallel at a time. A project occupies a slot until its first
+    builds have finished, and its dependents are only started once all of
+    its Tilt resources are healthy.
+    """
+
+    WAITING = "waiting"
+    STARTING = "starting"
+
+    def __init__(
+        self, dependencies: dict[str, set[str]], max_parallel: int
+    ) -> None:
+        self.dependencies = dependencies
+        self.max_parallel = max_parallel
+
+        # Bringup state of each project that's still being brought up, and
+        # the projects that couldn't be.
+        self.states = {}
+        self.failed = set()
+
+    @property
+    def active(self) -> bool:
+        """True while projects are still being brought up."""
+        return len(self.states) > 0
+
+    def start(self, project_keys: list[str]) -> None:
+        """Queue the projects for bringup, in the specified order."""
+        for pkey in project_keys:
+            self.states.setdefault(pkey, self.WAITING)
+            self.failed.discard(pkey)
+
+    def fail(self, project_key: str) -> None:
+        """Give up on bringing up a project, and so its dependents."""
+        self.states.pop(project_key, None)
+        self.failed.add(project_key)
+
+    def cancel(self) -> None:
+        """Stop bringing up any remaining projects."""
+        self.states.clear()
+        self.failed.clear()
+
+    def step(
+        self,
+        start_project: Callable[[str], bool],
+        is_settled: Callable[[str], bool],
+        is_healthy: Callable[[str], bool],
+    ) -> list[str]:
+        """Advance the bringup, starting all the projects that are ready.
+
+        Args:
+            start_project: starts a project, returning False on failure
+            is_settled: True once a started project has finished building
+            is_healthy: True if all of a project's resources are ok
+
+        Returns:
+            list: keys of projects newly found unable to be brought up,
+                because they, or one of their dependencies, failed to start
+        """
+        for pkey, state in list(self.states.items()):
+            if state == self.STARTING and is_settled(pkey):
+                del self.states[pkey]
+
+        failed = []
+        starting = list(self.states.values()).count(self.STARTING)
+
+        # Repeat until no more projects fail, so failures propagate to all
+        # dependents, whatever their order.
+        changed = True
+        while changed:
+            changed = False
+            for pkey, state in list(self.states.items()):
+                if state != self.WAITING:
+                    continue
+
+                dependencies = self.dependencies.get(pkey, set())
+                if dependencies & self.failed:
+                    started = False
+                elif starting < self.max_parallel and all(
+                    dep not in self.states and is_healthy(dep)
+                    for dep in dependencies
+                ):
+                    started = start_project(pkey)
+                else:
+                    continue
+
+                if started:
+                    self.states[pkey] = self.STARTING
+                    starting += 1
+                else:
+                    del self.states[pkey]
+                    self.failed.add(pkey)
+                    failed.append(pkey)
+                    changed = True
+        return failed
+
+
+def project_dependencies(projects: list[dict]) -> dict[str, set[str]]:
+    """Resolve the dependsOn project names of each project in the ttork
+    configuration to Tiltfile paths.
+
+    Returns:
+        dict: the Tiltfile paths each project depends on, by Tiltfile path
+    """
+    paths_by_name = {}
+    for project in projects:
+        paths_by_name.setdefault(project.get("name"), set()).add(
+            project["tiltFilePath"]
+        )
+
+    dependencies = {}
+    for project in projects:
+        dependencies[project["tiltFilePath"]] = set()
+        for name in project.get("dependsOn", []):
+            dependencies[project["tiltFilePath"]] |= paths_by_name.get(
+                name, set()
+            )
+    return dependencies
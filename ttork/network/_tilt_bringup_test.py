@@ -0,0 +1,124 @@
+"""
+This module is used to test the TiltBringup module.
+"""
+
+import unittest
+
+from ._tilt_bringup import TiltBringup, project_dependencies
+
+
+class TestTiltBringup(unittest.TestCase):
+
+    def setUp(self):
+        self.started = []
+        self.healthy = set()
+        self.settled = set()
+        self.broken = set()
+
+    def start_project(self, pkey):
+        if pkey in self.broken:
+            return False
+        self.started.append(pkey)
+        return True
+
+    def step(self, bringup):
+        return bringup.step(
+            self.start_project,
+            lambda pkey: pkey in self.settled,
+            lambda pkey: pkey in self.healthy,
+        )
+
+    def test_independent_projects_start_in_parallel(self):
+        bringup = TiltBringup({}, max_parallel=4)
+        bringup.start(["a", "b", "c"])
+
+        self.step(bringup)
+
+        self.assertEqual(self.started, ["a", "b", "c"])
+        self.assertEqual(set(bringup.states.values()), {"starting"})
+
+    def test_max_parallel(self):
+        bringup = TiltBringup({}, max_parallel=2)
+        bringup.start(["a", "b", "c"])
+
+        self.step(bringup)
+        self.assertEqual(self.started, ["a", "b"])
+        self.assertEqual(bringup.states["c"], "waiting")
+
+        # Slots are released once a project settles, healthy or not
+        self.settled.add("a")
+        self.step(bringup)
+        self.assertEqual(self.started, ["a", "b", "c"])
+        self.assertNotIn("a", bringup.states)
+
+    def test_dependents_wait_for_healthy_dependencies(self):
+        bringup = TiltBringup({"api": {"db"}, "web": {"api"}}, 4)
+        bringup.start(["web", "api", "db"])
+
+        self.step(bringup)
+        self.assertEqual(self.started, ["db"])
+
+        # Settled, but with errors
+        self.settled.add("db")
+        self.step(bringup)
+        self.assertEqual(self.started, ["db"])
+
+        self.healthy.add("db")
+        self.step(bringup)
+        self.assertEqual(self.started, ["db", "api"])
+
+        self.settled.add("api")
+        self.healthy.add("api")
+        self.step(bringup)
+        self.assertEqual(self.started, ["db", "api", "web"])
+
+        self.settled.add("web")
+        self.step(bringup)
+        self.assertFalse(bringup.active)
+
+    def test_failure_propagates_to_dependents(self):
+        bringup = TiltBringup({"api": {"db"}, "web": {"api"}}, 4)
+        self.broken.add("db")
+        bringup.start(["web", "api", "db", "other"])
+
+        failed = self.step(bringup)
+
+        self.assertEqual(sorted(failed), ["api", "db", "web"])
+        self.assertEqual(self.started, ["other"])
+
+    def test_fail_started_project(self):
+        bringup = TiltBringup({"api": {"db"}}, 4)
+        bringup.start(["api", "db"])
+        self.step(bringup)
+
+        bringup.fail("db")
+
+        self.assertEqual(self.step(bringup), ["api"])
+        self.assertFalse(bringup.active)
+
+    def test_cancel(self):
+        bringup = TiltBringup({"api": {"db"}}, 4)
+        bringup.start(["api", "db"])
+        self.step(bringup)
+
+        bringup.cancel()
+
+        self.assertFalse(bringup.active)
+
+    def test_project_dependencies(self):
+        projects = [
+            {"name": "db", "tiltFilePath": "/db/Tiltfile"},
+            {
+                "name": "api",
+                "tiltFilePath": "/api/Tiltfile",
+                "dependsOn": ["db"],
+            },
+        ]
+        self.assertEqual(
+            project_dependencies(projects),
+            {"/db/Tiltfile": set(), "/api/Tiltfile": {"/db/Tiltfile"}},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+import heapq
+import threading
+from collections import deque
+
+# Tilt logs that don't belong to a resource, such as Tilt's own messages
+GLOBAL_LOG_NAME = "(global)"
+
+
+class TiltLogTail:
+    """Tails the logs of a Tilt instance, from the logList of its views.
+
+    Each log segment has a checkpoint, and only segments past the last
+    checkpoint seen are applied, so overlapping views (such as the full
+    view polled from the Tilt API, or sent on reconnecting to the view
+    stream) never repeat lines. The latest max_lines lines of each resource
+    are kept, each numbered in the order they were logged, so the logs of
+    all resources can be merged back together.
+    """
+
+    def __init__(self, max_lines: int) -> None:
+        self.max_lines = max_lines
+        self.lock = threading.Lock()
+
+        # Checkpoint of the next expected segment, and the start time of
+        # the Tilt instance the checkpoint belongs to.
+        self.checkpoint = 0
+        self.tilt_start_time = None
+
+        # Resource name of each log span, the buffered (sequence, line)
+        # pairs of each resource, and the unterminated line of each span.
+        self.span_names = {}
+        self.lines = {}
+        self.partial_lines = {}
+        self.sequence = 0
+
+    def apply_view(self, view: dict) -> bool:
+        """Append the log segments of a view that haven't been seen yet.
+
+        Returns:
+            bool: True if any lines were added
+        """
+        log_list = view.get("logList")
+        if not log_list:
+            return False
+
+        with self.lock:
+            # A restarted Tilt instance starts its checkpoints over
+            tilt_start_time = view.get("tiltStartTime")
+            if tilt_start_time != self.tilt_start_time:
+                self.tilt_start_time = tilt_start_time
+                self.checkpoint = 0
+                self.partial_lines.clear()
+
+            for span_id, span in (log_list.get("spans") or {}).items():
+                self.span_names[span_id] = (
+                    span.get("manifestName") or GLOBAL_LOG_NAME
+                )
+
+            sequence = self.sequence
+            from_checkpoint = log_list.get("fromCheckpoint", 0)
+            segments = log_list.get("segments") or []
+            for index, segment in enumerate(segments):
+                if from_checkpoint + index >= self.checkpoint:
+                    self.append_segment(segment)
+
+            self.checkpoint = max(
+                self.checkpoint,
+                log_list.get("toCheckpoint", 0),
+                from_checkpoint + len(segments),
+            )
+            return self.sequence != sequence
+
+    def append_segment(self, segment: dict) -> None:
+        """Split a log segment into lines, and append them to the buffer of
+        its resource.
+        """
+        span_id = segment.get("spanId", "")
+        name = self.span_names.get(span_id, GLOBAL_LOG_NAME)
+        text = self.partial_lines.pop(span_id, "") + segment.get("text", "")
+
+        *lines, partial = text.split("\n")
+        if partial:
+            self.partial_lines[span_id] = partial
+
+        buffer = self.lines.get(name)
+        if buffer is None:
+            buffer = self.lines[name] = deque(maxlen=self.max_lines)
+        for line in lines:
+            self.sequence += 1
+            buffer.append((self.sequence, name, line.rstrip("\r")))
+
+    def get_resource_names(self) -> list[str]:
+        """Get the names of all resources with buffered logs."""
+        with self.lock:
+            return sorted(self.lines)
+
+    def get_lines(
+        self, resource: str = None, since: int = 0
+    ) -> tuple[int, list[tuple[str, str]]]:
+        """Get the buffered lines logged after line number 'since', of one
+        resource, or of all resources.
+
+        Returns:
+            tuple: The number of the last line logged, and the requested
+                (resource name, line) pairs, in the order they were logged.
+        """
+        with self.lock:
+            if resource is None:
+                buffers = self.lines.values()
+            else:
+                buffers = [self.lines.get(resource, ())]
+
+            lines = heapq.merge(
+                *(
+                    [entry for entry in buffer if entry[0] > since]
+                    for buffer in buffers
+                )
+            )
+            return self.sequence, [(name, line) for _, name, line in lines]
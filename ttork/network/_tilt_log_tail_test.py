@@ -0,0 +1,115 @@
+"""
+This module is used to test the TiltLogTail module.
+"""
+
+import unittest
+
+from ._tilt_log_tail import GLOBAL_LOG_NAME, TiltLogTail
+
+
+def make_log_view(
+    *texts: tuple[str, str],
+    from_checkpoint: int = 0,
+    tilt_start_time: str = "start",
+) -> dict:
+    """Build a Tilt view with log segments, from (resource, text) pairs."""
+    return {
+        "tiltStartTime": tilt_start_time,
+        "logList": {
+            "spans": {
+                f"span:{name}": {"manifestName": name} for name, _ in texts
+            },
+            "segments": [
+                {"spanId": f"span:{name}", "text": text}
+                for name, text in texts
+            ],
+            "fromCheckpoint": from_checkpoint,
+            "toCheckpoint": from_checkpoint + len(texts),
+        },
+    }
+
+
+class TestTiltLogTail(unittest.TestCase):
+
+    def setUp(self):
+        self.tail = TiltLogTail(max_lines=3)
+
+    def test_lines_by_resource(self):
+        self.assertTrue(
+            self.tail.apply_view(
+                make_log_view(("api", "a1\n"), ("db", "d1\n"), ("api", "a2\n"))
+            )
+        )
+
+        self.assertEqual(
+            self.tail.get_lines(),
+            (3, [("api", "a1"), ("db", "d1"), ("api", "a2")]),
+        )
+        self.assertEqual(
+            self.tail.get_lines("api"), (3, [("api", "a1"), ("api", "a2")])
+        )
+        self.assertEqual(self.tail.get_lines(since=2), (3, [("api", "a2")]))
+        self.assertEqual(self.tail.get_resource_names(), ["api", "db"])
+
+    def test_checkpoint_skips_seen_segments(self):
+        self.tail.apply_view(make_log_view(("api", "a1\n"), ("api", "a2\n")))
+
+        # The full log again, as polled from the Tilt API
+        self.assertTrue(
+            self.tail.apply_view(
+                make_log_view(
+                    ("api", "a1\n"), ("api", "a2\n"), ("api", "a3\n")
+                )
+            )
+        )
+        # Only the new segment, as streamed after acknowledging
+        self.assertTrue(
+            self.tail.apply_view(
+                make_log_view(("api", "a4\n"), from_checkpoint=3)
+            )
+        )
+        self.assertFalse(
+            self.tail.apply_view(
+                make_log_view(("api", "a4\n"), from_checkpoint=3)
+            )
+        )
+
+        self.assertEqual(self.tail.checkpoint, 4)
+        self.assertEqual(
+            [line for _, line in self.tail.get_lines()[1]],
+            ["a2", "a3", "a4"],
+        )
+
+    def test_restarted_tilt(self):
+        self.tail.apply_view(make_log_view(("api", "a1\n"), ("api", "a2\n")))
+        self.tail.apply_view(
+            make_log_view(("api", "b1\n"), tilt_start_time="restart")
+        )
+
+        self.assertEqual(
+            [line for _, line in self.tail.get_lines()[1]], ["a1", "a2", "b1"]
+        )
+
+    def test_partial_lines(self):
+        self.tail.apply_view(make_log_view(("api", "one\ntw")))
+        self.assertEqual(self.tail.get_lines(), (1, [("api", "one")]))
+
+        self.tail.apply_view(
+            make_log_view(("api", "o\r\n"), from_checkpoint=1)
+        )
+        self.assertEqual(self.tail.get_lines(since=1), (2, [("api", "two")]))
+
+    def test_global_logs(self):
+        view = make_log_view(("", "Tilt started\n"))
+        self.tail.apply_view(view)
+        self.assertEqual(
+            self.tail.get_lines(), (1, [(GLOBAL_LOG_NAME, "Tilt started")])
+        )
+
+    def test_no_logs(self):
+        self.assertFalse(self.tail.apply_view({"uiResources": []}))
+        self.assertEqual(self.tail.get_lines("missing"), (0, []))
+
+
+if __name__ == "__main__":
+    unittest.main()
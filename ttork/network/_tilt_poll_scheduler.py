@@ -0,0 +1,94 @@
+import time
+from typing import Callable
+
+
+class TiltPollScheduler:
+    """Decides how often each Tilt project is polled.
+
+    Projects with builds in progress are polled at the base interval, idle
+    projects at the idle interval, and unreachable projects back off
+    exponentially, up to the maximum backoff.
+    """
+
+    # Polls due this soon are polled now, to absorb timer jitter
+    DUE_TOLERANCE = 0.1
+
+    def __init__(
+        self,
+        interval: float,
+        idle_interval: float,
+        max_backoff: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.interval = interval
+        self.idle_interval = idle_interval
+        self.max_backoff = max_backoff
+        self.clock = clock
+
+        # Current interval, start time of the last poll, time of the next
+        # poll, and number of consecutive failed polls, by key.
+        self.intervals = {}
+        self.last_polls = {}
+        self.next_polls = {}
+        self.failures = {}
+
+    def is_due(self, key: str) -> bool:
+        """Check if the key should be polled now."""
+        return self.clock() + self.DUE_TOLERANCE >= self.next_polls.get(key, 0)
+
+    def start_poll(self, key: str) -> None:
+        """Record the start of a poll, the next is scheduled from here."""
+        self.last_polls[key] = self.clock()
+
+    def get_interval(self, key: str) -> float:
+        """Get the current poll interval of the key."""
+        return self.intervals.get(key, self.interval)
+
+    def reset(self, key: str) -> None:
+        """Poll the key right away, and at the base interval after that."""
+        self.intervals[key] = self.interval
+        self.next_polls[key] = 0
+        self.failures[key] = 0
+
+    def record_success(self, key: str, busy: bool) -> float:
+        """Schedule the next poll after a successful one.
+
+        Args:
+            busy: True if the project has builds pending or in progress
+
+        Returns:
+            float: The new poll interval.
+        """
+        self.failures[key] = 0
+        return self.schedule(
+            key, self.interval if busy else self.idle_interval
+        )
+
+    def record_failure(self, key: str, backoff: bool = True) -> float:
+        """Schedule the next poll after a failed one, backing off
+        exponentially.
+
+        Args:
+            backoff: False to keep polling at the base interval, such as
+                while a Tilt instance is still starting up
+
+        Returns:
+            float: The new poll interval.
+        """
+        if not backoff:
+            return self.schedule(key, self.interval)
+        self.failures[key] = self.failures.get(key, 0) + 1
+        return self.schedule(
+            key,
+            min(self.interval * 2 ** self.failures[key], self.max_backoff),
+        )
+
+    def schedule(self, key: str, interval: float) -> float:
+        """Schedule the next poll of the key, the interval after the start
+        of the last poll.
+        """
+        self.intervals[key] = interval
+        self.next_polls[key] = (
+            self.last_polls.get(key, self.clock()) + interval
+        )
+        return interval
@@ -0,0 +1,81 @@
+"""
+This module is used to test the TiltPollScheduler module.
+"""
+
+import unittest
+
+from ._tilt_poll_scheduler import TiltPollScheduler
+
+
+class TestTiltPollScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 100.0
+        self.scheduler = TiltPollScheduler(
+            interval=1, idle_interval=5, max_backoff=8, clock=lambda: self.now
+        )
+
+    def poll(self, key: str) -> None:
+        self.assertTrue(self.scheduler.is_due(key))
+        self.scheduler.start_poll(key)
+
+    def test_due_initially(self):
+        self.assertTrue(self.scheduler.is_due("a"))
+        self.assertEqual(self.scheduler.get_interval("a"), 1)
+
+    def test_idle_and_busy(self):
+        self.poll("a")
+        self.assertEqual(self.scheduler.record_success("a", busy=False), 5)
+        self.now += 4
+        self.assertFalse(self.scheduler.is_due("a"))
+        self.now += 1
+
+        self.poll("a")
+        self.assertEqual(self.scheduler.record_success("a", busy=True), 1)
+        self.now += 1
+        self.assertTrue(self.scheduler.is_due("a"))
+
+    def test_backoff(self):
+        intervals = []
+        for _ in range(5):
+            self.poll("a")
+            intervals.append(self.scheduler.record_failure("a"))
+            self.now += intervals[-1]
+        self.assertEqual(intervals, [2, 4, 8, 8, 8])
+
+        self.poll("a")
+        self.assertEqual(self.scheduler.record_success("a", busy=True), 1)
+        self.assertEqual(self.scheduler.record_failure("a"), 2)
+
+    def test_no_backoff(self):
+        self.poll("a")
+        self.assertEqual(self.scheduler.record_failure("a", backoff=False), 1)
+        self.assertEqual(self.scheduler.record_failure("a"), 2)
+
+    def test_interval_from_poll_start(self):
+        # A slow poll doesn't push the next one back
+        self.poll("a")
+        self.now += 0.5
+        self.scheduler.record_success("a", busy=True)
+        self.now += 0.5
+        self.assertTrue(self.scheduler.is_due("a"))
+
+    def test_reset(self):
+        self.poll("a")
+        self.scheduler.record_failure("a")
+        self.assertFalse(self.scheduler.is_due("a"))
+
+        self.scheduler.reset("a")
+        self.assertTrue(self.scheduler.is_due("a"))
+        self.assertEqual(self.scheduler.get_interval("a"), 1)
+        self.poll("a")
+        self.assertEqual(self.scheduler.record_failure("a"), 2)
+
+    def test_keys_independent(self):
+        self.poll("a")
+        self.scheduler.record_failure("a")
+        self.assertTrue(self.scheduler.is_due("b"))
+
+
+if __name__ == "__main__":
+    unittest.main()
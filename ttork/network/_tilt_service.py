@@ -1,223 +1,1128 @@
-import copy
+import hashlib
 import os
-import socket
 import subprocess
 import requests
 import atexit
 import logging
-from signal import SIGKILL
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from ttork.models import TiltResource
+from ._port_allocator import PortAllocator
+from ._process_output import ProcessOutput
+from ._tilt_bringup import TiltBringup, project_dependencies
+from ._tilt_log_tail import TiltLogTail
+from ._tilt_poll_scheduler import TiltPollScheduler
+from ._tilt_session import TiltSession
+from ._tilt_supervisor import TiltSupervisor
+from ._tilt_teardown import TeardownResult, TiltTeardown
+from ._tilt_view_stream import TiltViewStream
+
+# Defaults for the optional 'tilt' section of the ttork configuration
+DEFAULT_POLL_TIMEOUT = 0.8
+DEFAULT_POLL_INTERVAL = 1
+DEFAULT_IDLE_POLL_INTERVAL = 5
+DEFAULT_MAX_POLL_BACKOFF = 30
+DEFAULT_CONNECT_TIMEOUT_SHARE = 0.25
+DEFAULT_MAX_RETRIES = 1
+DEFAULT_STATUS_MODE = "stream"
+DEFAULT_MAX_PARALLEL_STARTUPS = 4
+DEFAULT_MAX_PARALLEL_TEARDOWNS = 4
+DEFAULT_TEARDOWN_TIMEOUT = 300
+DEFAULT_STATE_DIR = "~/.ttork"
+DEFAULT_OUTPUT_BUFFER_LINES = 1000
+DEFAULT_LOG_BUFFER_LINES = 1000
+DEFAULT_RESTART_ON_CRASH = False
+DEFAULT_MAX_RESTARTS = 3
+DEFAULT_RESTART_BACKOFF = 2
+DEFAULT_MAX_RESTART_BACKOFF = 60
+DEFAULT_STOP_TIMEOUT = 5
+
+# Tilt resource statuses that count as healthy, for bringup dependencies
+HEALTHY_UPDATE_STATUSES = ("ok", "not_applicable")
+UNHEALTHY_RUNTIME_STATUSES = ("pending", "error")
+
+# Returned by get_tilt_status when the view hasn't changed since the given
+# fingerprint
+TILT_STATUS_UNCHANGED = object()
+
+# Tilt's build reason for updates triggered from its web UI
+TILT_BUILD_REASON_TRIGGER = 16
 
 
 class TiltService:
     """Runs and tracks status on Tilt services."""
 
+    # Progress of a triggered resource update, until the resource starts
+    # building, or for at most TRIGGER_STATE_TIMEOUT seconds.
+    TRIGGER_QUEUED = "trigger queued"
+    TRIGGERED = "triggered"
+    TRIGGER_FAILED = "trigger failed"
+    TRIGGER_STATE_TIMEOUT = 10
+
     def __init__(self, app_config: dict, logger: logging.Logger) -> None:
         self.status_info = {}
+        self.status_lock = threading.RLock()
+
+        # Incremented on every status change, each project records the
+        # version of its own latest change.
+        self.status_version = 0
         self.log = logger
         atexit.register(self.cleanup)
-        self.processes = []
 
-        for project in app_config.get("projects", []):
+        tilt_config = app_config.get("tilt") or {}
+        projects = [
+            project
+            for project in app_config.get("projects", [])
+            if "tiltFilePath" in project
+        ]
+        self.poll_timeout = float(
+            tilt_config.get("pollTimeout", DEFAULT_POLL_TIMEOUT)
+        )
+
+        # By default, every project can be polled at once, so none has to
+        # wait on a worker and miss the deadline.
+        self.poll_executor = ThreadPoolExecutor(
+            max_workers=int(
+                tilt_config.get("maxPollWorkers", max(len(projects), 1))
+            ),
+            thread_name_prefix="tilt-poll",
+        )
+
+        # Triggers are posted on their own workers, one per project, so a
+        # slow trigger can't hold up the polls.
+        self.trigger_executor = ThreadPoolExecutor(
+            max_workers=max(len(projects), 1),
+            thread_name_prefix="tilt-trigger",
+        )
+        self.poll_scheduler = TiltPollScheduler(
+            interval=float(
+                tilt_config.get("pollInterval", DEFAULT_POLL_INTERVAL)
+            ),
+            idle_interval=float(
+                tilt_config.get("idlePollInterval", DEFAULT_IDLE_POLL_INTERVAL)
+            ),
+            max_backoff=float(
+                tilt_config.get("maxPollBackoff", DEFAULT_MAX_POLL_BACKOFF)
+            ),
+        )
+        self.max_retries = int(
+            tilt_config.get("maxRetries", DEFAULT_MAX_RETRIES)
+        )
+
+        # The connect and read timeouts default to shares of the poll
+        # timeout, the connect share split across the retried connections.
+        # Polls scale them down to fit the poll timeout, so a poll can't be
+        # discarded by the deadline while its request is still allowed to
+        # complete.
+        attempts = self.max_retries + 1
+        self.request_timeout = (
+            float(
+                tilt_config.get(
+                    "connectTimeout",
+                    self.poll_timeout
+                    * DEFAULT_CONNECT_TIMEOUT_SHARE
+                    / attempts,
+                )
+            ),
+            float(
+                tilt_config.get(
+                    "readTimeout",
+                    self.poll_timeout * (1 - DEFAULT_CONNECT_TIMEOUT_SHARE),
+                )
+            ),
+        )
+        self.poll_request_timeout = fit_request_timeout(
+            self.request_timeout, attempts, self.poll_timeout
+        )
+
+        # Keep-alive HTTP sessions, one per Tilt port
+        self.sessions = {}
+        self.sessions_lock = threading.Lock()
+
+        # Fingerprint (ETag, or hash of the body) of the last view polled
+        # from each port.
+        self.view_fingerprints = {}
+
+        # In 'stream' mode, each project follows the Tilt websocket view
+        # stream, and is only polled while its stream is disconnected.
+        self.status_mode = tilt_config.get("statusMode", DEFAULT_STATUS_MODE)
+        self.streams = {}
+
+        # Called (from a background thread) whenever the status changes
+        # outside of update_status_info.
+        self.on_status_change = None
+
+        # When the trigger state of each resource was recorded, by project
+        # key and resource name.
+        self.trigger_times = {}
+
+        # ttork state that persists across restarts
+        self.state_dir = os.path.expanduser(
+            tilt_config.get("stateDir", DEFAULT_STATE_DIR)
+        )
+        self.port_allocator = PortAllocator(
+            os.path.join(self.state_dir, "ports.json")
+        )
+        self.session = TiltSession(
+            os.path.join(self.state_dir, "session.json")
+        )
+
+        # Leave the Tilt processes running when ttork exits, so the next
+        # ttork can reattach to them.
+        self.keep_running = bool(app_config.get("keepRunning", False))
+
+        self.supervisor = TiltSupervisor(
+            restart=bool(
+                tilt_config.get("restartOnCrash", DEFAULT_RESTART_ON_CRASH)
+            ),
+            max_restarts=int(
+                tilt_config.get("maxRestarts", DEFAULT_MAX_RESTARTS)
+            ),
+            restart_backoff=float(
+                tilt_config.get("restartBackoff", DEFAULT_RESTART_BACKOFF)
+            ),
+            max_restart_backoff=float(
+                tilt_config.get(
+                    "maxRestartBackoff", DEFAULT_MAX_RESTART_BACKOFF
+                )
+            ),
+            stop_timeout=float(
+                tilt_config.get("stopTimeout", DEFAULT_STOP_TIMEOUT)
+            ),
+        )
+
+        self.teardown = TiltTeardown(
+            max_parallel=int(
+                tilt_config.get(
+                    "maxParallelTeardowns", DEFAULT_MAX_PARALLEL_TEARDOWNS
+                )
+            ),
+            timeout=float(
+                tilt_config.get("teardownTimeout", DEFAULT_TEARDOWN_TIMEOUT)
+            ),
+            on_progress=self.apply_teardown_progress,
+        )
+
+        # Projects whose teardown waits for their Tilt process to exit
+        self.held_teardowns = set()
+
+        self.bringup = TiltBringup(
+            project_dependencies(projects),
+            max_parallel=int(
+                tilt_config.get(
+                    "maxParallelStartups", DEFAULT_MAX_PARALLEL_STARTUPS
+                )
+            ),
+        )
+
+        # Captured output of the Tilt processes of each project, kept after
+        # the processes exit.
+        self.process_outputs = {}
+        output_buffer_lines = int(
+            tilt_config.get("outputBufferLines", DEFAULT_OUTPUT_BUFFER_LINES)
+        )
+
+        # Tilt logs of each project, tailed from its polled or streamed views
+        self.log_tails = {}
+        log_buffer_lines = int(
+            tilt_config.get("logBufferLines", DEFAULT_LOG_BUFFER_LINES)
+        )
+
+        for project in projects:
             env_vars = {}
             for env_var in project.get("environment", []):
                 env_vars[env_var["name"]] = env_var["value"]
-            if "tiltFilePath" in project:
-                self.status_info[project["tiltFilePath"]] = dict(
-                    name=project.get("name", "NameUnset"),
-                    uiResources=[],
-                    env_vars=env_vars,
-                    service_online=False,
-                    port=0,
-                    pid=0,
+            self.status_info[project["tiltFilePath"]] = dict(
+                name=project.get("name", "NameUnset"),
+                resources=[],
+                env_vars=env_vars,
+                service_online=False,
+                port=0,
+                pid=0,
+                bringup="",
+                teardown="",
+                crash="",
+                stopping=False,
+                triggers={},
+                poll_interval=0,
+                version=0,
+            )
+            self.process_outputs[project["tiltFilePath"]] = ProcessOutput(
+                max_lines=int(
+                    project.get("outputBufferLines", output_buffer_lines)
+                ),
+                path=self.get_output_path(project["tiltFilePath"]),
+            )
+            self.log_tails[project["tiltFilePath"]] = TiltLogTail(
+                max_lines=log_buffer_lines
+            )
+
+        self.reattach_tilt_processes(fresh=app_config.get("fresh", False))
+
+    def get_output_path(self, project_key: str) -> str:
+        """Get the path of the file a project's Tilt output goes to."""
+        name = hashlib.blake2b(project_key.encode(), digest_size=8)
+        return os.path.join(
+            self.state_dir, "output", f"{name.hexdigest()}.log"
+        )
+
+    def reattach_tilt_processes(self, fresh: bool = False) -> None:
+        """Adopt the Tilt processes left running by an earlier ttork.
+
+        A remembered process is only reattached to if it's still running,
+        and its port is serving the Tilt API. A running process that isn't
+        serving it is stopped, rather than left running unsupervised, as
+        are all the running processes when starting fresh.
+        """
+        candidates = {
+            pkey: entry
+            for pkey, entry in self.session.entries.items()
+            if pkey in self.status_info and self.session.is_running(pkey)
+        }
+        polls = dict(
+            zip(
+                candidates,
+                self.poll_executor.map(
+                    self.get_tilt_status,
+                    [entry["port"] for entry in candidates.values()],
+                ),
+            )
+        )
+
+        stopping = []
+        for pkey in list(self.session.entries):
+            if pkey not in candidates:
+                self.session.forget(pkey)
+                continue
+
+            entry = self.session.entries[pkey]
+            self.supervisor.adopt(pkey, entry["pid"])
+            view, fingerprint = polls[pkey]
+            if fresh:
+                self.log.debug(f"Stopping earlier Tilt process: {pkey}")
+                stopping.append(pkey)
+                continue
+            elif not isinstance(view, dict):
+                self.log.warning(
+                    f"Stopping earlier Tilt process not serving the Tilt "
+                    f"API: {pkey}"
                 )
+                stopping.append(pkey)
+                continue
+
+            self.log.debug(f"Reattached to Tilt process: {pkey}")
+            self.port_allocator.assign(pkey, entry["port"])
+            self.view_fingerprints[entry["port"]] = fingerprint
+            self.process_outputs[pkey].follow()
+            self.log_tails[pkey].apply_view(view)
+            self.update_project(
+                pkey,
+                port=entry["port"],
+                pid=entry["pid"],
+                resources=[
+                    TiltResource.from_ui_resource(ui_resource)
+                    for ui_resource in view.get("uiResources", [])
+                ],
+                service_online=True,
+            )
+
+        self.supervisor.stop(stopping)
+        for pkey in stopping:
+            self.session.forget(pkey)
 
     def update_status_info(self) -> None:
         """Refresh the status_info struct with information about
         the running Tilt instances.
+
+        All assigned ports are queried concurrently, and the whole update is
+        bounded by the poll timeout, so a slow or hung Tilt instance can only
+        delay the refresh by that much, regardless of the number of projects.
+
+        Each project is only polled when due, as scheduled by the poll
+        scheduler, and projects with a connected view stream are kept up to
+        date by the stream, and are skipped.
         """
-        for pkey in self.status_info:
-            port = self.status_info[pkey]["port"]
-            if port > 0:
-                status_json = self.get_tilt_status(port)
-                if status_json:
-                    self.status_info[pkey]["uiResources"] = status_json.get(
-                        "uiResources", []
+        self.supervise_tilt_processes()
+
+        if self.status_mode == "stream":
+            for pkey, pinfo in self.status_info.items():
+                if pinfo["port"] > 0:
+                    self.follow_view_stream(pkey)
+
+        polls = {}
+        for pkey, pinfo in self.status_info.items():
+            if (
+                pinfo["port"] > 0
+                and not self.is_streaming(pkey)
+                and self.poll_scheduler.is_due(pkey)
+            ):
+                self.poll_scheduler.start_poll(pkey)
+                polls[pkey] = self.poll_executor.submit(
+                    self.get_tilt_status,
+                    pinfo["port"],
+                    self.get_view_fingerprint(pkey),
+                )
+
+        done = set()
+        if polls:
+            done, _ = wait(polls.values(), timeout=self.poll_timeout)
+
+        with self.status_lock:
+            for pkey, poll in polls.items():
+                if poll in done:
+                    status_json, fingerprint = poll.result()
+                else:
+                    # Missed the deadline, treat the same as a failed request
+                    poll.cancel()
+                    status_json, fingerprint = None, None
+
+                port = self.status_info[pkey]["port"]
+                if self.is_streaming(pkey):
+                    # The stream connected while the poll was in flight
+                    continue
+                elif status_json is TILT_STATUS_UNCHANGED:
+                    if self.get_view_fingerprint(pkey) is None:
+                        # The project went offline, or its fingerprint was
+                        # dropped, while the poll was in flight. There's no
+                        # status to keep, so poll the full view right away.
+                        self.view_fingerprints.pop(port, None)
+                        self.poll_scheduler.reset(pkey)
+                        interval = self.poll_scheduler.get_interval(pkey)
+                    else:
+                        self.update_project(pkey, service_online=True)
+                        interval = self.poll_scheduler.record_success(
+                            pkey, self.is_project_busy(pkey)
+                        )
+                elif status_json:
+                    self.view_fingerprints[port] = fingerprint
+                    self.log_tails[pkey].apply_view(status_json)
+                    self.update_project(
+                        pkey,
+                        resources=[
+                            TiltResource.from_ui_resource(ui_resource)
+                            for ui_resource in status_json.get(
+                                "uiResources", []
+                            )
+                        ],
+                        service_online=True,
+                    )
+                    interval = self.poll_scheduler.record_success(
+                        pkey, self.is_project_busy(pkey)
                     )
-                    self.status_info[pkey]["service_online"] = True
                 else:
-                    self.status_info[pkey]["uiResources"].clear()
-                    self.status_info[pkey]["service_online"] = False
+                    self.view_fingerprints.pop(port, None)
+                    self.update_project(
+                        pkey, resources=[], service_online=False
+                    )
+
+                    # No backoff while a Tilt process we started is still
+                    # coming up.
+                    interval = self.poll_scheduler.record_failure(
+                        pkey, backoff=self.status_info[pkey]["pid"] == 0
+                    )
+                self.update_project(pkey, poll_interval=interval)
+
+            # Including those of streamed and unchanged projects, whose
+            # triggers can time out with no new view.
+            for pkey in self.status_info:
+                self.expire_triggers(pkey)
+
+        self.step_bringup()
+
+    def update_project(self, project_key: str, **fields) -> bool:
+        """Update fields of a project's status, bumping the project's
+        version if any of them changed.
+
+        Values are replaced rather than modified in place, so snapshots
+        returned by get_status_info are never changed underneath the caller.
+
+        Returns:
+            bool: True if the project's status changed
+        """
+        with self.status_lock:
+            pinfo = self.status_info.get(project_key)
+            if pinfo is None:
+                return False
+
+            changed = False
+            for field, value in fields.items():
+                if pinfo[field] != value:
+                    pinfo[field] = value
+                    changed = True
+
+            if changed:
+                self.status_version += 1
+                pinfo["version"] = self.status_version
+            return changed
+
+    def changed_since(self, version: int) -> tuple[int, list[str]]:
+        """Find the projects that have changed since the specified status
+        version.
+
+        Returns:
+            tuple: the current status version, and the changed project keys
+        """
+        with self.status_lock:
+            return self.status_version, [
+                pkey
+                for pkey, pinfo in self.status_info.items()
+                if pinfo["version"] > version
+            ]
+
+    def follow_view_stream(self, project_key: str) -> None:
+        """Make sure a view stream is following the project's Tilt
+        instance, on its current port.
+        """
+        port = self.status_info[project_key]["port"]
+        stream = self.streams.get(project_key)
+        if stream is not None and stream.port == port:
+            return
+        elif stream is not None:
+            stream.stop()
+
+        stream = TiltViewStream(
+            port,
+            on_change=lambda resources: self.apply_streamed_status(
+                project_key, resources
+            ),
+            on_disconnect=lambda: self.resume_polling(project_key),
+            log_tail=self.log_tails[project_key],
+            connect_timeout=self.request_timeout[0],
+        )
+        self.streams[project_key] = stream
+        stream.start()
+
+    def resume_polling(self, project_key: str) -> None:
+        """Poll a project right away, after its view stream dropped."""
+        self.poll_scheduler.reset(project_key)
+        self.notify_status_change()
+
+    def is_streaming(self, project_key: str) -> bool:
+        """Check if the project's status is currently provided by a
+        connected view stream.
+        """
+        stream = self.streams.get(project_key)
+        return stream is not None and stream.connected
 
-    def get_tilt_status(self, port: int) -> dict:
+    def apply_streamed_status(self, project_key: str, resources: list) -> None:
+        """Update a project's status with the resources from its view
+        stream.
+        """
+        # Should the stream drop, the next poll must not be compared to a
+        # view older than the streamed one.
+        pinfo = self.status_info.get(project_key)
+        if pinfo is not None:
+            self.view_fingerprints.pop(pinfo["port"], None)
+
+        if self.update_project(
+            project_key,
+            resources=resources,
+            service_online=True,
+            poll_interval=0,
+        ):
+            self.expire_triggers(project_key)
+            self.notify_status_change()
+
+    def apply_teardown_progress(
+        self, project_key: str, result: TeardownResult
+    ) -> None:
+        """Update a project's status with the progress of its teardown."""
+        if result.state == TiltTeardown.DONE:
+            teardown = f"done in {result.duration:.0f}s"
+        elif result.state == TiltTeardown.FAILED:
+            self.log.error(
+                f"Tilt down failed: {project_key} "
+                f"(exit code: {result.exit_code})"
+            )
+            teardown = "failed"
+        else:
+            teardown = result.state
+
+        if self.update_project(project_key, teardown=teardown):
+            self.notify_status_change()
+
+    def notify_status_change(self) -> None:
+        """Let the listener know that the status has changed."""
+        if self.on_status_change is not None:
+            self.on_status_change()
+
+    def stop_view_streams(self) -> None:
+        """Stop following all view streams."""
+        for stream in self.streams.values():
+            stream.stop()
+        self.streams.clear()
+
+    def get_view_fingerprint(self, project_key: str) -> tuple:
+        """Get the fingerprint of the view last applied to a project, if
+        its status can be kept when the view is unchanged.
+
+        A project that is offline, or has no resources, has no status to
+        keep, so its next poll always gets the full view.
+        """
+        pinfo = self.status_info[project_key]
+        if not pinfo["service_online"] or not pinfo["resources"]:
+            return None
+        return self.view_fingerprints.get(pinfo["port"])
+
+    def get_tilt_status(
+        self, port: int, fingerprint: tuple = None
+    ) -> tuple[dict, tuple]:
         """Get the Tilt Status from the running tilt instance, specified
         by port.
 
+        The view is only decoded if it has changed since the fingerprint of
+        an earlier view, using the ETag if Tilt provides one, or a hash of
+        the raw response body. The fingerprint of the view is returned
+        rather than stored, for the caller to record once the view is
+        applied.
+
         Returns:
-            dict: json response dictionary, or None
+            tuple: json response dictionary, TILT_STATUS_UNCHANGED, or None,
+                and the view's fingerprint
         """
         tilt_url = f"http://localhost:{port}/api/view"
 
         try:
-            response = requests.get(tilt_url)
+            headers = {}
+            if fingerprint and fingerprint[0] == "etag":
+                headers["If-None-Match"] = fingerprint[1]
+            response = self.get_session(port).get(
+                tilt_url, headers=headers, timeout=self.poll_request_timeout
+            )
 
             # Check the response status code
-            if response.status_code == 200:
+            if response.status_code == 304:
+                return TILT_STATUS_UNCHANGED, fingerprint
+            elif response.status_code == 200:
                 # The request was successful
+                etag = response.headers.get("ETag")
+                if etag:
+                    new_fingerprint = ("etag", etag)
+                else:
+                    new_fingerprint = (
+                        "body",
+                        hashlib.blake2b(
+                            response.content, digest_size=16
+                        ).digest(),
+                    )
+                if new_fingerprint == fingerprint:
+                    return TILT_STATUS_UNCHANGED, fingerprint
                 json_response = response.json()
             else:
                 # The request failed
-                print(
-                    "Error querying tilt status: {}".format(
-                        response.status_code,
-                    )
+                self.log.error(
+                    f"Error querying tilt status: {port} "
+                    f"(status code: {response.status_code})"
                 )
-                return None
+                return None, None
 
-            return json_response
+            return json_response, new_fingerprint
         except Exception:
+            return None, None
+
+    def get_resource_details(self, project_key: str, name: str) -> dict:
+        """Get the full uiResource of a single Tilt resource, by project key
+        and resource name.
+
+        The status info only keeps a compact projection of each resource, so
+        the details are fetched from the Tilt instance on demand.
+
+        Returns:
+            dict: the uiResource, or None
+        """
+        port = self.status_info.get(project_key, {}).get("port", 0)
+        if port == 0:
             return None
 
-    def get_status_info(self) -> dict:
-        """Get a copy of the current status info struct, to be used
-        to check for changes to the status.
+        try:
+            response = self.get_session(port).get(
+                f"http://localhost:{port}/api/view",
+                timeout=self.request_timeout,
+            )
+            if response.status_code != 200:
+                return None
+            for ui_resource in response.json().get("uiResources", []):
+                if ui_resource["metadata"]["name"] == name:
+                    return ui_resource
+        except Exception:
+            pass
+        return None
+
+    def get_process_output(
+        self, project_key: str, since: int = 0
+    ) -> tuple[int, list[str]]:
+        """Get the captured output of a project's Tilt process, from after
+        the first 'since' lines.
 
         Returns:
-            dict: copy.deepcopy of the status_info dictionary
+            tuple: The number of lines output so far, and the requested lines
+                that are still buffered.
         """
-        return copy.deepcopy(self.status_info)
+        output = self.process_outputs.get(project_key)
+        if output is None:
+            return 0, []
+        return output.get_lines(since)
 
-    def start_tilt_process(self, project_key: str) -> None:
-        """Start up a single Tilt process, by project key."""
-        if project_key in self.status_info:
-            if (
-                os.path.exists(project_key)
-                and self.status_info[project_key]["service_online"] is False
-            ):
-                if self.status_info[project_key]["port"] == 0:
-                    next_free_port = self.get_free_port()
-                    if next_free_port < 0:
-                        self.log.error(
-                            "No free ports available, "
-                            "unable to start Tilt process."
-                        )
-                        return
-                    self.status_info[project_key]["port"] = next_free_port
-
-                tilt_startup_command = [
-                    "tilt",
-                    "up",
-                    f"--port={self.status_info[project_key]['port']}",
-                    f"--file={project_key}",
+    def get_tilt_logs(
+        self, project_key: str, resource: str = None, since: int = 0
+    ) -> tuple[int, list[tuple[str, str]]]:
+        """Get the Tilt logs of a project, of one resource or all of them,
+        from after line number 'since'.
+
+        Returns:
+            tuple: The number of the last line logged, and the requested
+                (resource name, line) pairs that are still buffered.
+        """
+        log_tail = self.log_tails.get(project_key)
+        if log_tail is None:
+            return 0, []
+        return log_tail.get_lines(resource, since)
+
+    def trigger_resources(self, targets: dict[str, list[str]]) -> None:
+        """Trigger updates of Tilt resources, as if from the Tilt UI.
+
+        The resources of each project are triggered one after the other,
+        over the project's keep-alive session, and all the projects are
+        triggered concurrently. The progress of each resource is recorded
+        in its project's triggers.
+
+        Args:
+            targets: the names of the resources to trigger, by project key
+        """
+        for pkey, names in targets.items():
+            port = self.status_info.get(pkey, {}).get("port", 0)
+            if port == 0 or not names:
+                continue
+            for name in names:
+                self.set_trigger_state(pkey, name, self.TRIGGER_QUEUED)
+            self.trigger_executor.submit(self.post_triggers, pkey, port, names)
+        self.notify_status_change()
+
+    def trigger_errored_resources(self) -> int:
+        """Trigger updates of all the errored resources, of all projects.
+
+        Returns:
+            int: the number of resources triggered
+        """
+        targets = {}
+        for pkey, pinfo in self.status_info.items():
+            if pinfo["service_online"]:
+                names = [
+                    resource.name
+                    for resource in pinfo["resources"]
+                    if "error"
+                    in (resource.update_status, resource.runtime_status)
                 ]
+                if names:
+                    targets[pkey] = names
+        self.trigger_resources(targets)
+        return sum(len(names) for names in targets.values())
 
-                self.log.debug(
-                    f"Tilt process startup command: {tilt_startup_command}"
+    def post_triggers(self, project_key: str, port: int, names: list) -> None:
+        """Ask the Tilt instance on the port to update each resource."""
+        session = self.get_session(port)
+        for name in names:
+            try:
+                response = session.post(
+                    f"http://localhost:{port}/api/trigger",
+                    json={
+                        "manifest_names": [name],
+                        "build_reason": TILT_BUILD_REASON_TRIGGER,
+                    },
+                    timeout=self.request_timeout,
                 )
-                self.log.debug(
-                    f"Starting Tilt process in: {os.path.dirname(project_key)}"
+                triggered = response.status_code == 200
+            except requests.RequestException:
+                triggered = False
+
+            if not triggered:
+                self.log.error(f"Unable to trigger Tilt resource: {name}")
+            self.set_trigger_state(
+                project_key,
+                name,
+                self.TRIGGERED if triggered else self.TRIGGER_FAILED,
+            )
+            self.notify_status_change()
+
+    def set_trigger_state(
+        self, project_key: str, name: str, state: str
+    ) -> None:
+        """Record the progress of a resource's trigger."""
+        with self.status_lock:
+            pinfo = self.status_info.get(project_key)
+            if pinfo is not None:
+                self.trigger_times[(project_key, name)] = time.monotonic()
+                self.update_project(
+                    project_key,
+                    triggers=dict(pinfo["triggers"], **{name: state}),
                 )
-                tilt_env = os.environ.copy()
-                for env_var in self.status_info[project_key]["env_vars"]:
-                    tilt_env[env_var] = self.status_info[project_key][
-                        "env_vars"
-                    ][env_var]
-                process = subprocess.Popen(
-                    " ".join(tilt_startup_command),
-                    shell=True,
-                    cwd=os.path.dirname(project_key),
-                    env=tilt_env,
-                    stdin=subprocess.DEVNULL,
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL,
+
+    def expire_triggers(self, project_key: str) -> None:
+        """Forget the triggers of resources that have started building, or
+        are gone, and those recorded more than TRIGGER_STATE_TIMEOUT
+        seconds ago, so a failed trigger isn't shown forever.
+        """
+        with self.status_lock:
+            pinfo = self.status_info.get(project_key)
+            if pinfo is None or not pinfo["triggers"]:
+                return
+            statuses = {
+                resource.name: resource.update_status
+                for resource in pinfo["resources"]
+            }
+            expired_time = time.monotonic() - self.TRIGGER_STATE_TIMEOUT
+            triggers = {
+                name: state
+                for name, state in pinfo["triggers"].items()
+                if name in statuses
+                and not (
+                    state == self.TRIGGERED
+                    and statuses[name] in ("pending", "in_progress")
                 )
+                and self.trigger_times.get((project_key, name), 0)
+                > expired_time
+            }
+            for name in pinfo["triggers"]:
+                if name not in triggers:
+                    self.trigger_times.pop((project_key, name), None)
+            self.update_project(project_key, triggers=triggers)
 
-                self.log.debug(f"Started process: {process.pid}")
-                self.status_info[project_key]["pid"] = process.pid
-                self.processes.append(process)
+    def get_session(self, port: int) -> requests.Session:
+        """Get the keep-alive HTTP session for the Tilt instance on the
+        specified port, creating it on first use.
 
-    def start_tilt_processes(self) -> None:
-        """Bring up all Tilt projects."""
-        for pkey in self.status_info:
-            self.start_tilt_process(pkey)
+        Returns:
+            requests.Session: session with a small, retrying connection pool
+        """
+        with self.sessions_lock:
+            session = self.sessions.get(port)
+            if session is None:
+                session = requests.Session()
 
-    def tear_down_all_resources(self) -> None:
-        """Tear down all Tilt projects."""
-        for project_key in self.status_info:
-            self.tear_down_tilt_resources(project_key)
+                # Tilt is always local, skip the per-request proxy lookups
+                session.trust_env = False
+                adapter = HTTPAdapter(
+                    pool_connections=1,
+                    pool_maxsize=2,
+                    max_retries=Retry(
+                        total=self.max_retries,
+                        read=0,
+                        status=0,
+                        backoff_factor=0,
+                    ),
+                )
+                session.mount("http://", adapter)
+                self.sessions[port] = session
+            return session
 
-    def tear_down_tilt_resources(self, project_key: str) -> None:
-        """Tear down Tilt resources of a single project, by project key."""
-        if project_key in self.status_info:
+    def close_sessions(self) -> None:
+        """Close all of the keep-alive HTTP sessions."""
+        with self.sessions_lock:
+            for session in self.sessions.values():
+                session.close()
+            self.sessions.clear()
 
-            # First, make sure the Tilt process isn't running
-            self.stop_tilt_process(project_key)
+    def get_status_info(self) -> dict:
+        """Get a snapshot of the current status info struct.
 
-            # Then do 'tilt down' command to clean up any tilt-generated
-            # resources
-            tilt_down_command = [
-                "tilt",
-                "down",
-                f"--file={project_key}",
-            ]
+        Use changed_since to check for changes to the status, rather than
+        comparing snapshots.
+
+        Returns:
+            dict: shallow copy of each project's status_info dictionary
+        """
+        with self.status_lock:
+            return {
+                pkey: dict(pinfo) for pkey, pinfo in self.status_info.items()
+            }
 
-            self.log.debug(f"Tearing down Tilt Resources: {project_key}")
+    def start_tilt_process(self, project_key: str) -> bool:
+        """Start up a single Tilt process, by project key.
 
-            subprocess.Popen(
-                " ".join(tilt_down_command),
+        Returns:
+            bool: False if the Tilt process could not be started
+        """
+        if project_key not in self.status_info:
+            return False
+        elif self.status_info[project_key][
+            "service_online"
+        ] or self.supervisor.is_running(project_key):
+            return True
+        elif not os.path.exists(project_key):
+            self.log.error(f"Tiltfile not found: {project_key}")
+            return False
+
+        if self.status_info[project_key]["port"] == 0:
+            next_free_port = self.port_allocator.allocate(project_key)
+            if next_free_port < 0:
+                self.log.error(
+                    "No free ports available, unable to start Tilt process."
+                )
+                return False
+            self.update_project(project_key, port=next_free_port)
+
+        tilt_startup_command = [
+            "tilt",
+            "up",
+            f"--port={self.status_info[project_key]['port']}",
+            f"--file={project_key}",
+        ]
+
+        self.log.debug(f"Tilt process startup command: {tilt_startup_command}")
+        self.log.debug(
+            f"Starting Tilt process in: {os.path.dirname(project_key)}"
+        )
+        tilt_env = os.environ.copy()
+        tilt_env.update(self.status_info[project_key]["env_vars"])
+        with self.process_outputs[project_key].open(
+            f"$ {' '.join(tilt_startup_command)}"
+        ) as output_file:
+            process = subprocess.Popen(
+                " ".join(tilt_startup_command),
                 shell=True,
                 cwd=os.path.dirname(project_key),
+                env=tilt_env,
                 stdin=subprocess.DEVNULL,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
+                stdout=output_file,
+                stderr=subprocess.STDOUT,
+                start_new_session=True,
             )
 
-    def stop_tilt_process(self, project_key: str) -> None:
-        """Kill single running Tilt process, by project key.
+        self.log.debug(f"Started process: {process.pid}")
+        self.update_project(
+            project_key, pid=process.pid, teardown="", crash=""
+        )
+        self.poll_scheduler.reset(project_key)
+        self.supervisor.add(project_key, process)
+        self.session.record(
+            project_key, self.status_info[project_key]["port"], process.pid
+        )
+        return True
+
+    def start_tilt_processes(self) -> None:
+        """Bring up all Tilt projects.
+
+        Projects are started in parallel, in dependency order, as scheduled
+        by the bringup.
+        """
+        unassigned = [
+            pkey
+            for pkey, pinfo in self.status_info.items()
+            if pinfo["port"] == 0
+        ]
+        for pkey, port in self.port_allocator.allocate_all(unassigned).items():
+            if port > 0:
+                self.update_project(pkey, port=port)
+
+        for pkey in self.status_info:
+            self.supervisor.reset(pkey)
+        self.bringup.start(list(self.status_info))
+        self.step_bringup()
+
+    def supervise_tilt_processes(self) -> None:
+        """Mark the projects whose Tilt process has exited as crashed, and
+        restart those that are due a restart.
+        """
+        for pkey, exit_code in self.supervisor.reap().items():
+            restarting = pkey in self.supervisor.pending_restarts
+            self.log.error(
+                f"Tilt process exited: {pkey} (exit code: {exit_code})"
+                + (", restarting" if restarting else "")
+            )
+            self.update_project(
+                pkey,
+                pid=0,
+                service_online=False,
+                crash=f"exit code {exit_code}"
+                + (", restarting" if restarting else ""),
+            )
+            self.session.forget(pkey)
+
+            # Dependents can't be brought up without it
+            if not restarting and pkey in self.bringup.states:
+                self.bringup.fail(pkey)
+
+        for pkey in self.supervisor.due_restarts():
+            self.log.debug(f"Restarting Tilt process: {pkey}")
+            self.start_tilt_process(pkey)
+
+        for pkey, pinfo in self.status_info.items():
+            if pinfo["stopping"] and not self.supervisor.is_stopping(pkey):
+                self.update_project(pkey, stopping=False)
+
+        with self.status_lock:
+            for pkey in list(self.held_teardowns):
+                if not self.supervisor.is_stopping(pkey):
+                    self.held_teardowns.discard(pkey)
+                    self.submit_teardown(pkey)
+
+    def step_bringup(self) -> None:
+        """Start any projects whose dependencies are now healthy.
 
-        Terminate the running Tilt process, and clear the pid from the
-        status_info struct.
+        Nothing is started while a teardown is still in progress, or while
+        stopped Tilt processes are still exiting.
         """
         if (
-            project_key in self.status_info
-            and self.status_info[project_key]["pid"] > 0
+            self.bringup.active
+            and not self.teardown.active
+            and not self.supervisor.stopping
         ):
-            self.log.debug(
-                f"Terminating process: {project_key}:"
-                f"{self.status_info[project_key]['pid']}"
-            )
-            os.kill(self.status_info[project_key]["pid"], SIGKILL)
-            self.status_info[project_key]["pid"] = 0
-            self.status_info[project_key]["service_online"] = False
+            for pkey in self.bringup.step(
+                self.start_tilt_process,
+                self.is_project_settled,
+                self.is_project_healthy,
+            ):
+                self.log.error(f"Unable to bring up Tilt project: {pkey}")
 
-    def stop_tilt_processes(self) -> None:
-        """Kill all running Tilt processes."""
         for pkey in self.status_info:
-            self.stop_tilt_process(pkey)
+            self.update_project(
+                pkey, bringup=self.bringup.states.get(pkey, "")
+            )
 
-        # Clear out the processes list
-        self.processes.clear()
+    def is_project_settled(self, project_key: str) -> bool:
+        """Check if a project's Tilt instance is up, and has finished
+        building its resources (successfully or not).
+        """
+        pinfo = self.status_info[project_key]
+        return (
+            pinfo["service_online"]
+            and len(pinfo["resources"]) > 0
+            and not self.is_project_busy(project_key)
+        )
 
-    def get_free_port(self) -> int:
-        """Get the next free port starting at 10350.
+    def is_project_busy(self, project_key: str) -> bool:
+        """Check if any of a project's resources are pending or building."""
+        return any(
+            resource.update_status in ("pending", "in_progress")
+            for resource in self.status_info[project_key]["resources"]
+        )
 
-        Returns:
-            int: The next free port.
+    def is_project_healthy(self, project_key: str) -> bool:
+        """Check if a project's Tilt instance is up, and all of its
+        resources are ok.
         """
-        start_port = 10350
+        pinfo = self.status_info.get(project_key)
+        return (
+            pinfo is not None
+            and pinfo["service_online"]
+            and len(pinfo["resources"]) > 0
+            and all(
+                resource.update_status in HEALTHY_UPDATE_STATUSES
+                and resource.runtime_status not in UNHEALTHY_RUNTIME_STATUSES
+                for resource in pinfo["resources"]
+            )
+        )
 
-        # Check status_info for any ports in use
-        used_ports = [pinfo["port"] for pinfo in self.status_info.values()]
+    def tear_down_all_resources(self) -> None:
+        """Tear down all Tilt projects.
 
-        while start_port in used_ports or not is_port_free(start_port):
-            start_port += 1
+        The teardowns run in parallel, check teardown.active to know when
+        they've all completed.
+        """
+        self.stop_tilt_processes()
+        for project_key in self.status_info:
+            self.tear_down_tilt_resources(project_key)
 
-        if start_port < 65535:
-            return start_port
-        else:
-            return -1
+    def tear_down_tilt_resources(self, project_key: str) -> None:
+        """Tear down Tilt resources of a single project, by project key.
+
+        The teardown is held as queued until the project's Tilt process
+        has exited, so 'tilt down' can't race with 'tilt up'. It's then
+        submitted by supervise_tilt_processes.
+        """
+        if project_key in self.status_info:
+
+            # First, make sure the Tilt process isn't running
+            self.stop_tilt_process(project_key)
+
+            with self.status_lock:
+                if self.supervisor.is_stopping(project_key):
+                    self.teardown.hold(project_key)
+                    self.held_teardowns.add(project_key)
+                else:
+                    self.submit_teardown(project_key)
+
+    def submit_teardown(self, project_key: str) -> None:
+        """Run the 'tilt down' command of a project, to clean up any
+        tilt-generated resources.
+        """
+        tilt_down_command = [
+            "tilt",
+            "down",
+            f"--file={project_key}",
+        ]
+
+        self.log.debug(f"Tearing down Tilt Resources: {project_key}")
+
+        # The Tiltfile may depend on the environment, same as 'tilt up'
+        tilt_env = os.environ.copy()
+        tilt_env.update(self.status_info[project_key]["env_vars"])
+        self.teardown.submit(
+            project_key,
+            tilt_down_command,
+            cwd=os.path.dirname(project_key),
+            env=tilt_env,
+        )
+
+    def stop_tilt_process(self, project_key: str) -> None:
+        """Stop single running Tilt process, by project key."""
+        self.stop_tilt_process_group([project_key])
+
+    def stop_tilt_processes(self) -> None:
+        """Stop all running Tilt processes."""
+        self.bringup.cancel()
+        self.stop_tilt_process_group(list(self.status_info))
+
+    def stop_tilt_process_group(self, project_keys: list[str]) -> None:
+        """Stop the running Tilt processes of several projects at once.
+
+        Each Tilt process is asked to terminate, and its pid is cleared from
+        the status_info struct right away. The project is marked as
+        stopping until the process exits, or is killed after the stop
+        timeout, in the background.
+        """
+        running = [
+            pkey
+            for pkey in project_keys
+            if pkey in self.status_info and self.status_info[pkey]["pid"] > 0
+        ]
+        for pkey in running:
+            self.log.debug(
+                f"Terminating process: {pkey}:"
+                f"{self.status_info[pkey]['pid']}"
+            )
+        self.supervisor.stop(project_keys)
+
+        for pkey in project_keys:
+            if pkey in running:
+                self.update_project(
+                    pkey,
+                    pid=0,
+                    service_online=False,
+                    crash="",
+                    stopping=self.supervisor.is_stopping(pkey),
+                )
+            elif pkey in self.status_info:
+                self.update_project(pkey, crash="")
+            self.session.forget(pkey)
 
     def cleanup(self) -> None:
-        self.stop_tilt_processes()
+        self.stop_view_streams()
+        if self.keep_running:
+            self.bringup.cancel()
+        else:
+            self.stop_tilt_processes()
+            self.supervisor.wait_stopped()
+        for output in self.process_outputs.values():
+            output.stop()
+        self.poll_executor.shutdown(wait=False, cancel_futures=True)
+        self.trigger_executor.shutdown(wait=False, cancel_futures=True)
+        self.teardown.shutdown()
+        self.close_sessions()
         self.status_info.clear()
 
     def __exit__(self, exc_type, exc_value, traceback):
@@ -227,14 +1132,16 @@ class TiltService:
         self.cleanup()
 
 
-def is_port_free(port: int) -> bool:
-    """Check if a port is free.
-
-    Args:
-        port (int): The port to check.
-
-    Returns:
-        bool: True if the port is free, False otherwise.
+def fit_request_timeout(
+    timeout: tuple[float, float], attempts: int, deadline: float
+) -> tuple[float, float]:
+    """Scale (connect, read) timeouts down, if needed, so a request whose
+    connection is attempted the given number of times can't outlast the
+    deadline.
     """
-    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        return s.connect_ex(("localhost", port)) != 0
+    connect_timeout, read_timeout = timeout
+    longest = connect_timeout * attempts + read_timeout
+    if longest <= deadline:
+        return timeout
+    scale = deadline / longest
+    return connect_timeout * scale, read_timeout * scale
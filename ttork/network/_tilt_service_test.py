@@ -0,0 +1,941 @@
+"""
+This module is used to test the TiltService module.
+"""
+
+import base64
+import hashlib
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from ttork.models import TiltResource
+from ._tilt_log_tail_test import make_log_view
+from ._tilt_service import TiltService, TILT_STATUS_UNCHANGED
+from ._tilt_supervisor import get_process_start_time
+from ._tilt_teardown import TiltTeardown
+
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+class FakeTiltHandler(BaseHTTPRequestHandler):
+    """Serves a canned /api/view response, optionally after a delay, and
+    the /ws/view stream when the server has streaming enabled. Resources
+    triggered through /api/trigger are recorded, unless set to fail.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_GET(self):
+        if self.path == "/ws/view":
+            return self.stream_view()
+        time.sleep(self.server.delay)
+        body = json.dumps(self.server.view).encode()
+        etag = '"{0}"'.format(hashlib.sha1(body).hexdigest())
+        if self.server.etags and self.headers["If-None-Match"] == etag:
+            self.server.not_modified += 1
+            self.send_response(304)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        if self.server.etags:
+            self.send_header("ETag", etag)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        time.sleep(self.server.trigger_delay)
+        length = int(self.headers["Content-Length"])
+        body = json.loads(self.rfile.read(length))
+        name = body["manifest_names"][0]
+        if self.path != "/api/trigger" or name in self.server.fail_triggers:
+            self.send_error(400)
+            return
+        self.server.triggers.append(name)
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def stream_view(self):
+        if not self.server.streaming:
+            self.send_error(404)
+            return
+
+        key = self.headers["Sec-WebSocket-Key"] + WEBSOCKET_GUID
+        self.send_response(101)
+        self.send_header("Upgrade", "websocket")
+        self.send_header("Connection", "Upgrade")
+        self.send_header(
+            "Sec-WebSocket-Accept",
+            base64.b64encode(hashlib.sha1(key.encode()).digest()).decode(),
+        )
+        self.end_headers()
+
+        updates = queue.Queue()
+        updates.put(dict(self.server.view, isComplete=True))
+        self.server.clients.append(updates)
+        while (message := updates.get()) is not None:
+            self.send_text_frame(json.dumps(message).encode())
+        self.close_connection = True
+
+    def send_text_frame(self, payload: bytes):
+        header = bytearray([0x81])
+        if len(payload) < 126:
+            header.append(len(payload))
+        elif len(payload) < 65536:
+            header.append(126)
+            header += len(payload).to_bytes(2, "big")
+        else:
+            header.append(127)
+            header += len(payload).to_bytes(8, "big")
+        self.wfile.write(bytes(header) + payload)
+        self.wfile.flush()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeTiltServer(ThreadingHTTPServer):
+    """Minimal stand-in for a running Tilt instance."""
+
+    daemon_threads = True
+
+    def __init__(
+        self, view: dict, delay: float = 0.0, streaming: bool = False
+    ) -> None:
+        super().__init__(("localhost", 0), FakeTiltHandler)
+        self.view = view
+        self.delay = delay
+        self.trigger_delay = 0.0
+        self.streaming = streaming
+        self.etags = False
+        self.connections = 0
+        self.not_modified = 0
+        self.clients = []
+        self.triggers = []
+        self.fail_triggers = set()
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def push(self, update: dict) -> None:
+        """Send a view update to all connected stream clients."""
+        for client in self.clients:
+            client.put(update)
+
+    def drop_clients(self) -> None:
+        """Close all of the stream connections."""
+        for client in self.clients:
+            client.put(None)
+        self.clients = []
+
+    def stop(self) -> None:
+        self.drop_clients()
+        self.shutdown()
+        self.server_close()
+
+    def handle_error(self, request, client_address):
+        # Clients that gave up on a slow response are expected here
+        pass
+
+
+def make_view(*names: str, status: str = "ok") -> dict:
+    """Build an /api/view payload with the given resource names."""
+    return {
+        "uiResources": [
+            {"metadata": {"name": name}, "status": {"updateStatus": status}}
+            for name in names
+        ]
+    }
+
+
+def wait_for(condition, timeout: float = 2.0) -> bool:
+    """Wait for the condition to become true."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def make_fake_tilt_config(
+    directory: str, script: str, **project
+) -> tuple[dict, str]:
+    """Build a ttork configuration with a single project in the directory,
+    whose 'tilt' command is a fake shell script, found through the
+    project's PATH.
+
+    Returns:
+        tuple: The configuration, and the project's Tiltfile path.
+    """
+    project_dir = os.path.join(directory, "project")
+    os.makedirs(project_dir)
+    tilt = os.path.join(project_dir, "tilt")
+    with open(tilt, "w") as file:
+        file.write(f"#!/bin/sh\n{script}\n")
+    os.chmod(tilt, 0o755)
+    tiltfile = os.path.join(project_dir, "Tiltfile")
+    open(tiltfile, "w").close()
+
+    config = make_config(0, directory)
+    config["projects"] = [
+        dict(
+            name="project",
+            tiltFilePath=tiltfile,
+            environment=[{"name": "PATH", "value": project_dir}],
+            **project,
+        )
+    ]
+    return config, tiltfile
+
+
+def make_config(count: int, state_dir: str, **tilt_config) -> dict:
+    """Build a ttork configuration with the given number of projects, and
+    its state in state_dir.
+    """
+    tilt_config.setdefault("statusMode", "poll")
+    # Poll on every update, unless a test is about the poll schedule
+    tilt_config.setdefault("pollInterval", 0)
+    tilt_config.setdefault("idlePollInterval", 0)
+    tilt_config.setdefault("stateDir", str(state_dir))
+    return {
+        "tilt": tilt_config,
+        "projects": [
+            {"name": f"project{i}", "tiltFilePath": f"/path/{i}/Tiltfile"}
+            for i in range(count)
+        ],
+    }
+
+
+@pytest.mark.usefixtures("tilt_services")
+class TestTiltServicePolling(unittest.TestCase):
+
+    def test_update_status_info_online(self):
+        server = self.start_server(make_view("api", "db"))
+        service = self.make_service(1)
+        service.status_info["/path/0/Tiltfile"]["port"] = server.port
+
+        service.update_status_info()
+
+        pinfo = service.status_info["/path/0/Tiltfile"]
+        self.assertTrue(pinfo["service_online"])
+        self.assertIsInstance(pinfo["resources"][0], TiltResource)
+        self.assertEqual(
+            [resource.name for resource in pinfo["resources"]],
+            ["api", "db"],
+        )
+
+    def test_update_status_info_offline(self):
+        server = self.start_server(make_view("api"))
+        port = server.port
+        server.stop()
+        service = self.make_service(1)
+        service.status_info["/path/0/Tiltfile"]["port"] = port
+
+        service.update_status_info()
+
+        pinfo = service.status_info["/path/0/Tiltfile"]
+        self.assertFalse(pinfo["service_online"])
+        self.assertEqual(pinfo["resources"], [])
+
+    def test_update_status_info_polls_concurrently(self):
+        service = self.make_service(6, pollTimeout=2)
+        for pinfo in service.status_info.values():
+            pinfo["port"] = self.start_server(make_view("api"), 0.3).port
+
+        start = time.monotonic()
+        service.update_status_info()
+        elapsed = time.monotonic() - start
+
+        self.assertLess(elapsed, 1.2)
+        for pinfo in service.status_info.values():
+            self.assertTrue(pinfo["service_online"])
+
+    def test_update_status_info_deadline(self):
+        service = self.make_service(2, pollTimeout=0.2)
+        fast, slow = service.status_info.values()
+        fast["port"] = self.start_server(make_view("api")).port
+        slow["port"] = self.start_server(make_view("api"), 1.0).port
+
+        start = time.monotonic()
+        service.update_status_info()
+        elapsed = time.monotonic() - start
+
+        self.assertLess(elapsed, 0.8)
+        self.assertTrue(fast["service_online"])
+        self.assertFalse(slow["service_online"])
+
+    def test_get_resource_details(self):
+        view = make_view("api", "db")
+        view["uiResources"][1]["status"]["buildHistory"] = [{"error": ""}]
+        server = self.start_server(view)
+        service = self.make_service(1)
+        service.status_info["/path/0/Tiltfile"]["port"] = server.port
+
+        details = service.get_resource_details("/path/0/Tiltfile", "db")
+
+        self.assertEqual(details, view["uiResources"][1])
+        self.assertIsNone(
+            service.get_resource_details("/path/0/Tiltfile", "missing")
+        )
+
+    def test_start_missing_tiltfiles(self):
+        service = self.make_service(2)
+
+        with self.assertLogs(self.log, "ERROR"):
+            service.start_tilt_processes()
+
+        self.assertFalse(service.bringup.active)
+        for pinfo in service.status_info.values():
+            self.assertEqual(pinfo["pid"], 0)
+            self.assertEqual(pinfo["bringup"], "")
+
+    def test_process_output(self):
+        config, tiltfile = self.make_fake_tilt_config(
+            'for i in 1 2 3; do echo "tilt $1 $i"; done',
+            outputBufferLines=3,
+        )
+        service = self.make_service(config=config)
+
+        self.assertTrue(service.start_tilt_process(tiltfile))
+        self.assertTrue(
+            wait_for(lambda: service.get_process_output(tiltfile)[0] == 4)
+        )
+        self.assertEqual(
+            service.get_process_output(tiltfile),
+            (4, ["tilt up 1", "tilt up 2", "tilt up 3"]),
+        )
+        self.assertEqual(
+            service.get_process_output(tiltfile, 3), (4, ["tilt up 3"])
+        )
+        self.assertEqual(service.get_process_output("/missing"), (0, []))
+
+    def test_polled_logs(self):
+        server = self.start_server(
+            dict(make_view("api"), **make_log_view(("api", "a1\n")))
+        )
+        service = self.make_service(1)
+        service.status_info["/path/0/Tiltfile"]["port"] = server.port
+
+        service.update_status_info()
+        server.view = dict(
+            make_view("api"),
+            **make_log_view(("api", "a1\n"), ("(Tiltfile)", "t1\n")),
+        )
+        service.update_status_info()
+
+        self.assertEqual(
+            service.get_tilt_logs("/path/0/Tiltfile"),
+            (2, [("api", "a1"), ("(Tiltfile)", "t1")]),
+        )
+        self.assertEqual(
+            service.get_tilt_logs("/path/0/Tiltfile", "api", since=1),
+            (2, []),
+        )
+
+    def test_adaptive_polling(self):
+        server = self.start_server(make_view("api"))
+        service = self.make_service(
+            2, pollInterval=1, idlePollInterval=5, maxPollBackoff=30
+        )
+        online, offline = "/path/0/Tiltfile", "/path/1/Tiltfile"
+        service.status_info[online]["port"] = server.port
+        service.status_info[offline]["port"] = 1
+
+        service.update_status_info()
+        self.assertEqual(service.status_info[online]["poll_interval"], 5)
+        self.assertEqual(service.status_info[offline]["poll_interval"], 2)
+
+        # Not due again yet, so the change isn't seen
+        server.view = make_view("api", "db")
+        service.update_status_info()
+        self.assertEqual(len(service.status_info[online]["resources"]), 1)
+
+        service.poll_scheduler.reset(online)
+        server.view = make_view("api", status="in_progress")
+        service.update_status_info()
+        self.assertEqual(service.status_info[online]["poll_interval"], 1)
+
+    def test_project_health(self):
+        view = make_view("api", "db")
+        server = self.start_server(view)
+        service = self.make_service(1)
+        service.status_info["/path/0/Tiltfile"]["port"] = server.port
+
+        service.update_status_info()
+        self.assertTrue(service.is_project_settled("/path/0/Tiltfile"))
+        self.assertTrue(service.is_project_healthy("/path/0/Tiltfile"))
+
+        server.view = make_view("api", "db", status="error")
+        service.update_status_info()
+        self.assertTrue(service.is_project_settled("/path/0/Tiltfile"))
+        self.assertFalse(service.is_project_healthy("/path/0/Tiltfile"))
+
+        server.view = make_view("api", "db", status="in_progress")
+        service.update_status_info()
+        self.assertFalse(service.is_project_settled("/path/0/Tiltfile"))
+
+
+@pytest.mark.usefixtures("tilt_services")
+class TestTiltServiceProcesses(unittest.TestCase):
+
+    def make_fake_tilt_service(self, script: str, **tilt_config) -> tuple:
+        config, tiltfile = self.make_fake_tilt_config(script)
+        config["tilt"].update(tilt_config)
+        return self.make_service(config=config), tiltfile
+
+    def test_crash_detected(self):
+        service, tiltfile = self.make_fake_tilt_service("exit 3")
+        service.start_tilt_process(tiltfile)
+        self.assertTrue(
+            wait_for(lambda: service.supervisor.processes[tiltfile].poll())
+        )
+
+        with self.assertLogs(self.log, "ERROR"):
+            service.update_status_info()
+
+        pinfo = service.status_info[tiltfile]
+        self.assertEqual(pinfo["pid"], 0)
+        self.assertEqual(pinfo["crash"], "exit code 3")
+        self.assertFalse(service.supervisor.is_running(tiltfile))
+
+    def test_crash_restarted(self):
+        service, tiltfile = self.make_fake_tilt_service(
+            "exit 3", restartOnCrash=True, restartBackoff=0, maxRestarts=1
+        )
+        service.start_tilt_process(tiltfile)
+        first_pid = service.status_info[tiltfile]["pid"]
+        self.assertTrue(
+            wait_for(lambda: service.supervisor.processes[tiltfile].poll())
+        )
+        self.assertTrue(
+            wait_for(lambda: service.get_process_output(tiltfile)[0] == 1)
+        )
+
+        with self.assertLogs(self.log, "ERROR"):
+            service.update_status_info()
+
+        pinfo = service.status_info[tiltfile]
+        self.assertNotIn(pinfo["pid"], (0, first_pid))
+        self.assertEqual(pinfo["crash"], "")
+        self.assertTrue(
+            wait_for(lambda: service.get_process_output(tiltfile)[0] == 2)
+        )
+        self.assertEqual(
+            service.get_process_output(tiltfile)[1],
+            [f"$ tilt up --port={pinfo['port']} --file={tiltfile}"] * 2,
+        )
+
+    def test_crash_fails_bringup(self):
+        service, tiltfile = self.make_fake_tilt_service("exit 3")
+        service.start_tilt_processes()
+        self.assertTrue(service.bringup.active)
+        self.assertTrue(
+            wait_for(lambda: service.supervisor.processes[tiltfile].poll())
+        )
+
+        with self.assertLogs(self.log, "ERROR"):
+            service.update_status_info()
+
+        self.assertFalse(service.bringup.active)
+        self.assertIn(tiltfile, service.bringup.failed)
+
+    def test_stop(self):
+        service, tiltfile = self.make_fake_tilt_service("sleep 10")
+        service.start_tilt_process(tiltfile)
+        process = service.supervisor.processes[tiltfile]
+
+        # A running process isn't started twice
+        self.assertTrue(service.start_tilt_process(tiltfile))
+        self.assertIs(service.supervisor.processes[tiltfile], process)
+
+        service.stop_tilt_process(tiltfile)
+
+        # The process exits in the background
+        pinfo = service.status_info[tiltfile]
+        self.assertEqual(pinfo["pid"], 0)
+        self.assertTrue(pinfo["stopping"])
+
+        service.supervisor.wait_stopped()
+        service.update_status_info()
+        self.assertIsNotNone(process.returncode)
+        self.assertFalse(pinfo["stopping"])
+
+    def test_bringup_waits_for_stopping(self):
+        service, tiltfile = self.make_fake_tilt_service(
+            "exit 0", stopTimeout=0.5
+        )
+
+        # A Tilt process that takes a while to exit
+        process = subprocess.Popen(
+            [
+                sys.executable,
+                "-c",
+                "import signal, time;"
+                "signal.signal(signal.SIGTERM, signal.SIG_IGN);"
+                "print(flush=True); time.sleep(10)",
+            ],
+            stdout=subprocess.PIPE,
+            start_new_session=True,
+        )
+        self.addCleanup(process.stdout.close)
+        process.stdout.readline()
+        service.supervisor.add(tiltfile, process)
+        service.update_project(tiltfile, pid=process.pid)
+        service.stop_tilt_process(tiltfile)
+
+        service.start_tilt_processes()
+        self.assertEqual(service.status_info[tiltfile]["pid"], 0)
+
+        service.supervisor.wait_stopped()
+        service.update_status_info()
+        self.assertGreater(service.status_info[tiltfile]["pid"], 0)
+
+    def test_teardown_waits_for_stopping(self):
+        # 'tilt down' fails if the 'tilt up' process is still running
+        service, tiltfile = self.make_fake_tilt_service(
+            '[ "$1" = down ] && ! kill -0 "$UP_PID" 2>/dev/null',
+            stopTimeout=0.5,
+        )
+
+        # A Tilt process that takes a while to exit
+        process = subprocess.Popen(
+            [
+                sys.executable,
+                "-c",
+                "import signal, time;"
+                "signal.signal(signal.SIGTERM, signal.SIG_IGN);"
+                "print(flush=True); time.sleep(10)",
+            ],
+            stdout=subprocess.PIPE,
+            start_new_session=True,
+        )
+        self.addCleanup(process.stdout.close)
+        process.stdout.readline()
+        service.supervisor.add(tiltfile, process)
+        service.update_project(tiltfile, pid=process.pid)
+        service.status_info[tiltfile]["env_vars"]["UP_PID"] = str(process.pid)
+
+        service.tear_down_all_resources()
+        service.update_status_info()
+        self.assertEqual(service.status_info[tiltfile]["teardown"], "queued")
+        self.assertTrue(service.teardown.active)
+
+        service.supervisor.wait_stopped()
+        self.assertIsNotNone(process.poll())
+        service.update_status_info()
+        self.assertTrue(wait_for(lambda: not service.teardown.active))
+        self.assertEqual(
+            service.teardown.results[tiltfile].state, TiltTeardown.DONE
+        )
+
+
+@pytest.mark.usefixtures("tilt_services")
+class TestTiltServiceReattach(unittest.TestCase):
+
+    def setUp(self):
+        self.server = self.start_server(make_view("api", "db"))
+        self.config = self.make_config(2)
+
+        # A Tilt process left running by an earlier ttork
+        self.process = subprocess.Popen(
+            ["sleep", "10"], start_new_session=True
+        )
+        self.addCleanup(self.process.kill)
+        self.write_session(
+            {
+                "/path/0/Tiltfile": {
+                    "port": self.server.port,
+                    "pid": self.process.pid,
+                    "startTime": get_process_start_time(self.process.pid),
+                },
+                "/path/1/Tiltfile": {"port": 1, "pid": 2**22 + 1},
+            }
+        )
+
+    def write_session(self, entries: dict) -> None:
+        path = os.path.join(self.config["tilt"]["stateDir"], "session.json")
+        with open(path, "w") as file:
+            json.dump(entries, file)
+
+    def test_reattach(self):
+        service = self.make_service(config=self.config)
+
+        pinfo = service.status_info["/path/0/Tiltfile"]
+        self.assertEqual(pinfo["port"], self.server.port)
+        self.assertEqual(pinfo["pid"], self.process.pid)
+        self.assertTrue(pinfo["service_online"])
+        self.assertEqual(len(pinfo["resources"]), 2)
+        self.assertTrue(service.supervisor.is_running("/path/0/Tiltfile"))
+        self.assertEqual(
+            service.port_allocator.allocate("/path/0/Tiltfile"),
+            self.server.port,
+        )
+
+        # The dead process is forgotten
+        self.assertEqual(service.status_info["/path/1/Tiltfile"]["pid"], 0)
+        self.assertEqual(list(service.session.entries), ["/path/0/Tiltfile"])
+
+    def test_reattached_process_stopped(self):
+        service = self.make_service(config=self.config)
+
+        service.stop_tilt_process("/path/0/Tiltfile")
+
+        self.assertIsNotNone(self.process.wait(2))
+        self.assertEqual(service.session.entries, {})
+
+    def test_keep_running(self):
+        self.config["keepRunning"] = True
+        service = self.make_service(config=self.config)
+
+        service.cleanup()
+
+        self.assertIsNone(self.process.poll())
+
+        # The next ttork reattaches to it
+        service = self.make_service(config=self.config)
+        self.assertEqual(
+            service.status_info["/path/0/Tiltfile"]["pid"], self.process.pid
+        )
+
+    def test_not_serving_tilt(self):
+        self.write_session(
+            {
+                "/path/0/Tiltfile": {
+                    "port": 1,
+                    "pid": self.process.pid,
+                    "startTime": get_process_start_time(self.process.pid),
+                }
+            }
+        )
+
+        with self.assertLogs(self.log, "WARNING"):
+            service = self.make_service(config=self.config)
+
+        # Stopped, rather than left running unsupervised
+        self.assertIsNotNone(self.process.wait(2))
+        self.assertEqual(service.status_info["/path/0/Tiltfile"]["pid"], 0)
+        self.assertFalse(service.supervisor.is_running("/path/0/Tiltfile"))
+        self.assertEqual(service.session.entries, {})
+
+    def test_reused_pid(self):
+        self.write_session(
+            {
+                "/path/0/Tiltfile": {
+                    "port": self.server.port,
+                    "pid": self.process.pid,
+                    "startTime": get_process_start_time(self.process.pid) - 1,
+                }
+            }
+        )
+
+        service = self.make_service(config=self.config)
+
+        self.assertEqual(service.status_info["/path/0/Tiltfile"]["pid"], 0)
+        self.assertFalse(service.supervisor.is_running("/path/0/Tiltfile"))
+        self.assertEqual(service.session.entries, {})
+        self.assertIsNone(self.process.poll())
+
+    def test_fresh(self):
+        self.config["fresh"] = True
+
+        service = self.make_service(config=self.config)
+
+        self.assertIsNotNone(self.process.wait(2))
+        self.assertEqual(service.status_info["/path/0/Tiltfile"]["pid"], 0)
+        self.assertEqual(service.session.entries, {})
+
+
+@pytest.mark.usefixtures("tilt_services")
+class TestTiltServiceVersions(unittest.TestCase):
+
+    def setUp(self):
+        self.server = self.start_server(make_view("api"))
+        self.service = self.make_service(2)
+        self.service.status_info["/path/0/Tiltfile"]["port"] = self.server.port
+
+    def test_changed_since(self):
+        self.assertEqual(self.service.changed_since(0), (0, []))
+
+        self.service.update_status_info()
+
+        version, changed = self.service.changed_since(0)
+        self.assertGreater(version, 0)
+        self.assertEqual(changed, ["/path/0/Tiltfile"])
+
+    def test_unchanged_status_keeps_version(self):
+        self.service.update_status_info()
+        version, _ = self.service.changed_since(0)
+
+        self.service.update_status_info()
+
+        self.assertEqual(self.service.changed_since(version), (version, []))
+
+    def test_snapshot_not_modified_by_updates(self):
+        self.service.update_status_info()
+        snapshot = self.service.get_status_info()
+        self.server.view = make_view("api", "db")
+
+        self.service.update_status_info()
+
+        resources = snapshot["/path/0/Tiltfile"]["resources"]
+        self.assertEqual(len(resources), 1)
+
+
+@pytest.mark.usefixtures("tilt_services")
+class TestTiltServiceFingerprints(unittest.TestCase):
+
+    def setUp(self):
+        self.server = self.start_server(make_view("api"))
+        self.service = self.make_service(1)
+        self.service.status_info["/path/0/Tiltfile"]["port"] = self.server.port
+
+    def test_unchanged_body(self):
+        port = self.server.port
+        view, fingerprint = self.service.get_tilt_status(port)
+        self.assertIsInstance(view, dict)
+        self.assertEqual(
+            self.service.get_tilt_status(port, fingerprint),
+            (TILT_STATUS_UNCHANGED, fingerprint),
+        )
+
+        self.server.view = make_view("api", "db")
+        view, _ = self.service.get_tilt_status(port, fingerprint)
+        self.assertIsInstance(view, dict)
+
+    def test_unchanged_etag(self):
+        self.server.etags = True
+        port = self.server.port
+        view, fingerprint = self.service.get_tilt_status(port)
+        self.assertIsInstance(view, dict)
+        self.assertIs(
+            self.service.get_tilt_status(port, fingerprint)[0],
+            TILT_STATUS_UNCHANGED,
+        )
+        self.assertEqual(self.server.not_modified, 1)
+
+        # Fingerprints are only recorded by the caller
+        self.assertEqual(self.service.view_fingerprints, {})
+
+    def test_unchanged_view_keeps_status(self):
+        self.service.update_status_info()
+        version, _ = self.service.changed_since(0)
+
+        self.service.update_status_info()
+
+        pinfo = self.service.status_info["/path/0/Tiltfile"]
+        self.assertEqual(self.service.changed_since(version), (version, []))
+        self.assertTrue(pinfo["service_online"])
+        self.assertEqual(len(pinfo["resources"]), 1)
+
+    def test_offline_clears_fingerprint(self):
+        self.service.status_info["/path/0/Tiltfile"]["port"] = 1
+        self.service.view_fingerprints[1] = ("body", b"")
+
+        self.service.update_status_info()
+
+        self.assertNotIn(1, self.service.view_fingerprints)
+
+    def test_timed_out_poll_not_unchanged(self):
+        self.service.poll_timeout = 0.2
+        self.service.update_status_info()
+        self.server.view = make_view("api", "db")
+        self.server.delay = 0.5
+
+        # The new view arrives after the deadline
+        self.service.update_status_info()
+        pinfo = self.service.status_info["/path/0/Tiltfile"]
+        self.assertFalse(pinfo["service_online"])
+        time.sleep(0.5)
+
+        self.server.delay = 0
+        self.service.update_status_info()
+
+        self.assertTrue(pinfo["service_online"])
+        self.assertEqual(len(pinfo["resources"]), 2)
+
+    def test_unchanged_view_of_offline_project(self):
+        self.service.update_status_info()
+        pinfo = self.service.status_info["/path/0/Tiltfile"]
+        self.service.update_project(
+            "/path/0/Tiltfile", resources=[], service_online=False
+        )
+
+        self.service.update_status_info()
+
+        self.assertTrue(pinfo["service_online"])
+        self.assertEqual(len(pinfo["resources"]), 1)
+
+
+@pytest.mark.usefixtures("tilt_services")
+class TestTiltServiceSessions(unittest.TestCase):
+
+    def setUp(self):
+        self.server = self.start_server(make_view("api"))
+        self.service = self.make_service(
+            1, connectTimeout=0.2, readTimeout=0.5
+        )
+        self.service.status_info["/path/0/Tiltfile"]["port"] = self.server.port
+
+    def test_request_timeout_from_config(self):
+        self.assertEqual(self.service.request_timeout, (0.2, 0.5))
+
+        # Scaled down for polls, so a poll can't outlast its deadline
+        connect_timeout, read_timeout = self.service.poll_request_timeout
+        self.assertAlmostEqual(connect_timeout * 2 + read_timeout, 0.8)
+        self.assertAlmostEqual(read_timeout / connect_timeout, 2.5)
+
+    def test_request_timeout_from_poll_timeout(self):
+        service = self.make_service(12, pollTimeout=2, maxRetries=3)
+
+        self.assertEqual(service.request_timeout, (0.125, 1.5))
+        self.assertEqual(service.poll_request_timeout, (0.125, 1.5))
+
+        # Every project can be polled at once
+        self.assertEqual(service.poll_executor._max_workers, 12)
+
+    def test_connection_reused_across_polls(self):
+        for _ in range(3):
+            self.service.update_status_info()
+
+        self.assertEqual(self.server.connections, 1)
+        self.assertEqual(list(self.service.sessions), [self.server.port])
+
+    def test_cleanup_closes_sessions(self):
+        self.service.update_status_info()
+        self.service.cleanup()
+
+        self.assertEqual(self.service.sessions, {})
+
+
+@pytest.mark.usefixtures("tilt_services")
+class TestTiltServiceTriggers(unittest.TestCase):
+
+    def setUp(self):
+        self.servers = [
+            self.start_server(make_view("api", "db")),
+            self.start_server(make_view("web")),
+        ]
+        self.service = self.make_service(2)
+        for i, server in enumerate(self.servers):
+            self.service.status_info[f"/path/{i}/Tiltfile"][
+                "port"
+            ] = server.port
+
+    def get_triggers(self, index: int) -> dict:
+        return self.service.status_info[f"/path/{index}/Tiltfile"]["triggers"]
+
+    def test_trigger_resources(self):
+        self.servers[0].fail_triggers.add("db")
+
+        self.service.trigger_resources(
+            {"/path/0/Tiltfile": ["api", "db"], "/path/1/Tiltfile": ["web"]}
+        )
+
+        self.assertTrue(
+            wait_for(
+                lambda: TiltService.TRIGGER_QUEUED
+                not in list(self.get_triggers(0).values())
+                + list(self.get_triggers(1).values())
+            )
+        )
+        self.assertEqual(self.servers[0].triggers, ["api"])
+        self.assertEqual(self.servers[1].triggers, ["web"])
+        self.assertEqual(
+            self.get_triggers(0),
+            {"api": TiltService.TRIGGERED, "db": TiltService.TRIGGER_FAILED},
+        )
+        self.assertEqual(self.get_triggers(1), {"web": TiltService.TRIGGERED})
+
+    def test_poll_during_slow_triggers(self):
+        self.service.update_status_info()
+        for server in self.servers:
+            server.trigger_delay = self.service.poll_timeout
+
+        self.service.trigger_resources(
+            {"/path/0/Tiltfile": ["api", "db"], "/path/1/Tiltfile": ["web"]}
+        )
+        self.service.update_status_info()
+
+        for index in range(2):
+            pinfo = self.service.status_info[f"/path/{index}/Tiltfile"]
+            self.assertTrue(pinfo["service_online"])
+            self.assertTrue(pinfo["resources"])
+        self.assertEqual(
+            self.get_triggers(0),
+            {
+                "api": TiltService.TRIGGER_QUEUED,
+                "db": TiltService.TRIGGER_QUEUED,
+            },
+        )
+        self.assertEqual(
+            self.get_triggers(1), {"web": TiltService.TRIGGER_QUEUED}
+        )
+
+    def test_trigger_errored_resources(self):
+        self.servers[0].view = make_view("api", status="error")
+        self.service.update_status_info()
+
+        self.assertEqual(self.service.trigger_errored_resources(), 1)
+
+        self.assertTrue(wait_for(lambda: self.servers[0].triggers == ["api"]))
+        self.assertEqual(self.servers[1].triggers, [])
+
+    def test_triggers_expire_once_building(self):
+        self.service.update_status_info()
+        self.service.trigger_resources({"/path/0/Tiltfile": ["api", "db"]})
+        self.assertTrue(wait_for(lambda: len(self.servers[0].triggers) == 2))
+        self.assertTrue(
+            wait_for(
+                lambda: self.get_triggers(0).get("db") == TiltService.TRIGGERED
+            )
+        )
+
+        self.servers[0].view = make_view("api", status="in_progress")
+        self.service.update_status_info()
+
+        self.assertEqual(self.get_triggers(0), {})
+
+    def test_failed_triggers_expire(self):
+        self.service.update_status_info()
+        self.servers[0].fail_triggers.add("api")
+        self.service.trigger_resources({"/path/0/Tiltfile": ["api"]})
+        self.assertTrue(
+            wait_for(
+                lambda: self.get_triggers(0).get("api")
+                == TiltService.TRIGGER_FAILED
+            )
+        )
+
+        # Still shown while the view is unchanged, until the timeout
+        self.service.update_status_info()
+        self.assertEqual(
+            self.get_triggers(0), {"api": TiltService.TRIGGER_FAILED}
+        )
+
+        self.service.TRIGGER_STATE_TIMEOUT = 0
+        self.service.update_status_info()
+        self.assertEqual(self.get_triggers(0), {})
+        self.assertEqual(self.service.trigger_times, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
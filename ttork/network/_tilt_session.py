@@ -0,0 +1,68 @@
+import json
+import os
+
+from ._tilt_supervisor import get_process_start_time, is_process_alive
+
+
+class TiltSession:
+    """Remembers the Tilt processes started by ttork, in a state file, so
+    a restarted ttork can reattach to those that are still running.
+    """
+
+    def __init__(self, state_file: str = None) -> None:
+        self.state_file = state_file
+
+        # Port, pid, and start time of each running Tilt process, by key
+        self.entries = self.load()
+
+    def record(self, key: str, port: int, pid: int) -> None:
+        """Remember a newly started Tilt process."""
+        self.entries[key] = {
+            "port": port,
+            "pid": pid,
+            "startTime": get_process_start_time(pid),
+        }
+        self.save()
+
+    def is_running(self, key: str) -> bool:
+        """Check if the remembered Tilt process of the key is still running.
+
+        The process's start time must match the remembered one, so a process
+        that has since reused the pid is never mistaken for it.
+        """
+        entry = self.entries[key]
+        return is_process_alive(entry["pid"]) and entry.get(
+            "startTime"
+        ) == get_process_start_time(entry["pid"])
+
+    def forget(self, key: str) -> None:
+        """Forget a Tilt process that's no longer running."""
+        if self.entries.pop(key, None) is not None:
+            self.save()
+
+    def load(self) -> dict[str, dict]:
+        """Load the Tilt processes remembered in the state file."""
+        if self.state_file is None:
+            return {}
+        try:
+            with open(self.state_file, "r") as file:
+                entries = json.load(file)
+            return {
+                key: entry
+                for key, entry in entries.items()
+                if isinstance(entry.get("port"), int)
+                and isinstance(entry.get("pid"), int)
+            }
+        except (OSError, ValueError, AttributeError):
+            return {}
+
+    def save(self) -> None:
+        """Remember all running Tilt processes in the state file."""
+        if self.state_file is None:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
+            with open(self.state_file, "w") as file:
+                json.dump(self.entries, file, indent=2)
+        except OSError:
+            pass
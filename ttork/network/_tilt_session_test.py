@@ -0,0 +1,68 @@
+"""
+This module is used to test the TiltSession module.
+"""
+
+import json
+import os
+import subprocess
+import tempfile
+import unittest
+
+from ._tilt_session import TiltSession
+
+
+class TestTiltSession(unittest.TestCase):
+
+    def setUp(self):
+        self.state_dir = tempfile.TemporaryDirectory()
+        self.state_file = os.path.join(self.state_dir.name, "session.json")
+
+    def tearDown(self):
+        self.state_dir.cleanup()
+
+    def test_record_and_forget(self):
+        session = TiltSession(self.state_file)
+        session.record("a", 10350, 100)
+        session.record("b", 10351, 101)
+        session.forget("a")
+
+        entries = TiltSession(self.state_file).entries
+        self.assertEqual(list(entries), ["b"])
+        self.assertEqual(entries["b"]["port"], 10351)
+        self.assertEqual(entries["b"]["pid"], 101)
+        self.assertIn("startTime", entries["b"])
+
+    def test_is_running(self):
+        process = subprocess.Popen(["sleep", "10"])
+        self.addCleanup(process.wait)
+        self.addCleanup(process.kill)
+        session = TiltSession(self.state_file)
+        session.record("a", 10350, process.pid)
+        self.assertTrue(session.is_running("a"))
+
+        # Another process that has since reused the pid
+        session.entries["a"]["startTime"] -= 1
+        self.assertFalse(session.is_running("a"))
+
+        session.entries["a"]["startTime"] += 1
+        process.kill()
+        process.wait()
+        self.assertFalse(session.is_running("a"))
+
+    def test_invalid_state_file(self):
+        with open(self.state_file, "w") as file:
+            json.dump({"a": {"port": "x", "pid": 1}, "b": {"pid": 2}}, file)
+        self.assertEqual(TiltSession(self.state_file).entries, {})
+
+        with open(self.state_file, "w") as file:
+            file.write("not json")
+        self.assertEqual(TiltSession(self.state_file).entries, {})
+
+    def test_no_state_file(self):
+        session = TiltSession()
+        session.record("a", 10350, 100)
+        self.assertIn("a", session.entries)
+
+
+if __name__ == "__main__":
+    unittest.main()
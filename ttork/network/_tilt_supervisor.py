@@ -0,0 +1,237 @@
+import os
+import signal
+import subprocess
+import threading
+import time
+from typing import Callable
+
+
+class TiltSupervisor:
+    """Supervises the Tilt processes started by ttork.
+
+    Exited processes are reaped with non-blocking polls, so crashes are
+    noticed right away and never leave zombies behind. Crashed projects can
+    be restarted with exponential backoff, up to a restart budget.
+
+    Each process is expected to lead its own process group (started with
+    start_new_session), so stopping it also stops the processes it started,
+    such as 'tilt up' under a shell.
+    """
+
+    def __init__(
+        self,
+        restart: bool = False,
+        max_restarts: int = 3,
+        restart_backoff: float = 2.0,
+        max_restart_backoff: float = 60.0,
+        stop_timeout: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.restart = restart
+        self.max_restarts = max_restarts
+        self.restart_backoff = restart_backoff
+        self.max_restart_backoff = max_restart_backoff
+        self.stop_timeout = stop_timeout
+        self.clock = clock
+
+        # Running processes, restarts used, and the time of each pending
+        # restart, by key.
+        self.processes = {}
+        self.restart_counts = {}
+        self.pending_restarts = {}
+
+        # Processes asked to terminate that haven't exited yet, by key, and
+        # the threads waiting on them.
+        self.stopping = {}
+        self.stoppers = []
+
+    def add(self, key: str, process: subprocess.Popen) -> None:
+        """Supervise a newly started process."""
+        self.processes[key] = process
+        self.pending_restarts.pop(key, None)
+
+    def adopt(self, key: str, pid: int) -> None:
+        """Supervise a running process started by an earlier ttork."""
+        self.add(key, AdoptedProcess(pid))
+
+    def is_running(self, key: str) -> bool:
+        """Check if the key's process is still running."""
+        return key in self.processes
+
+    def is_stopping(self, key: str) -> bool:
+        """Check if the key's process was stopped, but hasn't exited yet."""
+        return key in self.stopping
+
+    def reset(self, key: str) -> None:
+        """Restore the key's restart budget, and cancel any pending restart."""
+        self.restart_counts.pop(key, None)
+        self.pending_restarts.pop(key, None)
+
+    def reap(self) -> dict[str, int]:
+        """Collect the processes that have exited, without blocking, and
+        schedule their restarts.
+
+        Returns:
+            dict: The exit codes of the exited processes, by key.
+        """
+        exited = {}
+        for key, process in list(self.processes.items()):
+            exit_code = process.poll()
+            if exit_code is None:
+                continue
+
+            del self.processes[key]
+            exited[key] = exit_code
+            restarts = self.restart_counts.get(key, 0)
+            if self.restart and restarts < self.max_restarts:
+                self.restart_counts[key] = restarts + 1
+                self.pending_restarts[key] = self.clock() + min(
+                    self.restart_backoff * 2**restarts,
+                    self.max_restart_backoff,
+                )
+        return exited
+
+    def due_restarts(self) -> list[str]:
+        """Get the keys whose restart is due, and stop tracking them as
+        pending.
+        """
+        now = self.clock()
+        due = [key for key, due in self.pending_restarts.items() if due <= now]
+        for key in due:
+            del self.pending_restarts[key]
+        return due
+
+    def stop(self, keys: list[str]) -> None:
+        """Stop the processes of the keys gracefully, without blocking.
+
+        All the processes are asked to terminate at once. A background
+        thread waits for them to exit, and kills any still running after
+        the stop timeout.
+        """
+        processes = {}
+        for key in keys:
+            self.pending_restarts.pop(key, None)
+            process = self.processes.pop(key, None)
+            if process is not None:
+                processes[key] = process
+                self.stopping[key] = process
+                signal_process_group(process, signal.SIGTERM)
+
+        if processes:
+            stopper = threading.Thread(
+                target=self.wait_or_kill,
+                args=(processes,),
+                name="tilt-stop",
+                daemon=True,
+            )
+            self.stoppers = [
+                thread for thread in self.stoppers if thread.is_alive()
+            ]
+            self.stoppers.append(stopper)
+            stopper.start()
+
+    def wait_or_kill(self, processes: dict[str, subprocess.Popen]) -> None:
+        """Wait for the stopped processes to exit, killing any still running
+        after the stop timeout.
+        """
+        deadline = self.clock() + self.stop_timeout
+        for key, process in processes.items():
+            try:
+                process.wait(timeout=max(deadline - self.clock(), 0))
+            except subprocess.TimeoutExpired:
+                signal_process_group(process, signal.SIGKILL)
+                try:
+                    process.wait(timeout=self.stop_timeout)
+                except subprocess.TimeoutExpired:
+                    pass
+            if self.stopping.get(key) is process:
+                del self.stopping[key]
+
+    def wait_stopped(self) -> None:
+        """Wait until all the stopped processes have exited, or been
+        killed.
+        """
+        for stopper in self.stoppers:
+            stopper.join()
+        self.stoppers = []
+
+
+class AdoptedProcess:
+    """Stands in for the Popen of a process that isn't a child of ttork.
+
+    Its exit can only be noticed, not waited on, and its exit code is
+    unknown, so it's reported as -1.
+    """
+
+    UNKNOWN_EXIT_CODE = -1
+
+    def __init__(self, pid: int) -> None:
+        self.pid = pid
+        self.returncode = None
+
+    def poll(self) -> int:
+        """Check if the process has exited, without blocking."""
+        if self.returncode is None and not is_process_alive(self.pid):
+            self.returncode = self.UNKNOWN_EXIT_CODE
+        return self.returncode
+
+    def wait(self, timeout: float = None) -> int:
+        """Wait for the process to exit, checking periodically."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.poll() is None:
+            if deadline is not None and time.monotonic() >= deadline:
+                raise subprocess.TimeoutExpired(str(self.pid), timeout)
+            time.sleep(0.05)
+        return self.returncode
+
+    def send_signal(self, signum: signal.Signals) -> None:
+        """Send a signal to the process, unless it has exited."""
+        if self.poll() is None:
+            try:
+                os.kill(self.pid, signum)
+            except ProcessLookupError:
+                pass
+
+
+def is_process_alive(pid: int) -> bool:
+    """Check if a process we're allowed to signal is running, and isn't a
+    zombie waiting to be reaped by its parent.
+    """
+    try:
+        os.kill(pid, 0)
+    except (ProcessLookupError, PermissionError):
+        return False
+
+    # Zombies can be signalled, so check the process state where possible
+    try:
+        with open(f"/proc/{pid}/stat", "r") as stat:
+            return stat.read().rpartition(")")[2].split()[0] != "Z"
+    except (OSError, IndexError):
+        return True
+
+
+def get_process_start_time(pid: int) -> int:
+    """Get the start time of a process, in clock ticks since boot, which
+    tells it apart from a later process that reused its pid.
+
+    Returns:
+        int: The start time, or None where it can't be read.
+    """
+    try:
+        with open(f"/proc/{pid}/stat", "r") as stat:
+            # Field 22, counting from the state, which follows the command
+            return int(stat.read().rpartition(")")[2].split()[19])
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def signal_process_group(
+    process: subprocess.Popen, signum: signal.Signals
+) -> None:
+    """Send a signal to the process group led by a process, or just the
+    process, if it doesn't lead a group.
+    """
+    try:
+        os.killpg(process.pid, signum)
+    except ProcessLookupError:
+        process.send_signal(signum)
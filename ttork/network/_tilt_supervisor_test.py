@@ -0,0 +1,155 @@
+"""
+This module is used to test the TiltSupervisor module.
+"""
+
+import subprocess
+import sys
+import time
+import unittest
+
+from ._tilt_service_test import wait_for
+from ._tilt_supervisor import TiltSupervisor, get_process_start_time
+
+
+def start_python(code: str) -> subprocess.Popen:
+    """Start a Python process in its own process group."""
+    return subprocess.Popen(
+        [sys.executable, "-c", code], start_new_session=True
+    )
+
+
+class TestTiltSupervisor(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 100.0
+        self.supervisor = TiltSupervisor(
+            restart=True,
+            max_restarts=2,
+            restart_backoff=2,
+            max_restart_backoff=3,
+            stop_timeout=0.5,
+            clock=lambda: self.now,
+        )
+        self.addCleanup(self.supervisor.wait_stopped)
+        self.addCleanup(lambda: self.supervisor.stop(["a", "b"]))
+
+    def crash(self, key: str) -> dict:
+        process = start_python("raise SystemExit(3)")
+        process.wait()
+        self.supervisor.add(key, process)
+        return self.supervisor.reap()
+
+    def test_reap(self):
+        self.supervisor.add("a", start_python("import time; time.sleep(10)"))
+        self.assertEqual(self.crash("b"), {"b": 3})
+
+        self.assertTrue(self.supervisor.is_running("a"))
+        self.assertFalse(self.supervisor.is_running("b"))
+        self.assertEqual(self.supervisor.reap(), {})
+
+    def test_restart_backoff_and_budget(self):
+        self.crash("a")
+        self.assertEqual(self.supervisor.due_restarts(), [])
+        self.now += 2
+        self.assertEqual(self.supervisor.due_restarts(), ["a"])
+        self.assertEqual(self.supervisor.due_restarts(), [])
+
+        self.crash("a")
+        self.now += 2
+        self.assertEqual(self.supervisor.due_restarts(), [])
+        self.now += 1
+        self.assertEqual(self.supervisor.due_restarts(), ["a"])
+
+        # The budget is spent
+        self.crash("a")
+        self.assertNotIn("a", self.supervisor.pending_restarts)
+
+        self.supervisor.reset("a")
+        self.crash("a")
+        self.assertIn("a", self.supervisor.pending_restarts)
+
+    def test_no_restart(self):
+        self.supervisor.restart = False
+        self.crash("a")
+        self.assertEqual(self.supervisor.pending_restarts, {})
+
+    def test_stop_terminates(self):
+        process = start_python("import time; time.sleep(10)")
+        self.supervisor.add("a", process)
+
+        self.supervisor.stop(["a"])
+        self.assertFalse(self.supervisor.is_running("a"))
+        self.assertTrue(self.supervisor.is_stopping("a"))
+
+        self.supervisor.wait_stopped()
+        self.assertEqual(process.returncode, -15)
+        self.assertFalse(self.supervisor.is_stopping("a"))
+
+    def test_stop_kills_after_timeout(self):
+        self.supervisor.clock = time.monotonic
+        process = start_python(
+            "import signal, time;"
+            "signal.signal(signal.SIGTERM, signal.SIG_IGN); time.sleep(10)"
+        )
+        self.supervisor.add("a", process)
+        time.sleep(0.2)
+
+        # Stopping doesn't wait for the process
+        start = time.monotonic()
+        self.supervisor.stop(["a"])
+        self.assertLess(time.monotonic() - start, 0.2)
+        self.assertIsNone(process.poll())
+
+        self.supervisor.wait_stopped()
+        self.assertEqual(process.returncode, -9)
+
+    def test_stop_process_group(self):
+        # The shell's child is stopped along with it
+        process = subprocess.Popen(
+            f"{sys.executable} -c 'import time; time.sleep(10)' & wait",
+            shell=True,
+            start_new_session=True,
+        )
+        self.supervisor.add("a", process)
+        time.sleep(0.2)
+
+        self.supervisor.stop(["a"])
+
+        self.assertTrue(
+            wait_for(
+                lambda: subprocess.run(
+                    ["pgrep", "-g", str(process.pid)],
+                    stdout=subprocess.DEVNULL,
+                ).returncode
+                == 1
+            )
+        )
+
+    def test_stop_cancels_restart(self):
+        self.crash("a")
+        self.supervisor.stop(["a"])
+        self.assertEqual(self.supervisor.pending_restarts, {})
+
+
+class TestProcessStartTime(unittest.TestCase):
+
+    def test_get_process_start_time(self):
+        first = start_python("import time; time.sleep(10)")
+        self.addCleanup(first.wait)
+        self.addCleanup(first.kill)
+        time.sleep(0.05)
+        second = start_python("import time; time.sleep(10)")
+        self.addCleanup(second.wait)
+        self.addCleanup(second.kill)
+
+        self.assertLess(
+            get_process_start_time(first.pid),
+            get_process_start_time(second.pid),
+        )
+        first.kill()
+        first.wait()
+        self.assertIsNone(get_process_start_time(first.pid))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, NamedTuple
+
+
+class TeardownResult(NamedTuple):
+    """Progress of a single project's 'tilt down'."""
+
+    state: str
+    exit_code: int = None
+    duration: float = 0.0
+
+
+class TiltTeardown:
+    """Runs 'tilt down' for projects in parallel, tracking the progress and
+    exit code of each.
+
+    Each command runs to completion (or timeout) in a worker thread, so all
+    the child processes are waited on and reaped.
+    """
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+    def __init__(
+        self,
+        max_parallel: int,
+        timeout: float,
+        on_progress: Callable[[str, TeardownResult], None],
+    ) -> None:
+        self.timeout = timeout
+        self.on_progress = on_progress
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_parallel, thread_name_prefix="tilt-down"
+        )
+        self.results = {}
+        self.results_lock = threading.Lock()
+
+    @property
+    def active(self) -> bool:
+        """True while any teardown is queued or running."""
+        with self.results_lock:
+            return any(
+                result.state in (self.QUEUED, self.RUNNING)
+                for result in self.results.values()
+            )
+
+    def submit(
+        self, project_key: str, command: list[str], cwd: str, env: dict
+    ) -> None:
+        """Queue the teardown command for a project."""
+        self.set_result(project_key, TeardownResult(self.QUEUED))
+        self.executor.submit(self.run, project_key, command, cwd, env)
+
+    def hold(self, project_key: str) -> None:
+        """Mark a project's teardown as queued, before its command can be
+        submitted.
+        """
+        self.set_result(project_key, TeardownResult(self.QUEUED))
+
+    def run(
+        self, project_key: str, command: list[str], cwd: str, env: dict
+    ) -> None:
+        """Run the teardown command, and record its result."""
+        self.set_result(project_key, TeardownResult(self.RUNNING))
+        start = time.monotonic()
+        try:
+            exit_code = subprocess.run(
+                command,
+                cwd=cwd,
+                env=env,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=self.timeout,
+            ).returncode
+        except (OSError, subprocess.TimeoutExpired):
+            exit_code = None
+
+        self.set_result(
+            project_key,
+            TeardownResult(
+                self.DONE if exit_code == 0 else self.FAILED,
+                exit_code,
+                time.monotonic() - start,
+            ),
+        )
+
+    def set_result(self, project_key: str, result: TeardownResult) -> None:
+        """Record the progress of a project's teardown."""
+        with self.results_lock:
+            self.results[project_key] = result
+        self.on_progress(project_key, result)
+
+    def shutdown(self) -> None:
+        """Cancel queued teardowns, running ones are left to finish."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
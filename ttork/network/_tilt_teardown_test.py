@@ -0,0 +1,94 @@
+"""
+This module is used to test the TiltTeardown module.
+"""
+
+import os
+import threading
+import time
+import unittest
+
+from ._tilt_teardown import TiltTeardown
+
+
+class TestTiltTeardown(unittest.TestCase):
+
+    def setUp(self):
+        self.progress = []
+        self.progress_lock = threading.Lock()
+
+    def on_progress(self, project_key, result):
+        with self.progress_lock:
+            self.progress.append((project_key, result.state))
+
+    def make_teardown(self, max_parallel=4, timeout=5):
+        teardown = TiltTeardown(max_parallel, timeout, self.on_progress)
+        self.addCleanup(teardown.shutdown)
+        return teardown
+
+    def wait_until_done(self, teardown, timeout=5):
+        deadline = time.monotonic() + timeout
+        while teardown.active and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertFalse(teardown.active)
+
+    def submit(self, teardown, project_key, script):
+        teardown.submit(
+            project_key, ["sh", "-c", script], os.getcwd(), os.environ.copy()
+        )
+
+    def test_exit_codes(self):
+        teardown = self.make_teardown()
+        self.submit(teardown, "ok", "exit 0")
+        self.submit(teardown, "bad", "exit 3")
+
+        self.wait_until_done(teardown)
+
+        self.assertEqual(teardown.results["ok"].state, "done")
+        self.assertEqual(teardown.results["ok"].exit_code, 0)
+        self.assertEqual(teardown.results["bad"].state, "failed")
+        self.assertEqual(teardown.results["bad"].exit_code, 3)
+
+    def test_runs_in_parallel(self):
+        teardown = self.make_teardown(max_parallel=4)
+        start = time.monotonic()
+        for index in range(4):
+            self.submit(teardown, f"project{index}", "sleep 0.3")
+
+        self.wait_until_done(teardown)
+
+        self.assertLess(time.monotonic() - start, 1.0)
+        for result in teardown.results.values():
+            self.assertGreaterEqual(result.duration, 0.3)
+
+    def test_max_parallel(self):
+        teardown = self.make_teardown(max_parallel=1)
+        self.submit(teardown, "first", "sleep 0.2")
+        self.submit(teardown, "second", "exit 0")
+
+        self.wait_until_done(teardown)
+
+        self.assertLess(
+            self.progress.index(("first", "done")),
+            self.progress.index(("second", "running")),
+        )
+
+    def test_timeout(self):
+        teardown = self.make_teardown(timeout=0.2)
+        self.submit(teardown, "hung", "sleep 5")
+
+        self.wait_until_done(teardown)
+
+        self.assertEqual(teardown.results["hung"].state, "failed")
+        self.assertIsNone(teardown.results["hung"].exit_code)
+
+    def test_missing_command(self):
+        teardown = self.make_teardown()
+        teardown.submit("missing", ["/no/such/tilt"], os.getcwd(), {})
+
+        self.wait_until_done(teardown)
+
+        self.assertEqual(teardown.results["missing"].state, "failed")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+import json
+import threading
+import websocket
+from typing import Callable
+
+from ttork.models import TiltResource
+from ._tilt_log_tail import TiltLogTail
+
+
+class TiltViewStream:
+    """Keeps a live copy of a Tilt instance's resources, using the Tilt
+    websocket view stream, and optionally tails its logs.
+
+    The first message on the stream is the complete view, after which Tilt
+    only sends the resources that have changed. The stream runs in its own
+    thread, and reconnects automatically if the Tilt instance goes away.
+    """
+
+    def __init__(
+        self,
+        port: int,
+        on_change: Callable[[list], None],
+        on_disconnect: Callable[[], None],
+        log_tail: TiltLogTail = None,
+        connect_timeout: float = 0.5,
+        retry_interval: float = 2.0,
+    ) -> None:
+        self.port = port
+        self.url = f"ws://localhost:{port}/ws/view"
+        self.on_change = on_change
+        self.on_disconnect = on_disconnect
+        self.log_tail = log_tail
+        self.connect_timeout = connect_timeout
+        self.retry_interval = retry_interval
+
+        # Resource projections by name, in the order Tilt reported them
+        self.resources = {}
+        self.connected = False
+        self.ws = None
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(
+            target=self.run,
+            name=f"tilt-stream-{port}",
+            daemon=True,
+        )
+
+    def start(self) -> None:
+        """Start following the view stream in a background thread."""
+        self.thread.start()
+
+    def stop(self) -> None:
+        """Stop following the view stream, and close the connection."""
+        self.stopped.set()
+        ws = self.ws
+        if ws is not None:
+            ws.abort()
+
+    def run(self) -> None:
+        """Connect, and apply view updates until stopped."""
+        while not self.stopped.is_set():
+            try:
+                self.ws = websocket.create_connection(
+                    self.url, timeout=self.connect_timeout
+                )
+            except Exception:
+                self.stopped.wait(self.retry_interval)
+                continue
+
+            try:
+                # Updates only arrive when something changes, so block
+                # indefinitely between messages.
+                self.ws.settimeout(None)
+                while not self.stopped.is_set():
+                    message = self.ws.recv()
+                    if not message:
+                        break
+                    view = json.loads(message)
+                    if self.apply_view(view):
+                        self.on_change(list(self.resources.values()))
+                    if self.log_tail is not None:
+                        self.log_tail.apply_view(view)
+                    self.ack_view(view)
+            except Exception:
+                pass
+            finally:
+                self.ws.close()
+                self.ws = None
+                if self.connected:
+                    self.connected = False
+                    self.on_disconnect()
+
+            self.stopped.wait(self.retry_interval)
+
+    def apply_view(self, view: dict) -> bool:
+        """Merge a view message into the current resources.
+
+        Returns:
+            bool: True if the projected resources have changed
+        """
+        changed = False
+        if view.get("isComplete", False):
+            self.resources = {}
+            self.connected = True
+            changed = True
+        elif not self.connected:
+            # Partial updates are meaningless without the complete view
+            return False
+
+        for resource in view.get("uiResources") or []:
+            name = resource.get("metadata", {}).get("name")
+            if name is None:
+                continue
+            if resource["metadata"].get("deletionTimestamp"):
+                if name in self.resources:
+                    del self.resources[name]
+                    changed = True
+            else:
+                projection = TiltResource.from_ui_resource(resource)
+                if self.resources.get(name) != projection:
+                    self.resources[name] = projection
+                    changed = True
+
+        return changed
+
+    def ack_view(self, view: dict) -> None:
+        """Acknowledge the logs received in a view message, so Tilt only
+        sends newer log segments.
+        """
+        checkpoint = (view.get("logList") or {}).get("toCheckpoint", 0)
+        if checkpoint > 0:
+            self.ws.send(
+                json.dumps(
+                    {
+                        "toCheckpoint": checkpoint,
+                        "tiltStartTime": view.get("tiltStartTime"),
+                    }
+                )
+            )
@@ -0,0 +1,143 @@
+"""
+This module is used to test the TiltViewStream module, and streamed status
+in the TiltService.
+"""
+
+import threading
+import unittest
+
+import pytest
+
+from ._tilt_log_tail_test import make_log_view
+from ._tilt_service_test import (
+    FakeTiltServer,
+    make_view,
+    wait_for,
+)
+from ._tilt_view_stream import TiltViewStream
+
+
+class TestTiltViewStream(unittest.TestCase):
+
+    def setUp(self):
+        self.server = FakeTiltServer(make_view("api", "db"), streaming=True)
+        self.changes = []
+        self.disconnected = threading.Event()
+        self.stream = TiltViewStream(
+            self.server.port,
+            on_change=self.changes.append,
+            on_disconnect=self.disconnected.set,
+            retry_interval=0.05,
+        )
+        self.stream.start()
+        self.assertTrue(wait_for(lambda: self.stream.connected))
+
+    def tearDown(self):
+        self.stream.stop()
+        self.server.stop()
+
+    def test_complete_view(self):
+        self.assertEqual(list(self.stream.resources), ["api", "db"])
+        self.assertEqual(len(self.changes), 1)
+
+    def test_incremental_update(self):
+        self.server.push(make_view("db", status="in_progress"))
+
+        self.assertTrue(wait_for(lambda: len(self.changes) == 2))
+        self.assertEqual(list(self.stream.resources), ["api", "db"])
+        self.assertEqual(
+            self.stream.resources["db"].update_status,
+            "in_progress",
+        )
+
+    def test_unchanged_update_ignored(self):
+        self.server.push(make_view("api"))
+        self.server.push(make_view("db", status="error"))
+
+        self.assertTrue(wait_for(lambda: len(self.changes) == 2))
+        self.assertEqual(self.changes[-1][1].update_status, "error")
+
+    def test_deleted_resource(self):
+        deleted = make_view("api")
+        deleted["uiResources"][0]["metadata"]["deletionTimestamp"] = "now"
+        self.server.push(deleted)
+
+        self.assertTrue(wait_for(lambda: len(self.changes) == 2))
+        self.assertEqual(list(self.stream.resources), ["db"])
+
+    def test_disconnect(self):
+        self.server.streaming = False
+        self.server.drop_clients()
+
+        self.assertTrue(self.disconnected.wait(2))
+        self.assertFalse(self.stream.connected)
+
+
+@pytest.mark.usefixtures("tilt_services")
+class TestTiltServiceStreaming(unittest.TestCase):
+
+    def setUp(self):
+        self.server = self.start_server(make_view("api"), streaming=True)
+        self.service = self.make_service(1, statusMode="stream")
+        self.notified = threading.Event()
+        self.service.on_status_change = self.notified.set
+        self.pinfo = self.service.status_info["/path/0/Tiltfile"]
+        self.pinfo["port"] = self.server.port
+
+    def test_streamed_status(self):
+        self.service.update_status_info()
+
+        self.assertTrue(
+            wait_for(lambda: self.service.is_streaming("/path/0/Tiltfile"))
+        )
+        self.assertTrue(self.pinfo["service_online"])
+
+        self.notified.clear()
+        self.server.push(make_view("api", status="error"))
+
+        self.assertTrue(self.notified.wait(2))
+        self.assertEqual(self.pinfo["resources"][0].update_status, "error")
+
+    def test_streaming_skips_polling(self):
+        self.service.update_status_info()
+        self.assertTrue(
+            wait_for(lambda: self.service.is_streaming("/path/0/Tiltfile"))
+        )
+        connections = self.server.connections
+
+        self.service.update_status_info()
+
+        self.assertEqual(self.server.connections, connections)
+        self.assertTrue(self.pinfo["service_online"])
+
+    def test_streamed_logs(self):
+        self.service.update_status_info()
+        self.assertTrue(
+            wait_for(lambda: self.service.is_streaming("/path/0/Tiltfile"))
+        )
+
+        self.server.push(make_log_view(("api", "a1\n"), ("api", "a2\n")))
+        self.server.push(make_log_view(("api", "a3\n"), from_checkpoint=2))
+
+        self.assertTrue(
+            wait_for(
+                lambda: self.service.get_tilt_logs("/path/0/Tiltfile")[0] == 3
+            )
+        )
+        self.assertEqual(
+            self.service.get_tilt_logs("/path/0/Tiltfile", since=2),
+            (3, [("api", "a3")]),
+        )
+
+    def test_polling_fallback(self):
+        # Tilt instances without the stream are polled instead
+        self.server.streaming = False
+
+        self.service.update_status_info()
+
+        self.assertFalse(self.service.is_streaming("/path/0/Tiltfile"))
+        self.assertTrue(self.pinfo["service_online"])
+
+
+if __name__ == "__main__":
+    unittest.main()
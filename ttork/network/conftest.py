@@ -0,0 +1,58 @@
+"""
+Fixtures shared by the TiltService tests.
+"""
+
+import logging
+
+import pytest
+
+from ._tilt_service import TiltService
+from ._tilt_service_test import (
+    FakeTiltServer,
+    make_config,
+    make_fake_tilt_config,
+)
+
+
+@pytest.fixture
+def tilt_services(request, tmp_path):
+    """Give a test case helpers to start fake Tilt servers, and TiltServices
+    with their state in a temporary directory. The servers are stopped, and
+    the services cleaned up, after the test.
+    """
+    test = request.instance
+    servers = []
+    services = []
+
+    def start_server(
+        view: dict, delay: float = 0.0, streaming: bool = False
+    ) -> FakeTiltServer:
+        server = FakeTiltServer(view, delay, streaming)
+        servers.append(server)
+        return server
+
+    def make_service(
+        count: int = 1, config: dict = None, **tilt_config
+    ) -> TiltService:
+        if config is None:
+            config = test.make_config(count, **tilt_config)
+        service = TiltService(config, test.log)
+        services.append(service)
+        return service
+
+    test.log = logging.getLogger("ttork.test")
+    test.tmp_path = tmp_path
+    test.start_server = start_server
+    test.make_service = make_service
+    test.make_config = lambda count, **tilt_config: make_config(
+        count, tmp_path, **tilt_config
+    )
+    test.make_fake_tilt_config = lambda script, **project: (
+        make_fake_tilt_config(tmp_path, script, **project)
+    )
+    yield
+
+    for service in services:
+        service.cleanup()
+    for server in servers:
+        server.stop()
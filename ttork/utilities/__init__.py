@@ -1,10 +1,15 @@
 from __future__ import annotations
 
 from ._config import read_yaml_config, is_valid_config
-from ._time import format_age
+from ._time import format_age, parse_timestamp
+from ._json import read_json_response, read_json_pages, read_json_items
 
 __all__ = [
     "read_yaml_config",
     "format_age",
+    "parse_timestamp",
+    "read_json_response",
+    "read_json_pages",
+    "read_json_items",
     "is_valid_config",
 ]
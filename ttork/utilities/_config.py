@@ -42,6 +42,8 @@ def is_valid_config(config_data):
     if "namespace" not in config_data["k8s"]:
         print("Error: 'namespace' missing from 'k8s' section.")
         return False
+    if not is_valid_views(config_data["k8s"].get("views", [])):
+        return False
     if len(config_data["projects"]) == 0:
         print("Error: No projects defined in 'projects' section.")
         return False
@@ -52,4 +54,79 @@ def is_valid_config(config_data):
         if "tiltFilePath" not in project:
             print("Error: 'tiltFilePath' missing from project definition.")
             return False
+    return is_valid_dependencies(config_data["projects"])
+
+
+def is_valid_views(views):
+    """
+    Validate the 'views' of other Kubernetes resource kinds.
+
+    Parameters:
+        views (list): View definitions from the 'k8s' section.
+
+    Returns:
+        bool: True if each view has a unique name, an apiVersion and a
+            resource.
+    """
+    names = {"Deployments", "Pods", "Containers", "Logs"}
+    for view in views:
+        for key in ("name", "apiVersion", "resource"):
+            if key not in view:
+                print(f"Error: '{key}' missing from view definition.")
+                return False
+        if view["name"] in names:
+            print(f"Error: View name '{view['name']}' is already used.")
+            return False
+        names.add(view["name"])
+    return True
+
+
+def is_valid_dependencies(projects):
+    """
+    Validate the 'dependsOn' project dependencies.
+
+    Parameters:
+        projects (list): Project definitions from the configuration.
+
+    Returns:
+        bool: True if all dependencies exist, and there are no cycles.
+    """
+    dependencies = {}
+    for project in projects:
+        depends_on = project.get("dependsOn", [])
+        if not isinstance(depends_on, list):
+            print(f"Error: 'dependsOn' of '{project['name']}' must be a list.")
+            return False
+        dependencies.setdefault(project["name"], set()).update(depends_on)
+
+    for name, depends_on in dependencies.items():
+        for dependency in depends_on:
+            if dependency not in dependencies:
+                print(
+                    f"Error: '{name}' depends on undefined project "
+                    f"'{dependency}'."
+                )
+                return False
+
+    # Depth-first search for cycles
+    visited = set()
+    for name in dependencies:
+        path = [(name, iter(dependencies[name]))]
+        on_path = {name}
+        while path:
+            current, remaining = path[-1]
+            dependency = next(remaining, None)
+            if dependency is None:
+                visited.add(current)
+                on_path.discard(current)
+                path.pop()
+            elif dependency in on_path:
+                print(
+                    f"Error: Circular dependency between '{current}' and "
+                    f"'{dependency}'."
+                )
+                return False
+            elif dependency not in visited:
+                on_path.add(dependency)
+                path.append((dependency, iter(dependencies[dependency])))
     return True
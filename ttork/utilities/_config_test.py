@@ -101,6 +101,104 @@ class TestYamlConfig(unittest.TestCase):
         }
         self.assertFalse(is_valid_config(config_data))
 
+    def test_is_valid_config_dependencies(self):
+        config_data = {
+            "k8s": {"context": "test", "namespace": "default"},
+            "projects": [
+                {"name": "db", "tiltFilePath": "/path/to/db"},
+                {
+                    "name": "api",
+                    "tiltFilePath": "/path/to/api",
+                    "dependsOn": ["db"],
+                },
+                {
+                    "name": "web",
+                    "tiltFilePath": "/path/to/web",
+                    "dependsOn": ["api", "db"],
+                },
+            ],
+        }
+        self.assertTrue(is_valid_config(config_data))
+
+    def test_is_valid_config_undefined_dependency(self):
+        config_data = {
+            "k8s": {"context": "test", "namespace": "default"},
+            "projects": [
+                {
+                    "name": "api",
+                    "tiltFilePath": "/path/to/api",
+                    "dependsOn": ["db"],
+                },
+            ],
+        }
+        self.assertFalse(is_valid_config(config_data))
+
+    def test_is_valid_config_circular_dependency(self):
+        config_data = {
+            "k8s": {"context": "test", "namespace": "default"},
+            "projects": [
+                {
+                    "name": "db",
+                    "tiltFilePath": "/path/to/db",
+                    "dependsOn": ["web"],
+                },
+                {
+                    "name": "api",
+                    "tiltFilePath": "/path/to/api",
+                    "dependsOn": ["db"],
+                },
+                {
+                    "name": "web",
+                    "tiltFilePath": "/path/to/web",
+                    "dependsOn": ["api"],
+                },
+            ],
+        }
+        self.assertFalse(is_valid_config(config_data))
+
+    def test_is_valid_config_views(self):
+        config_data = {
+            "k8s": {
+                "context": "test",
+                "namespace": "default",
+                "views": [
+                    {
+                        "name": "Services",
+                        "apiVersion": "v1",
+                        "resource": "services",
+                    },
+                ],
+            },
+            "projects": [
+                {"name": "project1", "tiltFilePath": "/path/to/tiltfile"}
+            ],
+        }
+        self.assertTrue(is_valid_config(config_data))
+
+        config_data["k8s"]["views"].append(
+            {"name": "Jobs", "apiVersion": "batch/v1"}
+        )
+        self.assertFalse(is_valid_config(config_data))
+
+    def test_is_valid_config_duplicate_view(self):
+        config_data = {
+            "k8s": {
+                "context": "test",
+                "namespace": "default",
+                "views": [
+                    {
+                        "name": "Pods",
+                        "apiVersion": "v1",
+                        "resource": "pods",
+                    },
+                ],
+            },
+            "projects": [
+                {"name": "project1", "tiltFilePath": "/path/to/tiltfile"}
+            ],
+        }
+        self.assertFalse(is_valid_config(config_data))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,46 @@
+import json
+
+
+def read_json_response(response) -> dict:
+    """Decode the body of an API response requested with
+    _preload_content=False, skipping the client's model deserialization, and
+    return its connection to the pool.
+    """
+    try:
+        return json.loads(response.data)
+    finally:
+        response.release_conn()
+
+
+def read_json_pages(list_func, page_size: int = None, **kwargs):
+    """Read a list from the API a page of page_size items at a time (all at
+    once if not set), following the continue token of each page, so only
+    one page is held in memory at a time.
+
+    Yields:
+        dict: the decoded JSON of each page
+    """
+    continue_token = None
+    while True:
+        page = read_json_response(
+            list_func(
+                limit=page_size or None,
+                _continue=continue_token,
+                _preload_content=False,
+                **kwargs,
+            )
+        )
+        yield page
+        continue_token = (page.get("metadata") or {}).get("continue")
+        if not continue_token:
+            return
+
+
+def read_json_items(list_func, page_size: int = None, **kwargs):
+    """Read the items of a list from the API, a page at a time.
+
+    Yields:
+        dict: the decoded JSON of each item
+    """
+    for page in read_json_pages(list_func, page_size, **kwargs):
+        yield from page.get("items") or []
@@ -1,3 +1,6 @@
+from datetime import datetime
+
+
 def format_age(seconds: int) -> str:
     """Format the age of a resource in seconds to a human readable string.
 
@@ -16,3 +19,10 @@ def format_age(seconds: int) -> str:
         return f"{minutes:}m:{seconds:02}s"
     else:
         return f"{seconds:02}s"
+
+
+def parse_timestamp(timestamp: str) -> datetime:
+    """Parse a timestamp from the raw JSON of a Kubernetes resource, such as
+    2024-06-15T12:00:00Z, into a timezone aware datetime.
+    """
+    return datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
@@ -1,6 +1,8 @@
 import unittest
 
-from ._time import format_age
+from datetime import datetime, timezone
+
+from ._time import format_age, parse_timestamp
 
 
 class TestFormatAge(unittest.TestCase):
@@ -34,5 +36,14 @@ class TestFormatAge(unittest.TestCase):
         self.assertEqual(format_age(60), "1m:00s")  # 1 minute
 
 
+class TestParseTimestamp(unittest.TestCase):
+
+    def test_parse_timestamp(self):
+        self.assertEqual(
+            parse_timestamp("2024-06-15T12:00:05Z"),
+            datetime(2024, 6, 15, 12, 0, 5, tzinfo=timezone.utc),
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -5,6 +5,8 @@ from ._k8s_resource_table import K8sResourceTable
 from ._resource_text_area import ResourceTextArea
 from ._confirmation_dialog import ConfirmationDialog
 from ._k8s_container_logs import ContainerLogs
+from ._tilt_process_logs import TiltProcessLogs
+from ._tilt_logs import TiltLogs
 
 __all__ = [
     "TiltStatusTree",
@@ -12,4 +14,6 @@ __all__ = [
     "ResourceTextArea",
     "ConfirmationDialog",
     "ContainerLogs",
+    "TiltProcessLogs",
+    "TiltLogs",
 ]
@@ -1,4 +1,7 @@
+from functools import partial
 from textual.widgets import Log
+from textual.worker import get_current_worker
+from ttork.models import K8sContainers
 
 
 class ContainerLogs(Log):
@@ -12,6 +15,7 @@ class ContainerLogs(Log):
         self.visible = False
         self.pod_name = ""
         self.container_name = ""
+        self.log_worker = None
         self.set_interval(2, self.update_loginfo)
 
     def show(self, pod_name: str, container_name: str) -> None:
@@ -20,7 +24,7 @@ class ContainerLogs(Log):
         self.pod_name = pod_name
         self.container_name = container_name
         self.log.debug(f"Showing logs for {container_name} in {pod_name}.")
-        self.update_loginfo()
+        self.update_loginfo(force=True)
         self.focus()
 
     def hide(self) -> None:
@@ -31,18 +35,53 @@ class ContainerLogs(Log):
         self.app.query_one("#k8s-resource-table").focus()
         self.clear()
 
-    def update_loginfo(self) -> None:
+    def update_loginfo(self, force: bool = False) -> None:
+        """Fetch the latest logs in a background worker, unless a fetch is
+        already in flight (or force is set, for another container).
+        """
         if self.visible and self.pod_name and self.container_name:
-            log_data = (
-                self.app.query_one("#k8s-resource-table")
-                .k8s_service.resources["Containers"]
-                .get_container_logs(self.container_name, self.pod_name)
+            if not force and self.log_worker and self.log_worker.is_running:
+                return
+            containers = self.app.query_one(
+                "#k8s-resource-table"
+            ).k8s_service.resources["Containers"]
+            self.log_worker = self.run_worker(
+                partial(
+                    self.fetch_logs,
+                    containers,
+                    self.pod_name,
+                    self.container_name,
+                ),
+                name="container-logs",
+                group="container-logs",
+                exclusive=True,
+                thread=True,
+                exit_on_error=False,
             )
-            self.clear()
-            if log_data:
-                self.write(log_data, scroll_end=True)
-            else:
-                self.write("No logs available.", scroll_end=True)
+
+    def fetch_logs(
+        self, containers: K8sContainers, pod_name: str, container_name: str
+    ) -> None:
+        """Fetch a container's logs from a worker thread, and hand them to
+        the UI thread.
+        """
+        log_data = containers.get_container_logs(container_name, pod_name)
+        if not get_current_worker().is_cancelled:
+            self.app.call_from_thread(
+                self.show_logs, pod_name, container_name, log_data
+            )
+
+    def show_logs(
+        self, pod_name: str, container_name: str, log_data: str
+    ) -> None:
+        """Show fetched logs, if they're still for the container shown."""
+        if (pod_name, container_name) != (self.pod_name, self.container_name):
+            return
+        self.clear()
+        if log_data:
+            self.write(log_data, scroll_end=True)
+        else:
+            self.write("No logs available.", scroll_end=True)
 
     def action_close_logs(self) -> None:
         """Close the logs display."""
@@ -1,9 +1,11 @@
 import copy
+from functools import partial
 from rich.text import Text
 from textual.app import ComposeResult
 from textual.widgets import DataTable
 from textual.binding import _Bindings
 from textual.message import Message
+from textual.worker import Worker, WorkerState, get_current_worker
 from ttork.network import K8sService
 from ._confirmation_dialog import ConfirmationDialog
 
@@ -15,6 +17,12 @@ KRT_STYLE_MAP = {
     "terminating": "magenta",
 }
 
+# Minimum number of rows of a screen, used before the table has a size
+MIN_SCREEN_ROWS = 20
+
+# Number of screens of rows added to the table at a time
+ROW_WINDOW_SCREENS = 5
+
 
 class K8sResourceTable(DataTable):
     """K8sResourceTable is a DataTable that displays a list of Kubernetes
@@ -24,6 +32,7 @@ class K8sResourceTable(DataTable):
     base_bindings = _Bindings()
     BINDINGS = [
         ("escape", "show_previous", "Previous"),
+        ("v", "next_view", "Next View"),
     ]
 
     class DeleteResource(Message):
@@ -35,6 +44,11 @@ class K8sResourceTable(DataTable):
             self.bubble = True
             super().__init__()
 
+    class StatusChanged(Message):
+        """StatusChanged is a Message that signals a watched Kubernetes
+        resource change.
+        """
+
     def compose(self) -> ComposeResult:
         """Compose the K8sResourceTable."""
         yield from super().compose()
@@ -46,10 +60,29 @@ class K8sResourceTable(DataTable):
         self.cursor_type = "row"
         self.zebra_stripes = True
         self.k8s_service = K8sService(self.app.ttork_config, self.log)
-        self.k8s_service.update_cluster_status()
+
+        # Watched changes arrive on a background thread, and post_message
+        # is thread safe.
+        self.k8s_service.on_status_change = lambda: self.post_message(
+            self.StatusChanged()
+        )
         self.resource_view = "Deployments"
+        self.k8s_service.subscribe(self.resource_view)
         self.crumbs = ["Deployments"]
         self.available_width = 0
+
+        # Only a window of the resource's rows, around the cursor, is added
+        # to the table. The index of its first row in the resource's rows.
+        self.row_offset = 0
+        self.restoring_scroll = False
+
+        # The cluster is queried by a worker thread. Each forced refresh
+        # starts a new generation, and results from older generations are
+        # discarded.
+        self.refresh_worker = None
+        self.refresh_generation = 0
+        self.refresh_queued = False
+        self.status_version = 0
         self.update_cinfo(force_refresh=True)
         self.set_interval(2, self.update_cinfo)
         self.base_bindings = self._merged_bindings.copy()
@@ -61,13 +94,17 @@ class K8sResourceTable(DataTable):
         show_view=None,
         label_selector=None,
     ) -> None:
-        """Update the cluster status information."""
-        k8s_data_old = self.k8s_service.get_k8s_data()
+        """Update the cluster status information.
 
+        The cluster is queried in a background worker, so a slow API server
+        never blocks the UI, and the table is updated once the results are
+        in. A forced refresh (such as showing another view) supersedes the
+        refresh in flight, while other refreshes wait for it to finish.
+        """
         # Set the view
         if show_view:
             tmp_view = copy.copy(self.resource_view)
-            self.resource_view = show_view
+            self.set_resource_view(show_view)
             self.previous_view = tmp_view
 
         # Apply label_selector, if defined (will persist across updates)
@@ -76,20 +113,105 @@ class K8sResourceTable(DataTable):
                 self.resource_view, label_selector
             )
 
+        if force_refresh:
+            self.refresh_generation += 1
+            self.refresh_queued = False
+        elif (
+            self.refresh_worker is not None and self.refresh_worker.is_running
+        ):
+            self.refresh_queued = True
+            return
+
         # Update the cluster status
+        self.refresh_worker = self.run_worker(
+            partial(
+                self.refresh_cluster_status,
+                self.refresh_generation,
+                self.status_version,
+                force_refresh,
+                reset_cursor,
+            ),
+            name="k8s-refresh",
+            group="k8s-refresh",
+            exclusive=True,
+            thread=True,
+            exit_on_error=False,
+        )
+
+    def refresh_cluster_status(
+        self,
+        generation: int,
+        status_version: int,
+        force_refresh: bool,
+        reset_cursor: bool,
+    ) -> None:
+        """Query the cluster from a worker thread, and hand the results to
+        the UI thread.
+        """
         self.k8s_service.update_cluster_status()
+        version, changed = self.k8s_service.changed_since(status_version)
+
+        if not get_current_worker().is_cancelled:
+            self.app.call_from_thread(
+                self.apply_cluster_status,
+                generation,
+                version,
+                force_refresh or self.resource_view in changed,
+                reset_cursor,
+            )
+
+    def apply_cluster_status(
+        self,
+        generation: int,
+        status_version: int,
+        changed: bool,
+        reset_cursor: bool,
+    ) -> None:
+        """Show the results of a refresh, unless a newer refresh has
+        superseded it.
+        """
+        if generation != self.refresh_generation:
+            return
+        self.status_version = status_version
 
         if reset_cursor:
+            self.row_offset = 0
             self.move_cursor(row=0)
+            self.scroll_home(animate=False)
 
-        if k8s_data_old != self.k8s_service.get_k8s_data() or force_refresh:
+        if changed:
             self.set_data()
 
+    def on_worker_state_changed(self, event: Worker.StateChanged) -> None:
+        """Run the refresh that was waiting for the last one to finish."""
+        if event.worker is not self.refresh_worker or event.state not in (
+            WorkerState.SUCCESS,
+            WorkerState.ERROR,
+        ):
+            return
+        if event.state == WorkerState.ERROR:
+            self.log.error(f"Unable to refresh: {event.worker.error}")
+        if self.refresh_queued:
+            self.refresh_queued = False
+            self.update_cinfo()
+
+    def set_resource_view(self, view: str) -> None:
+        """Show the specified resource type, and only refresh that one."""
+        self.k8s_service.unsubscribe(self.resource_view)
+        self.resource_view = view
+        self.k8s_service.subscribe(view)
+
+    def on_k8s_resource_table_status_changed(
+        self, message: StatusChanged
+    ) -> None:
+        """Handle a watched Kubernetes resource change."""
+        self.update_cinfo()
+
     def set_border_title(self) -> None:
         """Set the border title for the K8sResourceTable."""
-        resource_data = self.k8s_service.resources[
-            self.resource_view
-        ].get_resource_data()
+        resource_data = self.k8s_service.get_resource_data(
+            self.resource_view, refresh=False
+        )
 
         selected = self.k8s_service.get_label_selector(self.resource_view)
 
@@ -100,11 +222,30 @@ class K8sResourceTable(DataTable):
             (f"<{selected}>", "orange") if selected else "",
         )
 
-    def set_data(self, available_width: int = 0):
-        """Set the data for the K8sResourceTable."""
+    def set_data(self, available_width: int = 0, follow_scroll: bool = False):
+        """Set the data for the K8sResourceTable.
 
-        # Save the current cursor position (highlighted row)
-        current_cursor = self.cursor_row
+        The window of rows is centered on the cursor, or with follow_scroll,
+        on the rows on screen, moving the cursor onto one of them.
+        """
+
+        # Get resource data for the current view, as last refreshed. It's
+        # never fetched here, so the UI doesn't wait on the cluster.
+        resource_data = self.k8s_service.get_resource_data(
+            self.resource_view, refresh=False
+        )
+        if resource_data is None:
+            return
+
+        # Save the current cursor position (highlighted row), and the row at
+        # the top of the screen, as indices into the resource's rows
+        current_cursor = self.row_offset + self.cursor_row
+        top_row = self.row_offset + round(self.scroll_y)
+        if follow_scroll:
+            current_cursor = max(
+                top_row,
+                min(current_cursor, top_row + self.get_visible_rows() - 1),
+            )
 
         # Clear existing values
         self.clear(True)
@@ -115,11 +256,6 @@ class K8sResourceTable(DataTable):
         if available_width > 0:
             self.available_width = available_width
 
-        # Get resource data for the current view
-        resource_data = self.k8s_service.resources[
-            self.resource_view
-        ].get_resource_data()
-
         # Dynamically update the key bindings to be resource type specific
         if resource_data.bindings:
             self._bindings = self._bindings.merge(
@@ -156,8 +292,19 @@ class K8sResourceTable(DataTable):
                 width = col_min_width
             self.add_column(col_name, width=width)
 
+        # Only the rows in and near the viewport are added, as styled cells,
+        # so the cost of a refresh depends on the screen height rather than
+        # the number of resources.
+        window = ROW_WINDOW_SCREENS * self.get_screen_rows()
+        current_cursor = max(0, min(current_cursor, len(resource_data) - 1))
+        self.row_offset = max(
+            0, min(current_cursor - window // 2, len(resource_data) - window)
+        )
+
         # Style rows individually based on values
-        for row in resource_data:
+        for row in resource_data.data[
+            self.row_offset : self.row_offset + window
+        ]:
             styled_row = []
             for index, cell in enumerate(row["values"]):
                 styled_row.append(
@@ -171,8 +318,67 @@ class K8sResourceTable(DataTable):
                 )
             self.add_row(*styled_row)
 
-        # Restore the cursor position (highlighted row)
-        self.move_cursor(row=current_cursor)
+        # Restore the cursor position (highlighted row), and keep the same
+        # rows on screen
+        self.move_cursor(row=current_cursor - self.row_offset, scroll=False)
+        self.restoring_scroll = True
+        self.call_after_refresh(self.restore_scroll, top_row - self.row_offset)
+
+    def restore_scroll(self, y: int) -> None:
+        """Scroll back to the rows that were on screen, once the table has
+        been refreshed with a new window of rows.
+        """
+        self.scroll_to(y=y, animate=False)
+        self.restoring_scroll = False
+
+    def get_screen_rows(self) -> int:
+        """Get the number of rows that fit on the screen."""
+        return max(self.size.height, MIN_SCREEN_ROWS)
+
+    def get_visible_rows(self) -> int:
+        """Get the number of rows currently on screen, under the header."""
+        return max(
+            self.scrollable_content_region.height - self.header_height, 1
+        )
+
+    def watch_scroll_y(self, old_value: float, new_value: float) -> None:
+        """Move the window of rows along with the viewport, once it's
+        scrolled (with the mouse wheel or the scrollbar) within a screen of
+        either end of it.
+        """
+        super().watch_scroll_y(old_value, new_value)
+        if self.row_count == 0 or self.restoring_scroll:
+            return
+        resource_data = self.k8s_service.get_resource_data(
+            self.resource_view, refresh=False
+        )
+        if resource_data is None:
+            return
+        top_row = round(new_value)
+        margin = self.get_screen_rows()
+        if (top_row < margin and self.row_offset > 0) or (
+            top_row + self.get_visible_rows() >= self.row_count - margin
+            and self.row_offset + self.row_count < len(resource_data)
+        ):
+            self.set_data(follow_scroll=True)
+
+    def on_data_table_row_highlighted(
+        self, message: DataTable.RowHighlighted
+    ) -> None:
+        """Move the window of rows along with the cursor, once the cursor is
+        within a screen of either end of it.
+        """
+        resource_data = self.k8s_service.get_resource_data(
+            self.resource_view, refresh=False
+        )
+        if resource_data is None:
+            return
+        margin = self.get_screen_rows()
+        if (self.cursor_row < margin and self.row_offset > 0) or (
+            self.cursor_row >= self.row_count - margin
+            and self.row_offset + self.row_count < len(resource_data)
+        ):
+            self.set_data()
 
     def action_select_row(self, view: str) -> None:
         """Generic select resource action for table.
@@ -232,6 +438,24 @@ class K8sResourceTable(DataTable):
             force_refresh=True, reset_cursor=True, show_view=previous
         )
 
+    def action_next_view(self) -> None:
+        """Show the next top-level resource type in the table, such as the
+        views configured in 'k8s.views'.
+        """
+        views = self.k8s_service.views
+        if len(views) == 1:
+            return
+
+        # Leave the drilled down views, and their label selectors
+        for view in self.crumbs[1:]:
+            self.k8s_service.clear_label_selector(view)
+
+        next_view = views[(views.index(self.crumbs[0]) + 1) % len(views)]
+        self.crumbs = [next_view]
+        self.update_cinfo(
+            force_refresh=True, reset_cursor=True, show_view=next_view
+        )
+
     def action_show_description(self) -> None:
         """Show the description of the selected resource."""
         selected_row = self.get_row_at(self.cursor_row)
@@ -288,6 +512,6 @@ class K8sResourceTable(DataTable):
 
     def reset_view(self) -> None:
         """Reset the view to the initial state."""
-        self.resource_view = "Deployments"
+        self.set_resource_view("Deployments")
         self.crumbs = ["Deployments"]
         self.update_cinfo(force_refresh=True, reset_cursor=True)
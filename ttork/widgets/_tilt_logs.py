@@ -0,0 +1,100 @@
+from textual.widgets import Log
+from ttork.network import TiltLogTail
+
+
+class TiltLogs(Log):
+    """Shows the Tilt logs of a project, of all its resources or just
+    one.
+    """
+
+    BINDINGS = [
+        ("escape", "close_logs", "Back to Projects"),
+        ("f", "next_resource", "Filter Resource"),
+    ]
+
+    def on_mount(self) -> None:
+        self.visible = False
+        self.project_key = ""
+        self.project_name = ""
+        self.resource = None
+        self.last_line = 0
+        self.set_interval(1, self.update_logs)
+
+    def show(
+        self, project_key: str, project_name: str, resource: str = None
+    ) -> None:
+        """Show the Tilt logs of a project, optionally filtered to a single
+        resource.
+        """
+        self.visible = True
+        self.project_key = project_key
+        self.project_name = project_name
+        self.log.debug(f"Showing Tilt logs for {project_key}.")
+        self.set_resource(resource)
+        self.focus()
+
+    def hide(self) -> None:
+        """Hide the Tilt logs."""
+        self.visible = False
+        self.project_key = ""
+        self.resource = None
+        self.app.query_one("#tree-view").focus()
+        self.clear()
+
+    def set_resource(self, resource: str) -> None:
+        """Show the logs of a single resource, or of all resources if None,
+        from the start of the buffered logs.
+        """
+        self.resource = resource
+        self.last_line = 0
+        self.max_lines = self.get_log_tail().max_lines
+        self.border_title = "Tilt Logs: {0}{1}".format(
+            self.project_name, f" ({resource})" if resource else ""
+        )
+        self.clear()
+        self.update_logs()
+
+    def update_logs(self) -> None:
+        """Append the lines logged since the last update."""
+        if self.visible and self.project_key:
+            tilt_service = self.app.query_one("#tree-view").tilt_service
+            last_line, lines = tilt_service.get_tilt_logs(
+                self.project_key, self.resource, self.last_line
+            )
+            if last_line == 0:
+                if len(self.lines) == 0:
+                    self.write_line("No logs available.")
+                return
+
+            if self.last_line == 0:
+                # Replace the placeholder
+                self.clear()
+            if self.resource is None:
+                self.write_lines(
+                    (f"{name} | {line}" for name, line in lines),
+                    scroll_end=True,
+                )
+            else:
+                self.write_lines(
+                    (line for _, line in lines),
+                    scroll_end=True,
+                )
+            self.last_line = last_line
+
+    def get_log_tail(self) -> TiltLogTail:
+        """Get the log tail of the project being shown."""
+        tilt_service = self.app.query_one("#tree-view").tilt_service
+        return tilt_service.log_tails[self.project_key]
+
+    def action_next_resource(self) -> None:
+        """Filter the logs to the next resource, or back to all of them."""
+        resources = [None] + self.get_log_tail().get_resource_names()
+        if self.resource in resources:
+            index = resources.index(self.resource) + 1
+        else:
+            index = 0
+        self.set_resource(resources[index % len(resources)])
+
+    def action_close_logs(self) -> None:
+        """Close the Tilt logs display."""
+        self.hide()
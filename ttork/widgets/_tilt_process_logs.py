@@ -0,0 +1,62 @@
+from textual.widgets import Log
+
+
+class TiltProcessLogs(Log):
+    """Shows the captured output of a project's Tilt process."""
+
+    BINDINGS = [
+        ("escape", "close_logs", "Back to Projects"),
+    ]
+
+    def on_mount(self) -> None:
+        self.visible = False
+        self.project_key = ""
+        self.output_line_count = 0
+        self.set_interval(1, self.update_output)
+
+    def show(self, project_key: str, project_name: str) -> None:
+        """Show the output of a project's Tilt process."""
+        tilt_service = self.app.query_one("#tree-view").tilt_service
+        self.clear()
+        self.visible = True
+        self.project_key = project_key
+        self.output_line_count = 0
+        self.max_lines = tilt_service.process_outputs[project_key].lines.maxlen
+        self.border_title = f"Tilt Output: {project_name}"
+        self.log.debug(f"Showing Tilt output for {project_key}.")
+        self.update_output()
+        self.focus()
+
+    def hide(self) -> None:
+        """Hide the Tilt output."""
+        self.visible = False
+        self.project_key = ""
+        self.app.query_one("#tree-view").focus()
+        self.clear()
+
+    def update_output(self) -> None:
+        """Append the lines captured since the last update.
+
+        The output is buffered by the Tilt service, so this only copies the
+        new lines, and never waits on the process.
+        """
+        if self.visible and self.project_key:
+            tilt_service = self.app.query_one("#tree-view").tilt_service
+            line_count, lines = tilt_service.get_process_output(
+                self.project_key, self.output_line_count
+            )
+            if line_count == 0:
+                if len(self.lines) == 0:
+                    self.write_line("No output captured.")
+                return
+
+            if self.output_line_count == 0:
+                # Replace the placeholder
+                self.clear()
+            if lines:
+                self.write_lines(lines, scroll_end=True)
+            self.output_line_count = line_count
+
+    def action_close_logs(self) -> None:
+        """Close the Tilt output display."""
+        self.hide()
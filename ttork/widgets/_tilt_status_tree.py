@@ -1,10 +1,13 @@
 import webbrowser
+import yaml
+from functools import lru_cache
 from rich.text import Text
 from textual.widgets import Tree
+from textual.widgets.tree import TreeNode
 from textual import events
+from textual.message import Message
 from ttork.network import TiltService
 
-
 TILT_STATUS_ICONS = dict(
     ok=Text.from_markup(":green_circle:"),
     pending=Text.from_markup(":orange_circle:", style="blink"),
@@ -12,9 +15,51 @@ TILT_STATUS_ICONS = dict(
     in_progress=Text.from_markup(":blue_circle:", style="blink"),
     error=Text.from_markup(":red_circle:"),
     offline=Text.from_markup(":black_circle: (offline)"),
+    waiting=Text.from_markup(":black_circle: (waiting)"),
     other=Text.from_markup(":purple_circle:"),
 )
 
+TRIGGER_STYLES = {
+    TiltService.TRIGGER_QUEUED: "yellow",
+    TiltService.TRIGGERED: "green",
+    TiltService.TRIGGER_FAILED: "red",
+}
+
+
+@lru_cache(maxsize=4096)
+def resource_label(update_status: str, name: str, trigger: str) -> Text:
+    """Rendered tree label for a Tilt resource. The progress of a
+    trigger is shown until the resource starts building, or for a few
+    seconds at most.
+    """
+    return Text.assemble(
+        TILT_STATUS_ICONS.get(update_status, TILT_STATUS_ICONS["other"]),
+        Text.from_markup(f" [b]{name}[/b]"),
+        (f" [{trigger}]", TRIGGER_STYLES.get(trigger, "")) if trigger else "",
+    )
+
+
+@lru_cache(maxsize=256)
+def project_label(
+    project_status: str,
+    name: str,
+    teardown: str,
+    poll_interval: float,
+    crash: str,
+    stopping: bool,
+) -> Text:
+    """Rendered tree label for a Tilt project. The poll interval is shown
+    while the project is polled, rather than streamed.
+    """
+    return Text.assemble(
+        TILT_STATUS_ICONS[project_status],
+        Text.from_markup(f" {name}"),
+        (f" (every {poll_interval:g}s)", "dim") if poll_interval else "",
+        (" [stopping]", "yellow") if stopping else "",
+        (f" [crashed: {crash}]", "red") if crash else "",
+        (f" [teardown: {teardown}]", "magenta") if teardown else "",
+    )
+
 
 class TiltStatusTree(Tree):
     """TiltStatusTree tracks and displays the status of running
@@ -25,15 +70,38 @@ class TiltStatusTree(Tree):
         ("s", "start_tilt", "Start Tilt"),
         ("t", "teardown_tilt", "Tear Down Tilt"),
         ("space", "open_tilt_ui", "Open Tilt UI"),
+        ("d", "show_resource_details", "Resource Details"),
+        ("l", "show_process_output", "Tilt Output"),
+        ("L", "show_tilt_logs", "Tilt Logs"),
+        ("r", "trigger_resources", "Trigger"),
+        ("R", "trigger_errored", "Trigger Errored"),
     ]
 
+    class StatusChanged(Message):
+        """StatusChanged is a Message that signals a streamed Tilt status
+        update.
+        """
+
     def on_mount(self) -> None:
         self.border_title = "Tilt Services"
         self.tilt_service = TiltService(self.app.ttork_config, self.log)
 
+        # Streamed updates arrive on a background thread, and post_message
+        # is thread safe.
+        self.tilt_service.on_status_change = lambda: self.post_message(
+            self.StatusChanged()
+        )
+
         if self.app.ttork_config.get("autostart", False):
             self.tilt_service.start_tilt_processes()
 
+        # Tree nodes by project key and resource name, and the cached label
+        # each node is showing, by node id.
+        self.project_nodes = {}
+        self.resource_nodes = {}
+        self.node_labels = {}
+
+        self.status_version = 0
         self.update_pinfo(force_refresh=True)
         self.set_interval(1, self.update_pinfo)
 
@@ -43,20 +111,46 @@ class TiltStatusTree(Tree):
         This acts as both a watcher and updater, as we can't use the standard
         Textual paradigm of reactive attributes with our dict[dict] struct.
         """
-        status_info_old = self.tilt_service.get_status_info()
         self.tilt_service.update_status_info()
+        self.refresh_if_changed(force_refresh=force_refresh)
 
-        if (
-            status_info_old != self.tilt_service.get_status_info()
-            or force_refresh
-        ):
-            self.refresh_tree_view()
+    def refresh_if_changed(self, force_refresh=False) -> None:
+        """Refresh the tree view if the Tilt status has changed since it
+        was last shown.
+        """
+        version, changed = self.tilt_service.changed_since(self.status_version)
+        if changed or force_refresh:
+            self.status_version = version
+            self.refresh_tree_view(None if force_refresh else changed)
 
-    def refresh_tree_view(self) -> None:
-        """Clear and re-create all the tree nodes, based on self.pinfo"""
+    def on_tilt_status_tree_status_changed(
+        self, message: StatusChanged
+    ) -> None:
+        """Handle a streamed Tilt status update."""
+        self.refresh_if_changed()
+
+    def refresh_tree_view(self, project_keys: list[str] = None) -> None:
+        """Update the tree nodes of the specified projects (or all
+        projects), based on the Tilt status info.
+
+        Existing nodes are patched in place, so the cursor position and
+        expansion state are kept.
+        """
         self.log.debug("TiltStatusTree: Detected data changes, updating.")
-        self.clear()
-        self.add_treedata()
+        pinfo = self.tilt_service.get_status_info()
+
+        # Drop the nodes of projects that no longer exist
+        for project_key in list(self.project_nodes):
+            if project_key not in pinfo:
+                for resource_node in self.resource_nodes.pop(
+                    project_key
+                ).values():
+                    self.node_labels.pop(resource_node.id, None)
+                self.remove_node(self.project_nodes.pop(project_key))
+
+        for project_key in pinfo:
+            if project_keys is None or project_key in project_keys:
+                self.patch_project_node(project_key, pinfo[project_key])
         self.root.expand()
 
     def action_start_tilt(self) -> None:
@@ -70,14 +164,93 @@ class TiltStatusTree(Tree):
 
     def action_open_tilt_ui(self) -> None:
         """Open the Tilt UI in the browser."""
-        selected_node = self.cursor_node
-        if selected_node.data:
+        project_data = self.get_cursor_project_data()
+        if project_data:
             webbrowser.open_new_tab(
                 "http://localhost:{0}/r/(all)/overview".format(
-                    selected_node.data["port"],
+                    project_data["port"],
                 )
             )
 
+    def action_show_resource_details(self) -> None:
+        """Show the full Tilt status of the selected resource."""
+        project_data = self.get_cursor_project_data()
+        resource_name = self.get_cursor_resource_name()
+        if project_data and resource_name:
+            details = self.tilt_service.get_resource_details(
+                project_data["key"], resource_name
+            )
+            if details:
+                info = self.app.query_one("#info-box")
+                info.text = yaml.dump(details, default_flow_style=False)
+                info.visible = True
+                info.focus()
+
+    def action_show_process_output(self) -> None:
+        """Show the captured output of the selected project's Tilt
+        process.
+        """
+        project_data = self.get_cursor_project_data()
+        if project_data:
+            self.app.query_one("#tilt-output-display").show(
+                project_data["key"], project_data["name"]
+            )
+
+    def action_show_tilt_logs(self) -> None:
+        """Show the Tilt logs of the selected project, filtered to the
+        selected resource, if any.
+        """
+        project_data = self.get_cursor_project_data()
+        if project_data:
+            self.app.query_one("#tilt-logs-display").show(
+                project_data["key"],
+                project_data["name"],
+                self.get_cursor_resource_name(),
+            )
+
+    def action_trigger_resources(self) -> None:
+        """Trigger an update of the selected resource, or of all the
+        selected project's resources.
+        """
+        project_data = self.get_cursor_project_data()
+        if project_data:
+            resource_name = self.get_cursor_resource_name()
+            if resource_name:
+                names = [resource_name]
+            else:
+                names = list(self.resource_nodes[project_data["key"]])
+            self.tilt_service.trigger_resources({project_data["key"]: names})
+
+    def action_trigger_errored(self) -> None:
+        """Trigger updates of the errored resources of all projects."""
+        self.tilt_service.trigger_errored_resources()
+
+    def get_cursor_project_data(self) -> dict:
+        """Get the project data for the node under the cursor."""
+        selected_node = self.cursor_node
+        if selected_node is None or selected_node.is_root:
+            return None
+        elif selected_node.parent.is_root:
+            return selected_node.data
+        return selected_node.parent.data
+
+    def get_cursor_resource_name(self) -> str:
+        """Get the resource name for the node under the cursor, if it's a
+        resource node.
+        """
+        selected_node = self.cursor_node
+        if (
+            selected_node is None
+            or selected_node.is_root
+            or selected_node.parent.is_root
+        ):
+            return None
+        return selected_node.data["resource"]
+
+    def on_tree_node_highlighted(self, event: Tree.NodeHighlighted) -> None:
+        """Re-check the available actions for the newly selected node."""
+        self.refresh_bindings()
+
     def check_action(
         self,
         action: str,
@@ -86,68 +259,112 @@ class TiltStatusTree(Tree):
         """Check if the action is allowed."""
         if action == "open_tilt_ui":
             # Disable if the tilt service is shown as offline
-            selected_node = self.cursor_node
-            if selected_node.data:
-                return selected_node.data["online"]
+            project_data = self.get_cursor_project_data()
+            if project_data:
+                return project_data["online"]
             else:
                 return False
+        elif action in ("show_resource_details", "trigger_resources"):
+            project_data = self.get_cursor_project_data()
+            return bool(
+                project_data
+                and project_data["online"]
+                and (
+                    action == "trigger_resources"
+                    or self.get_cursor_resource_name()
+                )
+            )
+        elif action in ("show_process_output", "show_tilt_logs"):
+            return self.get_cursor_project_data() is not None
         return True
 
-    def add_treedata(self) -> None:
-        """Add a properly formatted node to the tree display for the
-        projects in the self.pinfo data struct.
+    def patch_project_node(self, project_key: str, project: dict) -> None:
+        """Add, remove, or relabel the nodes of a single project, so they
+        match the project's status.
         """
-        pinfo = self.tilt_service.get_status_info()
-        for project_key in pinfo:
-            p_node_data = {
-                "key": project_key,
-                "name": pinfo[project_key]["name"],
-                "port": pinfo[project_key]["port"],
-                "online": pinfo[project_key]["service_online"],
-            }
+        project_node = self.project_nodes.get(project_key)
+        if project_node is None:
+            p_node_data = {"key": project_key, "name": project["name"]}
             project_node = self.root.add("", data=p_node_data)
             project_node.expand()
-            project_pending = False
-            project_ok = True
-            for resource in pinfo[project_key]["uiResources"]:
-                resource_node = project_node.add("", data=p_node_data)
-                resource_node.allow_expand = False
-                update_status = resource["status"].get(
-                    "updateStatus", "offline"
-                )
-                label = Text.assemble(
-                    TILT_STATUS_ICONS.get(
-                        update_status,
-                        TILT_STATUS_ICONS["other"],
-                    ),
-                    Text.from_markup(
-                        f" [b]{resource['metadata']['name']}[/b]",
-                    ),
-                )
-                resource_node.set_label(label)
-
-                if (
-                    update_status == "pending"
-                    or update_status == "in_progress"
-                ):
-                    project_pending = True
-                elif update_status == "error":
-                    project_ok = False
-
-            # Set the top-level status based on combined resource states
-            if not pinfo[project_key]["service_online"]:
-                ps_icon = TILT_STATUS_ICONS["offline"]
-            elif project_pending:
-                ps_icon = TILT_STATUS_ICONS["pending"]
-            elif not project_ok:
-                ps_icon = TILT_STATUS_ICONS["error"]
-            else:
-                ps_icon = TILT_STATUS_ICONS["ok"]
-            project_label = Text.assemble(
-                ps_icon,
-                Text.from_markup(f" {pinfo[project_key]['name']}"),
+            self.project_nodes[project_key] = project_node
+            self.resource_nodes[project_key] = {}
+
+        project_node.data["port"] = project["port"]
+        project_node.data["online"] = project["service_online"]
+
+        resource_nodes = self.resource_nodes[project_key]
+        project_pending = False
+        project_ok = True
+        labels = {}
+        for resource in project["resources"]:
+            name = resource.name
+            update_status = resource.update_status
+            labels[name] = resource_label(
+                update_status, name, project["triggers"].get(name, "")
             )
-            project_node.set_label(project_label)
+
+            if update_status == "pending" or update_status == "in_progress":
+                project_pending = True
+            elif update_status == "error":
+                project_ok = False
+
+        for name in list(resource_nodes):
+            if name not in labels:
+                self.remove_node(resource_nodes.pop(name))
+
+        # Nodes can only be appended, so the nodes from the first one out of
+        # Tilt's order (usually none) are replaced, to keep the same order.
+        names = list(labels)
+        node_names = [node.data["resource"] for node in project_node.children]
+        for index, node_name in enumerate(node_names):
+            if node_name != names[index]:
+                for name in node_names[index:]:
+                    self.remove_node(resource_nodes.pop(name))
+                break
+
+        for name, label in labels.items():
+            resource_node = resource_nodes.get(name)
+            if resource_node is None:
+                resource_node = project_node.add(
+                    "", data={"resource": name}, allow_expand=False
+                )
+                resource_nodes[name] = resource_node
+            self.set_node_label(resource_node, label)
+
+        # Set the top-level status based on combined resource states
+        if not project["service_online"] and project["bringup"] == "waiting":
+            project_status = "waiting"
+        elif not project["service_online"]:
+            project_status = "offline"
+        elif project_pending:
+            project_status = "pending"
+        elif not project_ok:
+            project_status = "error"
+        else:
+            project_status = "ok"
+        self.set_node_label(
+            project_node,
+            project_label(
+                project_status,
+                project["name"],
+                project["teardown"],
+                project["poll_interval"],
+                project["crash"],
+                project["stopping"],
+            ),
+        )
+
+    def set_node_label(self, node: TreeNode, label: Text) -> None:
+        """Set the label of a node, unless it's already showing it."""
+        if self.node_labels.get(node.id) is not label:
+            self.node_labels[node.id] = label
+            node.set_label(label)
+
+    def remove_node(self, node: TreeNode) -> None:
+        """Remove a node from the tree."""
+        self.node_labels.pop(node.id, None)
+        node.remove()
 
     def _on_resize(self, event: events.Resize) -> None:
         super()._on_resize(event)